@@ -0,0 +1,359 @@
+import logging
+import os
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+import redis
+from adapters.serialization import content_hash, dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# Marca un dato todavía no deserializado.
+_MISSING = object()
+
+
+def key_family(key):
+    """
+    Obtiene la familia de una clave de caché eliminando el sufijo con el ID de cuenta.
+    Por ejemplo, 'favorite_movies_12345' pertenece a la familia 'favorite_movies'.
+
+    Args:
+        key (str): Clave de caché.
+
+    Returns:
+        str: Familia de la clave.
+    """
+    prefix, _, suffix = key.rpartition('_')
+    if prefix and suffix.isdigit():
+        return prefix
+    return key
+
+
+class CacheEntry:
+    """
+    Entrada de caché: el dato junto con el instante (epoch) en que se obtuvo de la API.
+    Permite distinguir entre entradas frescas y obsoletas (stale-while-revalidate).
+
+    La entrada guarda el documento JSON serializado tal como se almacena en Redis y solo lo
+    deserializa si se accede a 'value', de modo que un acierto puede devolverse como cuerpo
+    de la respuesta sin decodificarlo ni volver a codificarlo. Las representaciones derivadas
+    (por ejemplo, solo 'results' serializado) se calculan una vez por entrada.
+    """
+
+    __slots__ = ('_value', '_body', '_etag', 'stored_at', '_derived')
+
+    def __init__(self, value=_MISSING, stored_at=0.0, body=None, etag=None):
+        """
+        Inicializa la entrada a partir del dato, de su documento serializado o de ambos.
+
+        Args:
+            value: Dato deserializado.
+            stored_at (float): Instante (epoch) en que se obtuvo el dato.
+            body (bytes, opcional): Documento JSON serializado.
+            etag (str, opcional): Hash de contenido del documento ya calculado.
+        """
+        self._value = value
+        self._body = body.encode('utf-8') if isinstance(body, str) else body
+        self._etag = etag.decode() if isinstance(etag, bytes) else etag
+        self.stored_at = stored_at
+        self._derived = None
+
+    @property
+    def value(self):
+        """
+        Returns:
+            El dato deserializado. No debe modificarse porque se comparte entre peticiones.
+        """
+        if self._value is _MISSING:
+            self._value = loads(self._body)
+        return self._value
+
+    @property
+    def body(self):
+        """
+        Returns:
+            bytes: Documento JSON serializado del dato.
+        """
+        if self._body is None:
+            self._body = dumps(self._value)
+        return self._body
+
+    @property
+    def etag(self):
+        """
+        Returns:
+            str: Hash de contenido del documento, guardado junto a la entrada en Redis.
+        """
+        if self._etag is None:
+            self._etag = content_hash(self.body)
+        return self._etag
+
+    def derived(self, name, build):
+        """
+        Obtiene una representación derivada del dato, calculándola solo la primera vez.
+
+        Args:
+            name (str): Nombre de la representación.
+            build (callable): Recibe la entrada y devuelve la representación.
+
+        Returns:
+            La representación derivada.
+        """
+        derived = self._derived
+        if derived is None:
+            derived = self._derived = {}
+        if name not in derived:
+            derived[name] = build(self)
+        return derived[name]
+
+    def age(self):
+        """
+        Returns:
+            float: Segundos transcurridos desde que se obtuvo el dato.
+        """
+        return time.time() - self.stored_at
+
+    def is_stale(self, soft_ttl):
+        """
+        Indica si la entrada ha superado su TTL blando y debe refrescarse.
+
+        Args:
+            soft_ttl (float): Segundos durante los que la entrada se considera fresca.
+
+        Returns:
+            bool: True si la entrada está obsoleta.
+        """
+        return self.age() >= soft_ttl
+
+    def to_redis_mapping(self):
+        """
+        Serializa la entrada como los campos de un hash de Redis.
+
+        Returns:
+            dict: Campos 'body', 'etag' y 'stored_at'.
+        """
+        return {'body': self.body, 'etag': self.etag, 'stored_at': repr(self.stored_at)}
+
+    @classmethod
+    def from_redis_mapping(cls, mapping):
+        """
+        Reconstruye una entrada a partir de un hash de Redis, con claves en texto o en bytes.
+        El documento no se deserializa hasta que se accede a 'value'.
+
+        Args:
+            mapping (dict): Resultado de HGETALL.
+
+        Returns:
+            CacheEntry: Entrada reconstruida o None si el hash está vacío o incompleto.
+        """
+        if not mapping:
+            return None
+        fields = {(k.decode() if isinstance(k, bytes) else k): v for k, v in mapping.items()}
+        if 'body' not in fields or 'stored_at' not in fields:
+            return None
+        return cls(stored_at=float(fields['stored_at']), body=fields['body'], etag=fields.get('etag'))
+
+
+class LocalCache:
+    """
+    Caché en memoria del proceso (L1) con tamaño acotado, expulsión LRU y TTL por entrada.
+    Se sitúa delante de Redis (L2) para que los aciertos no salgan del proceso.
+
+    Los valores se devuelven sin copiar, por lo que quien los recibe no debe modificarlos.
+    """
+
+    def __init__(self, maxsize=1024):
+        """
+        Inicializa la caché local.
+
+        Args:
+            maxsize (int): Número máximo de entradas antes de expulsar la menos usada.
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _family_stats(self, key):
+        family = key_family(key)
+        stats = self._stats.get(family)
+        if stats is None:
+            stats = self._stats[family] = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+        return stats
+
+    def get(self, key):
+        """
+        Recupera un valor de la caché si existe y no ha expirado.
+
+        Args:
+            key (str): Clave para identificar el dato en caché.
+
+        Returns:
+            El valor almacenado o None si no está disponible.
+        """
+        now = time.monotonic()
+        with self._lock:
+            stats = self._family_stats(key)
+            entry = self._entries.get(key)
+            if entry is None:
+                stats['misses'] += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                stats['expirations'] += 1
+                stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            stats['hits'] += 1
+            return value
+
+    def set(self, key, value, ttl):
+        """
+        Almacena un valor durante ttl segundos, expulsando la entrada menos usada si se
+        supera el tamaño máximo.
+
+        Args:
+            key (str): Clave para identificar el dato en caché.
+            value: Valor a almacenar.
+            ttl (float): Duración en segundos de la entrada.
+        """
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._family_stats(evicted_key)['evictions'] += 1
+
+    def delete(self, key):
+        """
+        Elimina una entrada de la caché si existe.
+
+        Args:
+            key (str): Clave para identificar el dato en caché.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Elimina todas las entradas de la caché.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """
+        Obtiene los contadores de aciertos, fallos, expulsiones y expiraciones por familia.
+
+        Returns:
+            dict: Contadores por familia de claves.
+        """
+        with self._lock:
+            return {family: dict(stats) for family, stats in self._stats.items()}
+
+
+# Buses creados en el proceso, para reiniciarlos en los hijos tras un fork
+_buses = weakref.WeakSet()
+
+
+class InvalidationBus:
+    """
+    Propaga invalidaciones de la caché en memoria (L1) entre procesos mediante pub/sub de
+    Redis. Cuando un proceso modifica una clave en Redis la publica, y el resto de procesos
+    descarta su copia local para volver a leerla de Redis.
+    """
+
+    CHANNEL = 'cache_invalidation'
+
+    def __init__(self, redis_client, local_cache):
+        """
+        Inicializa el bus de invalidación.
+
+        Args:
+            redis_client (redis.Redis): Cliente de Redis compartido.
+            local_cache (LocalCache): Caché local que se invalida al recibir mensajes.
+        """
+        self.redis_client = redis_client
+        self.local_cache = local_cache
+        self.origin = uuid.uuid4().hex
+        self._stop = threading.Event()
+        self._thread = None
+        _buses.add(self)
+
+    def start(self):
+        """
+        Arranca el hilo que escucha las invalidaciones publicadas por otros procesos.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._listen, name="cache-invalidation", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """
+        Detiene el hilo de escucha.
+        """
+        self._stop.set()
+
+    def reset_after_fork(self):
+        """
+        Prepara el bus en un proceso hijo: el hilo de escucha del padre no existe y el origen
+        debe ser distinto para que el hijo no ignore las invalidaciones de sus hermanos.
+        Hay que volver a llamar a start() para escuchar.
+        """
+        self.origin = uuid.uuid4().hex
+        self._stop = threading.Event()
+        self._thread = None
+
+    def publish(self, *keys):
+        """
+        Publica la invalidación de una o varias claves para el resto de procesos.
+
+        Args:
+            *keys (str): Claves modificadas.
+        """
+        try:
+            for key in keys:
+                self.redis_client.publish(self.CHANNEL, f"{self.origin}:{key}")
+        except redis.exceptions.RedisError as e:
+            logger.warning("No se pudo publicar la invalidación de caché: %s", e)
+
+    def _listen(self):
+        backoff = 1
+        while not self._stop.is_set():
+            try:
+                pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.CHANNEL)
+                backoff = 1
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message:
+                        self._handle(message['data'])
+                pubsub.close()
+            except redis.exceptions.RedisError:
+                # Sin Redis no hay otros procesos que invaliden: se reintenta con espera creciente.
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30)
+
+    def _handle(self, data):
+        if isinstance(data, bytes):
+            data = data.decode()
+        origin, _, key = data.partition(':')
+        if origin != self.origin:
+            self.local_cache.delete(key)
+
+
+def _reset_buses_after_fork():
+    for bus in list(_buses):
+        bus.reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_buses_after_fork)
@@ -0,0 +1,147 @@
+import os
+import socket
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+# Sesión HTTP compartida por todo el proceso y el candado que protege su creación.
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    Adaptador de transporte de requests que mantiene un pool de conexiones persistentes
+    por host y, opcionalmente, activa TCP keep-alive en cada socket abierto.
+    """
+
+    def __init__(self, pool_connections, pool_maxsize, pool_block=False, keep_alive=True):
+        """
+        Inicializa el adaptador de transporte.
+
+        Args:
+            pool_connections (int): Número de pools por host que se mantienen en memoria.
+            pool_maxsize (int): Número máximo de conexiones reutilizables por host.
+            pool_block (bool): Si es True, se espera a que se libere una conexión en lugar
+                de abrir conexiones adicionales por encima del límite por host.
+            keep_alive (bool): Activa SO_KEEPALIVE en los sockets del pool.
+        """
+        self.keep_alive = keep_alive
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        if self.keep_alive:
+            pool_kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            ]
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+    def pool_stats(self):
+        """
+        Obtiene las estadísticas de uso de cada pool de conexiones.
+
+        Returns:
+            dict: Estadísticas por host y totales de conexiones nuevas y reutilizadas.
+        """
+        hosts = {}
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            try:
+                pool = pools[key]
+            except KeyError:
+                # El pool fue descartado entre la lectura de claves y el acceso.
+                continue
+            host = f"{key.key_scheme}://{key.key_host}:{key.key_port}"
+            hosts[host] = {
+                'requests': pool.num_requests,
+                'new_connections': pool.num_connections,
+                'reused_connections': max(pool.num_requests - pool.num_connections, 0),
+                'idle_connections': pool.pool.qsize() if pool.pool is not None else 0,
+                'maxsize': pool.pool.maxsize if pool.pool is not None else 0,
+            }
+        totals = {
+            'requests': sum(h['requests'] for h in hosts.values()),
+            'new_connections': sum(h['new_connections'] for h in hosts.values()),
+            'reused_connections': sum(h['reused_connections'] for h in hosts.values()),
+        }
+        return {'hosts': hosts, 'totals': totals}
+
+
+def create_session(settings):
+    """
+    Crea una sesión de requests con un pool de conexiones configurado a partir de la configuración.
+
+    Args:
+        settings (Config): Objeto de configuración con los parámetros HTTP_*.
+
+    Returns:
+        requests.Session: Sesión lista para ser compartida entre hilos.
+    """
+    keep_alive = getattr(settings, 'HTTP_KEEP_ALIVE', True)
+    adapter = PooledHTTPAdapter(
+        pool_connections=getattr(settings, 'HTTP_POOL_CONNECTIONS', 10),
+        pool_maxsize=getattr(settings, 'HTTP_POOL_MAXSIZE', 20),
+        pool_block=getattr(settings, 'HTTP_POOL_BLOCK', False),
+        keep_alive=keep_alive
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+    return session
+
+
+def get_shared_session(settings):
+    """
+    Devuelve la sesión HTTP compartida del proceso, creándola la primera vez.
+
+    Args:
+        settings (Config): Objeto de configuración con los parámetros HTTP_*.
+
+    Returns:
+        requests.Session: Sesión compartida.
+    """
+    global _shared_session
+    if _shared_session is None:
+        with _shared_session_lock:
+            if _shared_session is None:
+                _shared_session = create_session(settings)
+    return _shared_session
+
+
+def session_pool_stats(session):
+    """
+    Agrega las estadísticas de todos los adaptadores con pool montados en una sesión.
+
+    Args:
+        session (requests.Session): Sesión a inspeccionar.
+
+    Returns:
+        dict: Estadísticas por host y totales.
+    """
+    stats = {'hosts': {}, 'totals': {'requests': 0, 'new_connections': 0, 'reused_connections': 0}}
+    seen = set()
+    for adapter in session.adapters.values():
+        if not isinstance(adapter, PooledHTTPAdapter) or id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+        adapter_stats = adapter.pool_stats()
+        stats['hosts'].update(adapter_stats['hosts'])
+        for name, value in adapter_stats['totals'].items():
+            stats['totals'][name] += value
+    return stats
+
+
+def _reset_shared_session():
+    """
+    Descarta la sesión compartida en el proceso hijo tras un fork para no compartir sockets.
+    """
+    global _shared_session, _shared_session_lock
+    _shared_session = None
+    _shared_session_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_shared_session)
@@ -0,0 +1,56 @@
+import json
+import logging
+import sys
+from adapters.tracing import current_span
+
+
+class TraceContextFilter(logging.Filter):
+    """
+    Añade a cada registro el trace_id y el span_id de la petición trazada en curso, para
+    poder cruzar los logs con las trazas.
+    """
+
+    def filter(self, record):
+        span = current_span()
+        record.trace_id = span.trace_id if span is not None else None
+        record.span_id = span.span_id if span is not None else None
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formatea cada registro como un objeto JSON por línea.
+    """
+
+    def format(self, record):
+        document = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if getattr(record, 'trace_id', None):
+            document['trace_id'] = record.trace_id
+            document['span_id'] = record.span_id
+        if record.exc_info:
+            document['exception'] = self.formatException(record.exc_info)
+        return json.dumps(document, ensure_ascii=False)
+
+
+def configure_logging(settings):
+    """
+    Configura el logger raíz con el nivel LOG_LEVEL y el formato LOG_FORMAT ('text' o
+    'json') hacia stderr. Los mensajes por debajo del nivel no se formatean.
+
+    Args:
+        settings (Config): Objeto de configuración con LOG_LEVEL y LOG_FORMAT.
+    """
+    handler = logging.StreamHandler(sys.stderr)
+    handler.addFilter(TraceContextFilter())
+    if getattr(settings, 'LOG_FORMAT', 'text') == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(getattr(settings, 'LOG_LEVEL', 'INFO').upper())
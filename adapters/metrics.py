@@ -0,0 +1,600 @@
+import fcntl
+import glob
+import json
+import logging
+import math
+import os
+import threading
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Límites (en segundos) de los histogramas de latencia.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    Contador monótono con etiquetas. Registrar un valor es una suma bajo un candado.
+    """
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        """
+        Args:
+            name (str): Nombre de la métrica.
+            help_text (str): Descripción de la métrica.
+            labelnames (tuple): Nombres de las etiquetas.
+        """
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        """
+        Args:
+            *labels: Valores de las etiquetas, en el orden de labelnames.
+            amount (float): Cantidad a sumar.
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        """
+        Returns:
+            float: Valor actual para las etiquetas indicadas.
+        """
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def samples(self):
+        """
+        Returns:
+            list: Líneas de texto de Prometheus con los valores actuales.
+        """
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}" for labels, value in values]
+
+    def snapshot(self):
+        """
+        Returns:
+            list: Pares [valores de las etiquetas, valor], serializables en JSON.
+        """
+        with self._lock:
+            return [[[str(label) for label in labels], value] for labels, value in self._values.items()]
+
+
+class Histogram:
+    """
+    Histograma con etiquetas y límites fijos. Registrar una observación es una búsqueda
+    binaria y dos sumas bajo un candado; los acumulados se calculan al exportar.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            name (str): Nombre de la métrica.
+            help_text (str): Descripción de la métrica.
+            labelnames (tuple): Nombres de las etiquetas.
+            buckets (tuple): Límites superiores de los intervalos, ordenados.
+        """
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        """
+        Args:
+            value (float): Valor observado (normalmente segundos).
+            *labels: Valores de las etiquetas, en el orden de labelnames.
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Un contador por intervalo más el de +Inf, la suma y el total.
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels):
+        """
+        Returns:
+            int: Número de observaciones para las etiquetas indicadas.
+        """
+        with self._lock:
+            series = self._series.get(labels)
+            return series[2] if series else 0
+
+    def samples(self):
+        """
+        Returns:
+            list: Líneas de texto de Prometheus con intervalos acumulados, suma y total.
+        """
+        with self._lock:
+            series = [(labels, list(counts), total, count) for labels, (counts, total, count) in self._series.items()]
+        lines = []
+        for labels, counts, total, count in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                le = (('le', _format_value(float(bound))),)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+    def snapshot(self):
+        """
+        Returns:
+            list: [valores de las etiquetas, recuentos por intervalo, suma, total] por serie,
+                serializables en JSON.
+        """
+        with self._lock:
+            return [
+                [[str(label) for label in labels], list(counts), total, count]
+                for labels, (counts, total, count) in self._series.items()
+            ]
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas del proceso exportable en el formato de texto de Prometheus.
+
+    Además de contadores e histogramas admite recolectores: funciones que, solo al exportar,
+    leen el estado de otros componentes (caché local, interruptores, pools...), de modo que
+    no cuestan nada en el camino de las peticiones.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        """
+        Returns:
+            Counter: Contador registrado con ese nombre (se crea si no existe).
+        """
+        return self._register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """
+        Returns:
+            Histogram: Histograma registrado con ese nombre (se crea si no existe).
+        """
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def register_collector(self, collect):
+        """
+        Registra un recolector que se ejecuta al exportar.
+
+        Args:
+            collect (callable): Devuelve una lista de tuplas (nombre, tipo, descripción,
+                muestras), donde el tipo es 'counter' o 'gauge' y cada muestra es una tupla
+                (dict de etiquetas, valor).
+        """
+        with self._lock:
+            self._collectors.append(collect)
+
+    def render(self):
+        """
+        Returns:
+            str: Todas las métricas en el formato de texto de Prometheus.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        for collect in collectors:
+            try:
+                families = collect()
+            except Exception as e:
+                lines.append(f"# Error en el recolector {getattr(collect, '__name__', collect)}: {_escape(e)}")
+                continue
+            for name, kind, help_text, samples in families:
+                lines.extend(_family_lines(name, kind, help_text, samples))
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self):
+        """
+        Obtiene el estado de todas las métricas y recolectores en un documento JSON, para
+        agregarlo con el de otros procesos (ver MultiprocessMetrics).
+
+        Returns:
+            dict: Métricas ('metrics') y familias de los recolectores ('collected').
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        document = {'metrics': {}, 'collected': []}
+        for metric in metrics:
+            document['metrics'][metric.name] = {
+                'kind': metric.kind,
+                'help': metric.help_text,
+                'labelnames': list(metric.labelnames),
+                'buckets': list(getattr(metric, 'buckets', ())),
+                'series': metric.snapshot(),
+            }
+        for collect in collectors:
+            try:
+                families = collect()
+            except Exception as e:
+                logger.warning("Error en el recolector %s: %s", getattr(collect, '__name__', collect), e)
+                continue
+            for name, kind, help_text, samples in families:
+                document['collected'].append([
+                    name, kind, help_text, [[{k: str(v) for k, v in dict(labels).items()}, value] for labels, value in samples]
+                ])
+        return document
+
+
+def _family_lines(name, kind, help_text, samples):
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        labels = dict(labels)
+        lines.append(f"{name}{_format_labels(labels.keys(), labels.values())} {_format_value(value)}")
+    return lines
+
+
+def _accumulate(metrics, collected, document, gauge_labels=None):
+    """
+    Suma un documento de MetricsRegistry.snapshot() a los acumulados.
+
+    Args:
+        metrics (dict): Series acumuladas por métrica.
+        collected (dict): Familias de los recolectores acumuladas por nombre.
+        document (dict): Documento a sumar.
+        gauge_labels (dict, opcional): Etiquetas que se añaden a las métricas de tipo gauge
+            de los recolectores; sin ellas se descartan (proceso terminado).
+    """
+    for name, metric in document.get('metrics', {}).items():
+        merged = metrics.setdefault(name, dict(metric, series={}))
+        for item in metric['series']:
+            labels = tuple(item[0])
+            if metric['kind'] == 'histogram':
+                counts, total, count = item[1:]
+                current = merged['series'].get(labels)
+                if current is None:
+                    merged['series'][labels] = [list(counts), total, count]
+                else:
+                    current[0] = [a + b for a, b in zip(current[0], counts)]
+                    current[1] += total
+                    current[2] += count
+            else:
+                merged['series'][labels] = merged['series'].get(labels, 0) + item[1]
+    for name, kind, help_text, samples in document.get('collected', []):
+        if kind == 'gauge' and gauge_labels is None:
+            continue
+        family = collected.setdefault(name, [kind, help_text, {}])
+        for labels, value in samples:
+            if kind == 'gauge':
+                labels = dict(labels, **gauge_labels)
+            key = tuple(sorted(labels.items()))
+            family[2][key] = family[2].get(key, 0) + value
+
+
+def fold_snapshots(documents):
+    """
+    Suma los documentos de procesos terminados en uno solo, con el formato de
+    MetricsRegistry.snapshot(). Las métricas de tipo gauge se descartan.
+
+    Args:
+        documents (list): Documentos de MetricsRegistry.snapshot().
+
+    Returns:
+        dict: Documento con los totales.
+    """
+    metrics = {}
+    collected = {}
+    for document in documents:
+        _accumulate(metrics, collected, document)
+    return {
+        'metrics': {
+            name: dict(metric, series=[[list(labels)] + (value if metric['kind'] == 'histogram' else [value])
+                                       for labels, value in metric['series'].items()])
+            for name, metric in metrics.items()
+        },
+        'collected': [
+            [name, kind, help_text, [[dict(key), value] for key, value in samples.items()]]
+            for name, (kind, help_text, samples) in collected.items()
+        ],
+    }
+
+
+def merge_snapshots(snapshots):
+    """
+    Agrega los documentos de varios procesos en el formato de texto de Prometheus. Los
+    contadores y los histogramas se suman; las métricas de tipo gauge de los recolectores
+    solo se incluyen para los procesos vivos y con la etiqueta 'pid', porque sumarlas no
+    tiene sentido.
+
+    Args:
+        snapshots (list): Tuplas (pid, documento de MetricsRegistry.snapshot(), vivo).
+
+    Returns:
+        str: Métricas agregadas.
+    """
+    metrics = {}
+    collected = {}
+    for pid, document, alive in snapshots:
+        _accumulate(metrics, collected, document, {'pid': str(pid)} if alive else None)
+
+    lines = []
+    for name, metric in metrics.items():
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['kind']}")
+        labelnames = metric['labelnames']
+        for labels, value in metric['series'].items():
+            if metric['kind'] != 'histogram':
+                lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}")
+                continue
+            counts, total, count = value
+            cumulative = 0
+            for bound, bucket_count in zip(metric['buckets'] + [math.inf], counts):
+                cumulative += bucket_count
+                le = (('le', _format_value(float(bound))),)
+                lines.append(f"{name}_bucket{_format_labels(labelnames, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels(labelnames, labels)} {count}")
+    for name, (kind, help_text, samples) in collected.items():
+        lines.extend(_family_lines(name, kind, help_text, [(dict(key), value) for key, value in samples.items()]))
+    return '\n'.join(lines) + '\n'
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MultiprocessMetrics:
+    """
+    Agrega las métricas de los workers de un mismo servidor (gunicorn) a través de un
+    directorio compartido: cada proceso escribe periódicamente su estado en
+    metrics_<pid>.json y /metrics, atendido por cualquier worker, suma el de todos. Cuando
+    un proceso termina, su estado se suma a un único archivo (metrics_archive.json) para
+    que los contadores no retrocedan sin acumular un fichero por worker reciclado. El
+    directorio debe vaciarse al arrancar el servidor (clear()).
+    """
+
+    ARCHIVE = 'metrics_archive.json'
+
+    def __init__(self, registry, directory, interval=1.0):
+        """
+        Args:
+            registry (MetricsRegistry): Registro del proceso.
+            directory (str): Directorio compartido por los workers.
+            interval (float): Segundos entre escrituras del estado del proceso.
+        """
+        self.registry = registry
+        self.directory = directory
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def _path(self, pid):
+        return os.path.join(self.directory, f"metrics_{pid}.json")
+
+    @contextmanager
+    def _locked(self, mode):
+        # Candado entre procesos: el archivo y los estados que se le suman cambian a la vez.
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, 'metrics_archive.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def clear(self):
+        """
+        Crea el directorio y elimina los ficheros de ejecuciones anteriores.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        for path in glob.glob(os.path.join(self.directory, 'metrics_*')):
+            os.remove(path)
+
+    def _write_document(self, path, document):
+        temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(document, file)
+        os.replace(temporary, path)
+
+    def write(self):
+        """
+        Escribe el estado del proceso actual de forma atómica.
+        """
+        pid = os.getpid()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._write_document(self._path(pid), self.registry.snapshot())
+        except OSError as e:
+            logger.warning("No se pudieron guardar las métricas del proceso %s: %s", pid, e)
+
+    def _archive(self, pid):
+        """
+        Suma el estado de un proceso terminado al archivo común y elimina su fichero.
+
+        Args:
+            pid (int): Proceso terminado.
+        """
+        archive = os.path.join(self.directory, self.ARCHIVE)
+        try:
+            with self._locked(fcntl.LOCK_EX):
+                # Se lee bajo el candado: otro worker puede haberlo archivado ya.
+                document = _read_document(self._path(pid))
+                if document is None:
+                    return
+                archived = _read_document(archive) or {}
+                self._write_document(archive, fold_snapshots([archived, document]))
+                os.remove(self._path(pid))
+        except OSError as e:
+            logger.warning("No se pudieron archivar las métricas del proceso %s: %s", pid, e)
+
+    def start(self):
+        """
+        Arranca la escritura periódica en el proceso actual (una vez por proceso).
+        """
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        # Fichero de un proceso anterior que terminó sin archivarlo y tenía el mismo pid
+        self._archive(self._pid)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Detiene la escritura periódica y suma el estado final del proceso al archivo.
+        """
+        self._stop.set()
+        self.write()
+        self._archive(os.getpid())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def _live_files(self):
+        for path in glob.glob(os.path.join(self.directory, 'metrics_*.json')):
+            name = os.path.basename(path)[len('metrics_'):-len('.json')]
+            if name.isdigit():
+                yield int(name), path
+
+    def render(self):
+        """
+        Returns:
+            str: Métricas de todos los procesos en el formato de texto de Prometheus. Las del
+                proceso actual están al día; las del resto, con hasta 'interval' de retraso.
+        """
+        self.write()
+        # Procesos que terminaron sin archivar su estado (por ejemplo, un worker abortado)
+        for pid, _ in list(self._live_files()):
+            if pid != os.getpid() and not _pid_alive(pid):
+                self._archive(pid)
+
+        snapshots = []
+        with self._locked(fcntl.LOCK_SH):
+            archived = _read_document(os.path.join(self.directory, self.ARCHIVE))
+            if archived is not None:
+                snapshots.append((None, archived, False))
+            for pid, path in self._live_files():
+                document = _read_document(path)
+                if document is not None:
+                    snapshots.append((pid, document, True))
+        return merge_snapshots(snapshots)
+
+
+def _read_document(path):
+    """
+    Args:
+        path (str): Fichero JSON con el estado de uno o varios procesos.
+
+    Returns:
+        dict: Documento, o None si no existe o no se puede leer.
+    """
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("No se pudieron leer las métricas de %s: %s", path, e)
+        return None
+
+
+def create_multiprocess_metrics(settings, metrics_registry=None):
+    """
+    Crea el agregador de métricas entre workers si METRICS_MULTIPROC_DIR está configurado.
+
+    Args:
+        settings (Config): Configuración con METRICS_MULTIPROC_DIR y METRICS_WRITE_INTERVAL.
+        metrics_registry (MetricsRegistry, opcional): Registro del proceso; por defecto el compartido.
+
+    Returns:
+        MultiprocessMetrics: Agregador, o None para exportar solo las métricas del proceso.
+    """
+    directory = getattr(settings, 'METRICS_MULTIPROC_DIR', None)
+    if not directory:
+        return None
+    return MultiprocessMetrics(
+        metrics_registry or registry, directory, getattr(settings, 'METRICS_WRITE_INTERVAL', 1.0)
+    )
+
+
+# Registro compartido por todo el proceso
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    'http_request_duration_seconds', 'Duración de las peticiones por ruta.', ('route', 'method')
+)
+http_requests = registry.counter(
+    'http_requests_total', 'Peticiones atendidas por ruta y código de estado.', ('route', 'method', 'status')
+)
+cache_requests = registry.counter(
+    'cache_requests_total', 'Lecturas de caché por familia de claves y resultado (hit, stale, miss).', ('family', 'result')
+)
+upstream_request_duration = registry.histogram(
+    'upstream_request_duration_seconds', 'Duración de las llamadas a TMDB por endpoint.', ('endpoint',)
+)
+upstream_requests = registry.counter(
+    'upstream_requests_total', 'Llamadas a TMDB por endpoint y código de estado (error si no hubo respuesta).', ('endpoint', 'status')
+)
+upstream_retries = registry.counter(
+    'upstream_retries_total', 'Reintentos de llamadas a TMDB por endpoint.', ('endpoint',)
+)
+upstream_failures = registry.counter(
+    'upstream_failures_total', 'Llamadas a TMDB abandonadas por endpoint y motivo.', ('endpoint', 'reason')
+)
+redis_command_duration = registry.histogram(
+    'redis_command_duration_seconds', 'Tiempo de ida y vuelta de las operaciones de caché en Redis.', ('operation',)
+)
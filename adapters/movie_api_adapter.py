@@ -1,49 +1,90 @@
-import requests
-from settings import config
+from settings import get_config
+from adapters.http_session import get_shared_session, session_pool_stats
+from adapters.cache import CacheEntry, InvalidationBus, LocalCache, key_family
+from adapters.metrics import cache_requests, redis_command_duration, upstream_request_duration, upstream_requests
+from adapters.single_flight import SingleFlight
+from adapters.rate_limiter import DistributedTokenBucket
+from adapters.resilience import RateLimitExceeded, remaining_time, retry_after_seconds, retry_with_backoff
+from adapters.tracing import tracer
+from domain.movie import project_listing
+import re
 import redis
-import json
 import time
-import sys
-from requests.exceptions import RequestException
+import logging
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 
 # Carga la configuración de desarrollo desde el archivo de configuración.
-development_config = config['development']()
+app_settings = get_config()
 
-def retry_with_backoff(max_retries=3, backoff_factor=2):
+logger = logging.getLogger(__name__)
+
+# Segmentos numéricos de la ruta (IDs de cuenta o de película) en las URLs de la API.
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+def _endpoint_label(url):
     """
-    Decorador para aplicar un mecanismo de reintento con incremento exponencial.
-    En caso de fallo, espera cada vez más antes de reintentar la función.
+    Obtiene el endpoint de una URL de la API sin IDs, para etiquetar métricas con pocas series.
+    Por ejemplo, '.../3/account/12345/favorite/movies' pasa a ser 'account/{id}/favorite/movies'.
 
     Args:
-        max_retries (int): Número máximo de intentos de reintento.
-        backoff_factor (int): Factor para calcular el tiempo de espera entre reintentos.
+        url (str): URL de la solicitud.
 
     Returns:
-        función decorada que aplica reintentos con incremento exponencial.
+        str: Ruta del endpoint con los IDs sustituidos por '{id}'.
     """
-    def decorator(func):
-        def wrapper(*args, **kwargs):
-            retries = 0
-            while retries < max_retries:
-                try:
-                    return func(*args, **kwargs)
-                except RequestException as e:
-                    retries += 1
-                    wait_time = backoff_factor ** retries
-                    print(f"Intento {retries} fallido. Reintentando en {wait_time} segundos...", file=sys.stderr)
-                    time.sleep(wait_time)
-            print("Todos los intentos fallaron. Obteniendo respuesta de caché si está disponible...", file=sys.stderr)
-            return None
-        return wrapper
-    return decorator
+    path = url.split('://', 1)[-1].partition('/')[2].partition('?')[0]
+    if path.startswith('3/'):
+        path = path[2:]
+    return _ID_SEGMENT.sub('/{id}', '/' + path)[1:]
+
+def _without_movies(response, movie_ids):
+    """
+    Devuelve una copia de una respuesta de listado sin las películas indicadas.
+
+    Args:
+        response (dict): Respuesta JSON de un listado de películas.
+        movie_ids (set): IDs de las películas a quitar.
+
+    Returns:
+        dict: Nueva respuesta con 'results' y 'total_results' actualizados.
+    """
+    results = [movie for movie in response.get('results', []) if movie['id'] not in movie_ids]
+    updated = dict(response)
+    removed = len(response.get('results', [])) - len(results)
+    updated['results'] = results
+    if 'total_results' in updated:
+        updated['total_results'] = max(updated['total_results'] - removed, 0)
+    return updated
+
+def _rated_in_favorites(rated_response, favorite_response):
+    """
+    Calcula el listado de películas calificadas que también están en favoritas.
+
+    Args:
+        rated_response (dict): Listado de películas calificadas.
+        favorite_response (dict): Listado de películas favoritas.
+
+    Returns:
+        dict: Listado con 'results' y 'total_results', en el orden de las calificadas.
+    """
+    favorite_ids = {movie['id'] for movie in favorite_response.get('results', [])}
+    results = [movie for movie in rated_response.get('results', []) if movie['id'] in favorite_ids]
+    return {'results': results, 'total_results': len(results)}
 
 class MovieAPIAdapter:
     """
     Adaptador para interactuar con la API de películas. Proporciona métodos para obtener y
     gestionar películas populares, favoritas y calificadas, además de calificar películas.
+    Los listados se proyectan a los campos de Movie antes de guardarse en caché.
+
+    Además de los listados, la caché guarda la vista de películas calificadas que están en
+    favoritas, que se mantiene de forma incremental con cada modificación y se recalcula
+    cuando se refresca cualquiera de las dos listas.
     """
 
-    def __init__(self, api_key, headers, account_id, redis_client=None):
+    def __init__(self, api_key, headers, account_id, redis_client=None, session=None, local_cache=None, rate_limiters=None, api_url=None):
         """
         Inicializa el adaptador de la API de películas.
 
@@ -52,34 +93,350 @@ class MovieAPIAdapter:
             headers (dict): Encabezados necesarios para las solicitudes.
             account_id (str): ID de la cuenta para la cual se obtienen los datos.
             redis_client (redis.Redis, opcional): Cliente de Redis para caché. Por defecto es None.
+            session (requests.Session, opcional): Sesión HTTP con pool de conexiones. Por defecto
+                se usa la sesión compartida del proceso.
+            local_cache (LocalCache, opcional): Caché en memoria (L1) situada delante de Redis.
+                Por defecto se crea una caché propia del adaptador.
+            rate_limiters (dict, opcional): Limitadores de salida 'read' y 'write'. Por defecto
+                se usan cubos compartidos en Redis con la configuración OUTBOUND_*.
+            api_url (str, opcional): URL base de la API. Por defecto TMDB_BASE_URL.
         """
         self.api_key = api_key
         self.headers = headers
         self.account_id = account_id
-        self.base_url = f"https://api.themoviedb.org/3/account/{account_id}"
+        self.api_url = (api_url or app_settings.TMDB_BASE_URL).rstrip('/')
+        self.base_url = f"{self.api_url}/account/{account_id}"
         self.redis_client = redis_client
-        self.cache_duration = int(getattr(development_config, "CACHE_DURATION", 30))
+        self.cache_duration = int(getattr(app_settings, "CACHE_DURATION", 30))
+        self.stale_duration = app_settings.CACHE_STALE_DURATION
+        self.session = session or get_shared_session(app_settings)
+        self.timeout = (app_settings.HTTP_CONNECT_TIMEOUT, app_settings.HTTP_READ_TIMEOUT)
+        self.pagination_max_workers = app_settings.PAGINATION_MAX_WORKERS
+        self.pagination_max_pages = app_settings.PAGINATION_MAX_PAGES
+        self._page_executor = None
+        self._page_executor_lock = threading.Lock()
+        self._list_executor = None
+        self.local_cache = local_cache if local_cache is not None else LocalCache(app_settings.L1_CACHE_MAXSIZE)
+        self._refresh_executor = ThreadPoolExecutor(
+            max_workers=app_settings.CACHE_REFRESH_WORKERS,
+            thread_name_prefix="tmdb-refresh"
+        )
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        # El hilo de escucha lo arranca start_background_tasks() (app.py) en cada proceso que
+        # atiende peticiones, no la importación: el maestro de gunicorn no debe hacer fork
+        # con hilos ni conexiones pub/sub abiertas.
+        self.invalidation_bus = None
+        if redis_client:
+            self.invalidation_bus = InvalidationBus(redis_client, self.local_cache)
+        self.single_flight = SingleFlight(
+            redis_client,
+            lock_timeout=app_settings.SINGLE_FLIGHT_LOCK_TIMEOUT,
+            poll_interval=app_settings.SINGLE_FLIGHT_POLL_INTERVAL
+        )
+        # Cubos separados para lecturas y modificaciones: los trabajos masivos no consumen
+        # el ritmo de las lecturas interactivas.
+        self.rate_limiters = rate_limiters or {
+            'read': DistributedTokenBucket(
+                redis_client, 'tmdb_read',
+                rate=app_settings.OUTBOUND_READ_RATE,
+                capacity=app_settings.OUTBOUND_READ_BURST
+            ),
+            'write': DistributedTokenBucket(
+                redis_client, 'tmdb_write',
+                rate=app_settings.OUTBOUND_WRITE_RATE,
+                capacity=app_settings.OUTBOUND_WRITE_BURST
+            ),
+        }
+
+    def pool_stats(self):
+        """
+        Obtiene las estadísticas del pool de conexiones HTTP (conexiones nuevas y reutilizadas).
+
+        Returns:
+            dict: Estadísticas por host y totales.
+        """
+        return session_pool_stats(self.session)
+
+    def cache_stats(self):
+        """
+        Obtiene los contadores de la caché en memoria (L1) por familia de claves.
+
+        Returns:
+            dict: Aciertos, fallos, expulsiones y expiraciones por familia.
+        """
+        return self.local_cache.stats()
+
+    def _request_timeout(self):
+        """
+        Calcula el tiempo de espera de una llamada HTTP sin superar el plazo de la petición.
+
+        Returns:
+            tuple: Tiempos de espera de conexión y de lectura en segundos.
+        """
+        connect_timeout, read_timeout = self.timeout
+        remaining = remaining_time()
+        if remaining is None:
+            return self.timeout
+        remaining = max(remaining, 0.001)
+        return (min(connect_timeout, remaining), min(read_timeout, remaining))
+
+    def _send(self, kind, method, url, **kwargs):
+        """
+        Envía una solicitud a la API tras obtener turno en el limitador de salida. Las
+        respuestas 429 reducen la tasa compartida y pausan el limitador según Retry-After.
+
+        Args:
+            kind (str): 'read' para consultas o 'write' para modificaciones.
+            method (str): Método HTTP.
+            url (str): URL de la solicitud.
+            **kwargs: Argumentos adicionales para requests.
+
+        Returns:
+            requests.Response: Respuesta de la API.
+
+        Raises:
+            RateLimitExceeded: Si no hay turno antes del plazo de la petición.
+        """
+        limiter = self.rate_limiters[kind]
+        remaining = remaining_time()
+        if not limiter.acquire(timeout=self.timeout[1] if remaining is None else max(remaining, 0)):
+            raise RateLimitExceeded(f"sin turno en el limitador '{kind}'")
+        endpoint = _endpoint_label(url)
+        with tracer.span('tmdb ' + endpoint, kind='CLIENT', method=method) as span:
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, timeout=self._request_timeout(), **kwargs)
+            except Exception:
+                upstream_requests.inc(endpoint, 'error')
+                raise
+            finally:
+                upstream_request_duration.observe(time.perf_counter() - started, endpoint)
+            if span is not None:
+                span.set_attribute('status_code', response.status_code)
+        upstream_requests.inc(endpoint, str(response.status_code))
+        if response.status_code == 429:
+            limiter.penalize(retry_after_seconds(response))
+        return response
+
+    def _get_page_executor(self):
+        """
+        Devuelve el pool de hilos acotado usado para descargar páginas en paralelo, creándolo
+        la primera vez que se necesita.
+
+        Returns:
+            ThreadPoolExecutor: Ejecutor compartido por todas las descargas paginadas del adaptador.
+        """
+        if self._page_executor is None:
+            with self._page_executor_lock:
+                if self._page_executor is None:
+                    self._page_executor = ThreadPoolExecutor(
+                        max_workers=self.pagination_max_workers,
+                        thread_name_prefix="tmdb-pages"
+                    )
+        return self._page_executor
+
+    def _get_list_executor(self):
+        """
+        Devuelve el pool de hilos usado para descargar listas completas en paralelo. Es
+        distinto del de páginas porque cada lista espera a sus propias páginas en ese pool.
+
+        Returns:
+            ThreadPoolExecutor: Ejecutor compartido por las vistas calculadas del adaptador.
+        """
+        if self._list_executor is None:
+            with self._page_executor_lock:
+                if self._list_executor is None:
+                    self._list_executor = ThreadPoolExecutor(
+                        max_workers=self.pagination_max_workers,
+                        thread_name_prefix="tmdb-lists"
+                    )
+        return self._list_executor
+
+    def _fetch_page(self, url, page):
+        """
+        Descarga una página concreta de un listado paginado de la API.
+
+        Args:
+            url (str): URL del listado.
+            page (int): Número de página a descargar.
+
+        Returns:
+            dict: Respuesta JSON de la página.
+        """
+        response = self._send('read', 'GET', url, headers=self.headers, params={"page": page})
+        response.raise_for_status()
+        return response.json()
+
+    def _fetch_all_pages(self, url, endpoint, description):
+        """
+        Descarga todas las páginas de un listado paginado. La primera página indica el total
+        de páginas y el resto se descarga en paralelo con un número acotado de hilos. Cada
+        página se reintenta por separado, de modo que un error transitorio no vuelve a
+        descargar las páginas ya obtenidas; si una página falla, se cancelan las pendientes.
+
+        Args:
+            url (str): URL del listado.
+            endpoint (str): Endpoint de la API para el interruptor de circuito.
+            description (str): Descripción de la operación para los mensajes de error.
+
+        Returns:
+            dict: Respuesta JSON de la primera página con los resultados de todas las páginas,
+                o None si alguna página no se pudo descargar. Si el listado supera
+                PAGINATION_MAX_PAGES solo se descargan esas páginas y la respuesta incluye
+                'truncated': True.
+        """
+        fetch_page = retry_with_backoff(endpoint, description)(self._fetch_page)
+        first_page = fetch_page(url, 1)
+        if first_page is None:
+            return None
+        available_pages = int(first_page.get('total_pages') or 1)
+        total_pages = min(available_pages, self.pagination_max_pages)
+        truncated = available_pages > total_pages
+        if truncated:
+            logger.warning(
+                "El listado %s tiene %s páginas; solo se descargan las primeras %s (PAGINATION_MAX_PAGES).",
+                _endpoint_label(url), available_pages, total_pages
+            )
+        if total_pages <= 1:
+            return dict(first_page, truncated=True) if truncated else first_page
+
+        executor = self._get_page_executor()
+        futures = [
+            executor.submit(contextvars.copy_context().run, fetch_page, url, page)
+            for page in range(2, total_pages + 1)
+        ]
+
+        results = list(first_page.get('results', []))
+        try:
+            for future in futures:
+                page = future.result()
+                if page is None:
+                    return None
+                results.extend(page.get('results', []))
+        finally:
+            # Sin efecto si todas terminaron; si una falló, las que no empezaron no se descargan
+            for future in futures:
+                future.cancel()
+
+        merged = dict(first_page)
+        merged['results'] = results
+        if truncated:
+            merged['truncated'] = True
+        return merged
 
     def _cache_response(self, key, duration, response):
         """
-        Almacena la respuesta en caché en Redis si está disponible.
+        Almacena la respuesta en la caché en memoria (L1) y en Redis (L2) si está disponible.
+        La entrada se considera fresca durante 'duration' segundos y se conserva hasta el
+        TTL duro (CACHE_STALE_DURATION) para poder servirla obsoleta mientras se refresca
+        o si la API falla.
 
         Args:
             key (str): Clave para identificar el dato en caché.
-            duration (int): Duración en segundos para almacenar el dato.
+            duration (int): Duración en segundos durante la que el dato se considera fresco.
             response (dict): Respuesta JSON a almacenar en caché.
+
+        Returns:
+            CacheEntry: Entrada almacenada.
+        """
+        with tracer.span('cache.set', key=key):
+            entry = CacheEntry(response, time.time())
+            hard_ttl = max(self.stale_duration, duration)
+            self.local_cache.set(key, entry, hard_ttl)
+            if self.redis_client:
+                try:
+                    pipeline = self.redis_client.pipeline(transaction=True)
+                    pipeline.delete(key)
+                    pipeline.hset(key, mapping=entry.to_redis_mapping())
+                    pipeline.expire(key, hard_ttl)
+                    started = time.perf_counter()
+                    pipeline.execute()
+                    redis_command_duration.observe(time.perf_counter() - started, 'write')
+                except redis.exceptions.ConnectionError:
+                    logger.warning("Redis no está disponible, continuando sin caché.")
+                except redis.exceptions.RedisError as e:
+                    logger.error("Error al guardar en caché: %s", e)
+        return entry
+
+    def _get_cached_entry(self, key, local=True):
+        """
+        Recupera la entrada de la caché en memoria (L1) o, si no está, de Redis (L2).
+        Los aciertos en Redis se copian a la caché en memoria hasta su TTL duro, de modo
+        que ambas capas expiran a la vez.
+
+        Args:
+            key (str): Clave para identificar el dato en caché.
+            local (bool): Si es False, se omite la caché en memoria y se consulta Redis.
+
+        Returns:
+            CacheEntry: Entrada en caché (fresca u obsoleta) o None si no está disponible.
+        """
+        with tracer.span('cache.get', key=key) as span:
+            if local:
+                entry = self.local_cache.get(key)
+                if entry is not None:
+                    if span is not None:
+                        span.set_attribute('layer', 'l1')
+                    return entry
+
+            if self.redis_client:
+                try:
+                    started = time.perf_counter()
+                    mapping = self.redis_client.hgetall(key)
+                    redis_command_duration.observe(time.perf_counter() - started, 'read')
+                    entry = CacheEntry.from_redis_mapping(mapping)
+                    if entry is not None:
+                        remaining = entry.stored_at + max(self.stale_duration, self.cache_duration) - time.time()
+                        self.local_cache.set(key, entry, remaining)
+                        if span is not None:
+                            span.set_attribute('layer', 'redis')
+                        return entry
+                except redis.exceptions.ConnectionError:
+                    logger.warning("Redis no está disponible, continuando sin caché.")
+                except redis.exceptions.RedisError as e:
+                    logger.error("Error al recuperar de caché: %s", e)
+            if span is not None:
+                span.set_attribute('layer', 'miss')
+            return None
+
+    def _get_cached_entries(self, keys):
+        """
+        Recupera varias entradas de la caché. Las que no están en memoria (L1) se leen de
+        Redis (L2) en un único viaje de red mediante un pipeline.
+
+        Args:
+            keys (list): Claves para identificar los datos en caché.
+
+        Returns:
+            dict: Entrada (o None si no está disponible) por clave.
         """
-        if self.redis_client:
+        entries = {key: self.local_cache.get(key) for key in keys}
+        missing = [key for key, entry in entries.items() if entry is None]
+        if not missing or not self.redis_client:
+            return entries
+        with tracer.span('cache.get_many', count=len(missing)):
             try:
-                self.redis_client.setex(key, duration, json.dumps(response))
+                pipeline = self.redis_client.pipeline(transaction=False)
+                for key in missing:
+                    pipeline.hgetall(key)
+                started = time.perf_counter()
+                mappings = pipeline.execute()
+                redis_command_duration.observe(time.perf_counter() - started, 'read_many')
+                for key, mapping in zip(missing, mappings):
+                    entry = CacheEntry.from_redis_mapping(mapping)
+                    if entry is not None:
+                        self._set_local_entry(key, entry)
+                        entries[key] = entry
             except redis.exceptions.ConnectionError:
-                print("Redis no está disponible, continuando sin caché.")
+                logger.warning("Redis no está disponible, continuando sin caché.")
             except redis.exceptions.RedisError as e:
-                print(f"Error al guardar en caché: {e}", file=sys.stderr)
+                logger.error("Error al recuperar de caché: %s", e)
+        return entries
 
     def _get_cached_response(self, key):
         """
-        Recupera la respuesta de la caché si está disponible en Redis.
+        Recupera la respuesta de la caché si está disponible, aunque esté obsoleta.
 
         Args:
             key (str): Clave para identificar el dato en caché.
@@ -87,18 +444,417 @@ class MovieAPIAdapter:
         Returns:
             dict: Datos en caché o None si no están disponibles.
         """
-        if self.redis_client:
-            try:
-                cached_data = self.redis_client.get(key)
-                if cached_data:
-                    return json.loads(cached_data)
-            except redis.exceptions.ConnectionError:
-                print("Redis no está disponible, continuando sin caché.")
-            except redis.exceptions.RedisError as e:
-                print(f"Error al recuperar de caché: {e}", file=sys.stderr)
-        return None
+        entry = self._get_cached_entry(key)
+        return entry.value if entry is not None else None
+
+    def _get_with_cache(self, cache_key, fetch):
+        """
+        Obtiene un dato de la caché o de la API (ver _get_entry_with_cache).
+
+        Args:
+            cache_key (str): Clave para identificar el dato en caché.
+            fetch (callable): Función que descarga el dato de la API o devuelve None si falla.
+
+        Returns:
+            dict: Datos de la caché o de la API, o None si no hay ninguno disponible.
+        """
+        entry = self._get_entry_with_cache(cache_key, fetch)
+        return entry.value if entry is not None else None
+
+    def _get_entry_with_cache(self, cache_key, fetch):
+        """
+        Obtiene la entrada de un dato aplicando stale-while-revalidate: una entrada fresca se
+        devuelve directamente; una entrada obsoleta se devuelve de inmediato mientras un único
+        refresco se ejecuta en segundo plano; sin entrada se consulta la API, agrupando las
+        llamadas concurrentes para que solo una llegue a TMDB.
+
+        Args:
+            cache_key (str): Clave para identificar el dato en caché.
+            fetch (callable): Función que descarga el dato de la API o devuelve None si falla.
+
+        Returns:
+            CacheEntry: Entrada de la caché o de la API, o None si no hay ninguna disponible.
+        """
+        entry = self._get_cached_entry(cache_key)
+        if entry is not None:
+            if entry.is_stale(self.cache_duration):
+                cache_requests.inc(key_family(cache_key), 'stale')
+                self._schedule_refresh(cache_key, fetch)
+            else:
+                cache_requests.inc(key_family(cache_key), 'hit')
+            return entry
+
+        cache_requests.inc(key_family(cache_key), 'miss')
+        return self._load(cache_key, fetch)
+
+    def _load(self, cache_key, fetch, newer_than=None):
+        """
+        Descarga un dato y lo guarda en caché con una sola llamada a la API por clave entre
+        todos los hilos, procesos y nodos que lo piden a la vez.
+
+        Args:
+            cache_key (str): Clave para identificar el dato en caché.
+            fetch (callable): Función que descarga el dato de la API o devuelve None si falla.
+            newer_than (float, opcional): Instante (epoch) a partir del cual una entrada
+                publicada por otro proceso se acepta en lugar de consultar la API. Por defecto
+                se acepta cualquier entrada fresca.
+
+        Returns:
+            CacheEntry: Entrada fresca o None si la API falló.
+        """
+        def load():
+            # Otro proceso pudo publicar el dato mientras se esperaba el candado.
+            entry = self._get_fresh_remote_entry(cache_key, newer_than)
+            if entry is not None:
+                return entry
+            response_json = fetch()
+            if response_json is None:
+                return None
+            entry = self._cache_response(cache_key, self.cache_duration, response_json)
+            # El resto de procesos descarta su copia en memoria y lee la nueva de Redis.
+            if self.invalidation_bus:
+                self.invalidation_bus.publish(cache_key)
+            if cache_key in (f"favorite_movies_{self.account_id}", f"rated_movies_{self.account_id}"):
+                self._rebuild_rated_favorites()
+            return entry
+
+        return self.single_flight.do(cache_key, load, poll=lambda: self._get_fresh_remote_entry(cache_key, newer_than))
+
+    def _get_fresh_remote_entry(self, cache_key, newer_than=None):
+        """
+        Recupera de Redis una entrada que aún no haya superado su TTL blando.
+
+        Args:
+            cache_key (str): Clave para identificar el dato en caché.
+            newer_than (float, opcional): Si se indica, solo se acepta una entrada obtenida
+                a partir de ese instante (epoch).
+
+        Returns:
+            CacheEntry: Entrada fresca o None.
+        """
+        if not self.redis_client:
+            return None
+        entry = self._get_cached_entry(cache_key, local=False)
+        if entry is None or entry.is_stale(self.cache_duration):
+            return None
+        if newer_than is not None and entry.stored_at < newer_than:
+            return None
+        return entry
+
+    def cache_sources(self):
+        """
+        Obtiene los listados que el adaptador guarda en caché junto con la función que los
+        descarga, para que el precalentador de caché pueda refrescarlos.
+
+        Returns:
+            dict: Función de descarga por clave de caché.
+        """
+        return {
+            "popular_movies": self._fetch_popular_movies,
+            f"favorite_movies_{self.account_id}": self._fetch_favorite_movies,
+            f"rated_movies_{self.account_id}": self._fetch_rated_movies,
+        }
+
+    def peek_entry(self, cache_key):
+        """
+        Consulta la entrada compartida de una clave sin refrescarla ni consultar la API. Con
+        Redis se lee la copia compartida por todos los procesos.
+
+        Args:
+            cache_key (str): Clave para identificar el dato en caché.
+
+        Returns:
+            CacheEntry: Entrada en caché o None si no está disponible.
+        """
+        return self._get_cached_entry(cache_key, local=not self.redis_client)
+
+    def refresh_entry(self, cache_key, fetch):
+        """
+        Vuelve a descargar un dato aunque la copia en caché siga fresca. Si otro proceso lo
+        refresca a la vez, se reutiliza su resultado.
+
+        Args:
+            cache_key (str): Clave para identificar el dato en caché.
+            fetch (callable): Función que descarga el dato de la API o devuelve None si falla.
+
+        Returns:
+            CacheEntry: Entrada refrescada o None si la API falló.
+        """
+        return self._load(cache_key, fetch, newer_than=time.time())
+
+    def _schedule_refresh(self, cache_key, fetch):
+        """
+        Programa el refresco en segundo plano de una entrada obsoleta. Solo se ejecuta un
+        refresco por clave a la vez dentro del proceso.
+
+        Args:
+            cache_key (str): Clave de la entrada a refrescar.
+            fetch (callable): Función que descarga el dato de la API.
+
+        Returns:
+            Future: Refresco programado o None si ya había uno en curso.
+        """
+        with self._refresh_lock:
+            if cache_key in self._refreshing:
+                return None
+            self._refreshing.add(cache_key)
+        try:
+            return self._refresh_executor.submit(self._refresh, cache_key, fetch)
+        except RuntimeError:
+            with self._refresh_lock:
+                self._refreshing.discard(cache_key)
+            return None
+
+    def _refresh(self, cache_key, fetch):
+        """
+        Refresca una entrada obsoleta. Si otro proceso ya la refrescó en Redis se reutiliza;
+        si la API falla se conserva la última copia válida hasta su TTL duro.
+
+        Args:
+            cache_key (str): Clave de la entrada a refrescar.
+            fetch (callable): Función que descarga el dato de la API.
+        """
+        try:
+            if self._load(cache_key, fetch) is None:
+                logger.warning("No se pudo refrescar '%s', se sigue sirviendo la copia en caché.", cache_key)
+        except Exception as e:
+            logger.error("Error al refrescar '%s': %s", cache_key, e)
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(cache_key)
+
+    def _update_cached_list(self, key, mutate):
+        """
+        Actualiza en el sitio una lista en caché tras una modificación confirmada por la API.
+        En Redis se aplica con WATCH/MULTI para que la lectura y la escritura sean atómicas;
+        la entrada conserva su instante de obtención y su TTL. Si mutate devuelve None la
+        entrada se invalida. El resto de procesos descarta su copia en memoria.
+
+        Args:
+            key (str): Clave de la lista en caché.
+            mutate (callable): Recibe la respuesta en caché y devuelve una nueva respuesta
+                (sin modificar la original) o None para invalidarla.
+        """
+        if not self.redis_client:
+            entry = self.local_cache.get(key)
+            if entry is None:
+                return
+            new_value = mutate(entry.value)
+            if new_value is None:
+                self.local_cache.delete(key)
+            else:
+                self._set_local_entry(key, CacheEntry(new_value, entry.stored_at))
+            return
+
+        new_entry = None
+        try:
+            with self.redis_client.pipeline(transaction=True) as pipeline:
+                for _ in range(3):
+                    try:
+                        pipeline.watch(key)
+                        entry = CacheEntry.from_redis_mapping(pipeline.hgetall(key))
+                        new_value = mutate(entry.value) if entry is not None else None
+                        pipeline.multi()
+                        if new_value is None:
+                            pipeline.delete(key)
+                            new_entry = None
+                        else:
+                            new_entry = CacheEntry(new_value, entry.stored_at)
+                            pipeline.hset(key, mapping=new_entry.to_redis_mapping())
+                        pipeline.execute()
+                        break
+                    except redis.exceptions.WatchError:
+                        continue
+                else:
+                    # Demasiada contención sobre la clave: se invalida en lugar de actualizar.
+                    self.redis_client.delete(key)
+                    new_entry = None
+        except redis.exceptions.ConnectionError:
+            logger.warning("Redis no está disponible, continuando sin caché.")
+        except redis.exceptions.RedisError as e:
+            logger.error("Error al actualizar la caché: %s", e)
+            new_entry = None
+
+        if new_entry is None:
+            self.local_cache.delete(key)
+        else:
+            self._set_local_entry(key, new_entry)
+        self.invalidation_bus.publish(key)
+
+    def _set_local_entry(self, key, entry):
+        """
+        Guarda una entrada en la caché en memoria hasta su TTL duro.
+
+        Args:
+            key (str): Clave para identificar el dato en caché.
+            entry (CacheEntry): Entrada a guardar.
+        """
+        remaining = entry.stored_at + max(self.stale_duration, self.cache_duration) - time.time()
+        self.local_cache.set(key, entry, remaining)
+
+    def apply_favorite_changes(self, added_ids=(), removed_ids=()):
+        """
+        Refleja en la caché de favoritas una o varias altas y bajas ya confirmadas por la API.
+        Las bajas se eliminan de la lista en caché; como la API no devuelve los datos de las
+        películas agregadas, cualquier alta invalida la lista para que se vuelva a descargar.
+
+        Args:
+            added_ids (iterable): IDs de películas agregadas a favoritas.
+            removed_ids (iterable): IDs de películas eliminadas de favoritas.
+        """
+        added_ids = set(added_ids)
+        removed_ids = set(removed_ids)
+        if not added_ids and not removed_ids:
+            return
+
+        def mutate(response):
+            if added_ids:
+                return None
+            return _without_movies(response, removed_ids)
+
+        self._update_cached_list(f"favorite_movies_{self.account_id}", mutate)
+
+        # Las películas agregadas se incorporan a la vista con los datos de la lista de calificadas.
+        rated = self._get_cached_entry(f"rated_movies_{self.account_id}") if added_ids else None
+
+        def mutate_view(response):
+            updated = _without_movies(response, removed_ids) if removed_ids else dict(response)
+            if added_ids:
+                if rated is None:
+                    return None
+                present = {movie['id'] for movie in updated['results']}
+                added = [movie for movie in rated.value.get('results', []) if movie['id'] in added_ids and movie['id'] not in present]
+                updated['results'] = updated['results'] + added
+                updated['total_results'] = len(updated['results'])
+            return updated
+
+        self._update_cached_list(f"rated_favorite_movies_{self.account_id}", mutate_view)
+
+    def apply_rating_changes(self, ratings):
+        """
+        Refleja en la caché de calificadas una o varias calificaciones ya confirmadas por la
+        API. Las películas que ya estaban en la lista se actualizan en el sitio; si alguna no
+        estaba, la lista se invalida porque la API no devuelve sus datos.
+
+        Args:
+            ratings (dict): Calificación por ID de película.
+        """
+        if not ratings:
+            return
+
+        def mutate(response):
+            results = response.get('results', [])
+            if not set(ratings).issubset(movie['id'] for movie in results):
+                return None
+            updated = dict(response)
+            updated['results'] = [
+                dict(movie, rating=ratings[movie['id']]) if movie['id'] in ratings else movie
+                for movie in results
+            ]
+            return updated
+
+        self._update_cached_list(f"rated_movies_{self.account_id}", mutate)
+
+        # Las películas calificadas que son favoritas se actualizan o se incorporan a la vista.
+        favorites = self._get_cached_entry(f"favorite_movies_{self.account_id}")
+
+        def mutate_view(response):
+            if favorites is None:
+                # Sin la lista de favoritas solo se pueden actualizar las películas ya presentes.
+                if not set(ratings).issubset(movie['id'] for movie in response.get('results', [])):
+                    return None
+                favorite_movies = {}
+            else:
+                favorite_movies = {movie['id']: movie for movie in favorites.value.get('results', []) if movie['id'] in ratings}
+            results = [
+                dict(movie, rating=ratings[movie['id']]) if movie['id'] in ratings else movie
+                for movie in response.get('results', [])
+            ]
+            present = {movie['id'] for movie in results}
+            results.extend(
+                dict(favorite_movies[movie_id], rating=rating)
+                for movie_id, rating in ratings.items()
+                if movie_id in favorite_movies and movie_id not in present
+            )
+            updated = dict(response)
+            updated['results'] = results
+            updated['total_results'] = len(results)
+            return updated
+
+        self._update_cached_list(f"rated_favorite_movies_{self.account_id}", mutate_view)
+
+    def _rebuild_rated_favorites(self):
+        """
+        Recalcula la vista de calificadas en favoritas a partir de las dos listas en caché,
+        tras refrescarse cualquiera de ellas. Si falta alguna, la vista se invalida y se
+        recalculará en la siguiente lectura.
+        """
+        key = f"rated_favorite_movies_{self.account_id}"
+        rated, favorites = self.get_rated_and_favorite_cached_entries()
+        if rated is None or favorites is None:
+            self._update_cached_list(key, lambda response: None)
+            return
+        self._cache_response(key, self.cache_duration, _rated_in_favorites(rated.value, favorites.value))
+        if self.invalidation_bus:
+            self.invalidation_bus.publish(key)
+
+    def get_rated_favorite_movies(self):
+        """
+        Obtiene las películas calificadas que también están en favoritas.
+
+        Returns:
+            dict: Listado de la caché o calculado a partir de ambas listas, o None si no
+                hay ninguna disponible.
+        """
+        return self._get_with_cache(f"rated_favorite_movies_{self.account_id}", self._build_rated_favorites)
+
+    def get_rated_favorite_movies_entry(self):
+        """
+        Obtiene la entrada en caché de la vista de calificadas en favoritas. Normalmente es
+        una única lectura de la caché; solo si falta se calcula a partir de ambas listas.
+
+        Returns:
+            CacheEntry: Entrada de la vista o None si no hay ninguna disponible.
+        """
+        return self._get_entry_with_cache(f"rated_favorite_movies_{self.account_id}", self._build_rated_favorites)
+
+    def _build_rated_favorites(self):
+        """
+        Calcula la vista de calificadas en favoritas a partir de ambas listas, obteniéndolas
+        de la caché o de la API. Si hay que obtener las dos, se descargan a la vez.
+
+        Returns:
+            dict: Listado de la vista o None si alguna lista no está disponible.
+        """
+        rated, favorites = self.get_rated_and_favorite_cached_entries()
+        refresh_rated = rated is None or rated.is_stale(self.cache_duration)
+        refresh_favorites = favorites is None or favorites.is_stale(self.cache_duration)
+        rated_future = None
+        if refresh_rated and refresh_favorites:
+            rated_future = self._get_list_executor().submit(contextvars.copy_context().run, self.get_rated_movies_entry)
+        elif refresh_rated:
+            rated = self.get_rated_movies_entry()
+        if refresh_favorites:
+            favorites = self.get_favorite_movies_entry()
+        if rated_future is not None:
+            rated = rated_future.result()
+        if rated is None or favorites is None:
+            return None
+        return _rated_in_favorites(rated.value, favorites.value)
+
+    def get_rated_and_favorite_cached_entries(self):
+        """
+        Lee de la caché las listas de calificadas y favoritas en un único viaje a Redis, sin
+        consultar la API.
+
+        Returns:
+            tuple: Entradas (calificadas, favoritas); cada una puede ser None.
+        """
+        rated_key = f"rated_movies_{self.account_id}"
+        favorites_key = f"favorite_movies_{self.account_id}"
+        entries = self._get_cached_entries([rated_key, favorites_key])
+        return entries[rated_key], entries[favorites_key]
 
-    @retry_with_backoff(max_retries=3, backoff_factor=2)
     def get_popular_movies(self):
         """
         Obtiene las películas populares de la API y las guarda en caché si es posible.
@@ -106,23 +862,30 @@ class MovieAPIAdapter:
         Returns:
             dict: Respuesta JSON de la API o de la caché si está disponible.
         """
-        cache_key = "popular_movies"
-        cached_response = self._get_cached_response(cache_key)
+        return self._get_with_cache("popular_movies", self._fetch_popular_movies)
 
-        if cached_response:
-            return cached_response
+    def get_popular_movies_entry(self):
+        """
+        Obtiene la entrada en caché de las películas populares, que da acceso al documento JSON
+        serializado sin deserializarlo.
 
-        try:
-            response = requests.get(f"https://api.themoviedb.org/3/movie/popular?api_key={self.api_key}")
-            response.raise_for_status()
-            response_json = response.json()
-            self._cache_response(cache_key, self.cache_duration, response_json)
-            return response_json
-        except RequestException as e:
-            print(f"Error al obtener películas populares: {e}", file=sys.stderr)
-            return None
+        Returns:
+            CacheEntry: Entrada de la caché o de la API, o None si no hay ninguna disponible.
+        """
+        return self._get_entry_with_cache("popular_movies", self._fetch_popular_movies)
+
+    @retry_with_backoff("movie/popular", "obtener películas populares")
+    def _fetch_popular_movies(self):
+        """
+        Descarga las películas populares de la API.
+
+        Returns:
+            dict: Respuesta JSON de la API o None en caso de error.
+        """
+        response = self._send('read', 'GET', f"{self.api_url}/movie/popular?api_key={self.api_key}")
+        response.raise_for_status()
+        return project_listing(response.json())
 
-    @retry_with_backoff(max_retries=3, backoff_factor=2)
     def get_favorite_movies(self):
         """
         Obtiene las películas favoritas de la cuenta y las guarda en caché si es posible.
@@ -130,93 +893,88 @@ class MovieAPIAdapter:
         Returns:
             dict: Respuesta JSON de la API o de la caché si está disponible.
         """
-        cache_key = f"favorite_movies_{self.account_id}"
-        cached_response = self._get_cached_response(cache_key)
+        return self._get_with_cache(f"favorite_movies_{self.account_id}", self._fetch_favorite_movies)
 
-        if cached_response:
-            return cached_response
+    def get_favorite_movies_entry(self):
+        """
+        Obtiene la entrada en caché de las películas favoritas, que da acceso al documento JSON
+        serializado sin deserializarlo.
 
-        try:
-            response = requests.get(f"{self.base_url}/favorite/movies", headers=self.headers)
-            response.raise_for_status()
-            response_json = response.json()
-            self._cache_response(cache_key, self.cache_duration, response_json)
-            return response_json
-        except RequestException as e:
-            print(f"Error al obtener películas favoritas: {e}", file=sys.stderr)
-            return None
+        Returns:
+            CacheEntry: Entrada de la caché o de la API, o None si no hay ninguna disponible.
+        """
+        return self._get_entry_with_cache(f"favorite_movies_{self.account_id}", self._fetch_favorite_movies)
+
+    def _fetch_favorite_movies(self):
+        """
+        Descarga todas las páginas de películas favoritas de la cuenta.
+
+        Returns:
+            dict: Respuesta JSON de la API o None en caso de error.
+        """
+        listing = self._fetch_all_pages(
+            f"{self.base_url}/favorite/movies", "account/favorite/movies", "obtener películas favoritas"
+        )
+        return None if listing is None else project_listing(listing)
 
-    @retry_with_backoff(max_retries=3, backoff_factor=2)
-    def add_favorite_movie(self, media_id):
+    @retry_with_backoff("account/favorite", "agregar película favorita")
+    def add_favorite_movie(self, media_id, update_cache=True):
         """
         Agrega una película a la lista de favoritos.
 
         Args:
             media_id (int): ID de la película a marcar como favorita.
+            update_cache (bool): Si es True, actualiza la caché de favoritas tras el éxito.
 
         Returns:
             response: Respuesta de la API o None en caso de error.
         """
         payload = {"media_type": "movie", "media_id": media_id, "favorite": True}
-        try:
-            response = requests.post(f"{self.base_url}/favorite", headers=self.headers, json=payload)
-            response.raise_for_status()
-            return response
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 500:
-                print("Error al agregar película favorita", file=sys.stderr)
-            else:
-                print(f"Error al agregar película favorita: {e}", file=sys.stderr)
-            return None
-
-    @retry_with_backoff(max_retries=3, backoff_factor=2)
-    def delete_favorite_movie(self, media_id):
+        response = self._send('write', 'POST', f"{self.base_url}/favorite", headers=self.headers, json=payload)
+        response.raise_for_status()
+        if update_cache:
+            self.apply_favorite_changes(added_ids=[media_id])
+        return response
+
+    @retry_with_backoff("account/favorite", "eliminar película favorita")
+    def delete_favorite_movie(self, media_id, update_cache=True):
         """
         Elimina una película de la lista de favoritos.
 
         Args:
             media_id (int): ID de la película a eliminar de favoritos.
+            update_cache (bool): Si es True, actualiza la caché de favoritas tras el éxito.
 
         Returns:
             response: Respuesta de la API o None en caso de error.
         """
         payload = {"media_type": "movie", "media_id": media_id, "favorite": False}
-        try:
-            response = requests.post(f"{self.base_url}/favorite", headers=self.headers, json=payload)
-            response.raise_for_status()
-            return response
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 500:
-                print("Error al eliminar película favorita:", file=sys.stderr)
-            else:
-                print(f"Error al eliminar película favorita: {e}", file=sys.stderr)
-            return None
-
-    @retry_with_backoff(max_retries=3, backoff_factor=2)
-    def rate_movie(self, movie_id, rating):
+        response = self._send('write', 'POST', f"{self.base_url}/favorite", headers=self.headers, json=payload)
+        response.raise_for_status()
+        if update_cache:
+            self.apply_favorite_changes(removed_ids=[media_id])
+        return response
+
+    @retry_with_backoff("movie/rating", "calificar película")
+    def rate_movie(self, movie_id, rating, update_cache=True):
         """
         Califica una película en la API.
 
         Args:
             movie_id (int): ID de la película a calificar.
             rating (float): Calificación otorgada a la película.
+            update_cache (bool): Si es True, actualiza la caché de calificadas tras el éxito.
 
         Returns:
             response: Respuesta de la API o None en caso de error.
         """
         payload = {"value": rating}
-        try:
-            response = requests.post(f"https://api.themoviedb.org/3/movie/{movie_id}/rating", headers=self.headers, json=payload)
-            response.raise_for_status()
-            return response
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 500:
-                print("Error al calificar película", file=sys.stderr)
-            else:
-                print(f"Error al calificar película: {e}", file=sys.stderr)
-            return None
+        response = self._send('write', 'POST', f"{self.api_url}/movie/{movie_id}/rating", headers=self.headers, json=payload)
+        response.raise_for_status()
+        if update_cache:
+            self.apply_rating_changes({movie_id: rating})
+        return response
 
-    @retry_with_backoff(max_retries=3, backoff_factor=2)
     def get_rated_movies(self):
         """
         Obtiene las películas calificadas de la cuenta y las guarda en caché si es posible.
@@ -224,18 +982,26 @@ class MovieAPIAdapter:
         Returns:
             dict: Respuesta JSON de la API o de la caché si está disponible.
         """
-        cache_key = f"rated_movies_{self.account_id}"
-        cached_response = self._get_cached_response(cache_key)
+        return self._get_with_cache(f"rated_movies_{self.account_id}", self._fetch_rated_movies)
 
-        if cached_response:
-            return cached_response
+    def get_rated_movies_entry(self):
+        """
+        Obtiene la entrada en caché de las películas calificadas, que da acceso al documento JSON
+        serializado sin deserializarlo.
 
-        try:
-            response = requests.get(f"{self.base_url}/rated/movies", headers=self.headers)
-            response.raise_for_status()
-            response_json = response.json()
-            self._cache_response(cache_key, self.cache_duration, response_json)
-            return response_json
-        except RequestException as e:
-            print(f"Error al obtener películas calificadas: {e}", file=sys.stderr)
-            return None
+        Returns:
+            CacheEntry: Entrada de la caché o de la API, o None si no hay ninguna disponible.
+        """
+        return self._get_entry_with_cache(f"rated_movies_{self.account_id}", self._fetch_rated_movies)
+
+    def _fetch_rated_movies(self):
+        """
+        Descarga todas las páginas de películas calificadas de la cuenta.
+
+        Returns:
+            dict: Respuesta JSON de la API o None en caso de error.
+        """
+        listing = self._fetch_all_pages(
+            f"{self.base_url}/rated/movies", "account/rated/movies", "obtener películas calificadas"
+        )
+        return None if listing is None else project_listing(listing)
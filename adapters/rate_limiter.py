@@ -0,0 +1,235 @@
+import logging
+import threading
+import time
+import redis
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Limitador de tasa local basado en un cubo de fichas: permite ráfagas de hasta 'capacity'
+    llamadas y un ritmo sostenido de 'rate' llamadas por segundo.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        Inicializa el cubo lleno.
+
+        Args:
+            rate (float): Fichas que se reponen por segundo.
+            capacity (float, opcional): Tamaño máximo del cubo. Por defecto igual a rate.
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _current_rate(self, now):
+        return self.rate
+
+    def _refill(self, now):
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self._current_rate(now))
+        self._updated_at = now
+
+    def try_acquire(self, tokens=1):
+        """
+        Consume fichas si hay suficientes.
+
+        Args:
+            tokens (float): Fichas a consumir.
+
+        Returns:
+            float: 0 si se consumieron, o los segundos a esperar hasta que haya suficientes.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self._current_rate(now)
+
+    def acquire(self, tokens=1, timeout=None):
+        """
+        Espera hasta poder consumir fichas.
+
+        Args:
+            tokens (float): Fichas a consumir.
+            timeout (float, opcional): Segundos máximos de espera.
+
+        Returns:
+            bool: True si se consumieron las fichas, False si se agotó la espera.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait_time = self.try_acquire(tokens)
+            if wait_time == 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if wait_time > remaining:
+                    # No habrá fichas a tiempo: se falla sin esperar en vano.
+                    return False
+            time.sleep(wait_time)
+
+
+# Cubo compartido en Redis: repone fichas según el tiempo del servidor, recupera poco a poco
+# la tasa reducida tras un 429 y respeta la pausa impuesta por Retry-After.
+_ACQUIRE_SCRIPT = """
+local pause = redis.call('PTTL', KEYS[2])
+if pause > 0 then
+    return tostring(pause / 1000)
+end
+local max_rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local recovery = tonumber(ARGV[4])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at', 'rate')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+local rate = tonumber(state[3]) or max_rate
+local elapsed = math.max(now - updated_at, 0)
+rate = math.min(max_rate, rate + recovery * elapsed)
+tokens = math.min(capacity, tokens + elapsed * rate)
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now), 'rate', tostring(rate))
+redis.call('EXPIRE', KEYS[1], 3600)
+return tostring(wait)
+"""
+
+# Reduce la tasa compartida (sin bajar del mínimo) y, si se indica, pausa el cubo.
+_PENALIZE_SCRIPT = """
+local max_rate = tonumber(ARGV[1])
+local min_rate = tonumber(ARGV[2])
+local factor = tonumber(ARGV[3])
+local pause_ms = tonumber(ARGV[4])
+local rate = tonumber(redis.call('HGET', KEYS[1], 'rate')) or max_rate
+rate = math.max(min_rate, rate * factor)
+redis.call('HSET', KEYS[1], 'rate', tostring(rate))
+redis.call('EXPIRE', KEYS[1], 3600)
+if pause_ms > 0 and redis.call('PTTL', KEYS[2]) < pause_ms then
+    redis.call('SET', KEYS[2], '1', 'PX', pause_ms)
+end
+return tostring(rate)
+"""
+
+
+class DistributedTokenBucket(TokenBucket):
+    """
+    Cubo de fichas compartido por todos los procesos y réplicas a través de Redis, de modo
+    que el ritmo total hacia TMDB no crece con el número de workers.
+
+    La tasa se adapta a TMDB: cada respuesta 429 la reduce multiplicativamente y pausa el
+    cubo durante Retry-After; después se recupera de forma lineal hasta la tasa configurada.
+    Si Redis no está disponible se recurre al cubo local del proceso, que adapta su tasa de
+    la misma manera.
+    """
+
+    def __init__(self, redis_client, name, rate, capacity=None, min_rate=None, backoff_factor=0.5, recovery=None):
+        """
+        Inicializa el cubo compartido.
+
+        Args:
+            redis_client (redis.Redis): Cliente de Redis compartido, o None para usar solo el cubo local.
+            name (str): Nombre del cubo; los procesos con el mismo nombre comparten la tasa.
+            rate (float): Tasa máxima en llamadas por segundo.
+            capacity (float, opcional): Ráfaga máxima. Por defecto igual a rate.
+            min_rate (float, opcional): Tasa mínima tras reducciones. Por defecto un 10% de rate.
+            backoff_factor (float): Factor aplicado a la tasa en cada 429.
+            recovery (float, opcional): Llamadas por segundo que la tasa recupera por cada
+                segundo sin 429. Por defecto un 5% de rate.
+        """
+        super().__init__(rate, capacity)
+        self.redis_client = redis_client
+        self.name = name
+        self.min_rate = float(min_rate if min_rate is not None else self.rate * 0.1)
+        self.backoff_factor = backoff_factor
+        self.recovery = float(recovery if recovery is not None else self.rate * 0.05)
+        self._key = f"rate_limit:{name}"
+        self._pause_key = f"rate_limit:{name}:pause"
+        self._paused_until = 0.0
+        self._throttled = 0
+        # Tasa del cubo local, reducida por los 429 y recuperada con el tiempo
+        self._local_rate = self.rate
+        self._local_rate_updated_at = time.monotonic()
+
+    def _current_rate(self, now):
+        elapsed = max(now - self._local_rate_updated_at, 0)
+        self._local_rate = min(self.rate, self._local_rate + self.recovery * elapsed)
+        self._local_rate_updated_at = now
+        return self._local_rate
+
+    def try_acquire(self, tokens=1):
+        """
+        Consume fichas del cubo compartido si hay suficientes.
+
+        Args:
+            tokens (float): Fichas a consumir.
+
+        Returns:
+            float: 0 si se consumieron, o los segundos a esperar hasta que haya suficientes.
+        """
+        if self.redis_client:
+            try:
+                return float(self.redis_client.eval(
+                    _ACQUIRE_SCRIPT, 2, self._key, self._pause_key,
+                    self.rate, self.capacity, tokens, self.recovery
+                ))
+            except redis.exceptions.RedisError as e:
+                logger.warning("Limitador '%s' sin Redis, usando el límite local: %s", self.name, e)
+        paused = self._paused_until - time.monotonic()
+        if paused > 0:
+            return paused
+        return super().try_acquire(tokens)
+
+    def penalize(self, retry_after=None):
+        """
+        Registra una respuesta 429: reduce la tasa compartida y pausa el cubo durante
+        retry_after segundos si TMDB lo indicó.
+
+        Args:
+            retry_after (float, opcional): Segundos indicados en la cabecera Retry-After.
+        """
+        pause = max(retry_after or 0, 0)
+        with self._lock:
+            now = time.monotonic()
+            self._throttled += 1
+            self._paused_until = max(self._paused_until, now + pause)
+            # Las fichas acumuladas se reponen con la tasa anterior antes de reducirla.
+            self._refill(now)
+            self._local_rate = max(self.min_rate, self._local_rate * self.backoff_factor)
+        if self.redis_client:
+            try:
+                self.redis_client.eval(
+                    _PENALIZE_SCRIPT, 2, self._key, self._pause_key,
+                    self.rate, self.min_rate, self.backoff_factor, int(pause * 1000)
+                )
+            except redis.exceptions.RedisError as e:
+                logger.warning("No se pudo registrar el 429 en el limitador '%s': %s", self.name, e)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Tasa configurada, tasa actual (la compartida, o la local sin Redis) y
+                respuestas 429 registradas por el proceso.
+        """
+        with self._lock:
+            current_rate = self._current_rate(time.monotonic())
+        if self.redis_client:
+            try:
+                stored = self.redis_client.hget(self._key, 'rate')
+                if stored is not None:
+                    current_rate = float(stored)
+            except redis.exceptions.RedisError:
+                pass
+        return {'rate': self.rate, 'current_rate': round(current_rate, 3), 'throttled': self._throttled}
@@ -0,0 +1,77 @@
+import threading
+import redis
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+
+def create_redis_client(settings):
+    """
+    Crea un cliente de Redis con un pool de conexiones acotado configurado a partir de la
+    configuración. Las respuestas no se decodifican: la caché guarda documentos JSON en
+    bytes y así se sirven sin conversiones.
+
+    Si todas las conexiones del pool están en uso, el cliente espera hasta REDIS_POOL_TIMEOUT
+    segundos a que se libere una en lugar de abrir conexiones sin límite.
+
+    Args:
+        settings (Config): Objeto de configuración con los parámetros REDIS_*.
+
+    Returns:
+        redis.Redis: Cliente listo para ser compartido entre hilos.
+    """
+    pool = redis.BlockingConnectionPool(
+        host=getattr(settings, 'REDIS_HOST', 'localhost'),
+        port=getattr(settings, 'REDIS_PORT', 6379),
+        db=getattr(settings, 'REDIS_DB', 0),
+        password=getattr(settings, 'REDIS_PASSWORD', None) or None,
+        max_connections=getattr(settings, 'REDIS_MAX_CONNECTIONS', 50),
+        timeout=getattr(settings, 'REDIS_POOL_TIMEOUT', 1),
+        socket_timeout=getattr(settings, 'REDIS_SOCKET_TIMEOUT', 1),
+        socket_connect_timeout=getattr(settings, 'REDIS_CONNECT_TIMEOUT', 0.5),
+        socket_keepalive=True,
+        health_check_interval=getattr(settings, 'REDIS_HEALTH_CHECK_INTERVAL', 30),
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+def get_redis_client(settings):
+    """
+    Devuelve el cliente de Redis compartido del proceso, creándolo la primera vez. El pool
+    de redis-py detecta los fork y abre conexiones nuevas en el proceso hijo.
+
+    Args:
+        settings (Config): Objeto de configuración con los parámetros REDIS_*.
+
+    Returns:
+        redis.Redis: Cliente compartido.
+    """
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = create_redis_client(settings)
+    return _shared_client
+
+
+def redis_pool_stats(client):
+    """
+    Obtiene el uso del pool de conexiones de un cliente de Redis.
+
+    Args:
+        client (redis.Redis): Cliente a inspeccionar.
+
+    Returns:
+        dict: Conexiones creadas, en uso y máximas del pool.
+    """
+    pool = client.connection_pool
+    in_use = getattr(pool, '_in_use_connections', None)
+    if in_use is None:
+        # BlockingConnectionPool guarda las conexiones libres en una cola con huecos vacíos (None).
+        created = len(getattr(pool, '_connections', []))
+        idle = sum(1 for connection in list(pool.pool.queue) if connection is not None)
+        in_use_count = created - idle
+    else:
+        created = len(getattr(pool, '_available_connections', [])) + len(in_use)
+        in_use_count = len(in_use)
+    return {'created_connections': created, 'in_use_connections': in_use_count, 'max_connections': pool.max_connections}
@@ -0,0 +1,463 @@
+import contextvars
+import email.utils
+import functools
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from requests.exceptions import ConnectionError, HTTPError, RequestException, Timeout
+from adapters.metrics import upstream_failures, upstream_retries
+from settings import get_config
+
+# Carga la configuración de desarrollo desde el archivo de configuración.
+app_settings = get_config()
+
+logger = logging.getLogger(__name__)
+
+# Instante (time.monotonic) límite de la petición en curso, o None si no tiene plazo.
+_deadline = contextvars.ContextVar('request_deadline', default=None)
+
+
+def set_deadline(seconds):
+    """
+    Fija el plazo de la petición en curso. Se propaga a los hilos que copian el contexto.
+
+    Args:
+        seconds (float): Segundos disponibles desde ahora.
+
+    Returns:
+        contextvars.Token: Token para restaurar el plazo anterior con reset_deadline.
+    """
+    return _deadline.set(time.monotonic() + seconds)
+
+
+def reset_deadline(token):
+    """
+    Restaura el plazo anterior a set_deadline.
+
+    Args:
+        token (contextvars.Token): Token devuelto por set_deadline.
+    """
+    _deadline.reset(token)
+
+
+@contextmanager
+def deadline(seconds):
+    """
+    Gestor de contexto que fija un plazo durante el bloque.
+
+    Args:
+        seconds (float): Segundos disponibles desde ahora.
+    """
+    token = set_deadline(seconds)
+    try:
+        yield
+    finally:
+        reset_deadline(token)
+
+
+def remaining_time():
+    """
+    Returns:
+        float: Segundos que quedan hasta el plazo de la petición, o None si no tiene plazo.
+    """
+    current = _deadline.get()
+    if current is None:
+        return None
+    return current - time.monotonic()
+
+
+class RateLimitExceeded(Exception):
+    """
+    La llamada no pudo obtener turno en el limitador de salida antes del plazo de la petición.
+    """
+
+
+def retry_after_seconds(response):
+    """
+    Obtiene la espera indicada por la cabecera Retry-After de una respuesta, en segundos o
+    como fecha HTTP.
+
+    Args:
+        response (requests.Response): Respuesta de la API, o None.
+
+    Returns:
+        float: Segundos a esperar, o None si la respuesta no indica ninguna espera.
+    """
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def is_retryable(error):
+    """
+    Indica si un error de la API es transitorio y puede reintentarse: fallos de conexión,
+    tiempos de espera agotados, errores 5xx y respuestas 429.
+
+    Args:
+        error (RequestException): Error producido por requests.
+
+    Returns:
+        bool: True si el error puede reintentarse.
+    """
+    if isinstance(error, (ConnectionError, Timeout)):
+        return True
+    if isinstance(error, HTTPError) and error.response is not None:
+        status_code = error.response.status_code
+        return status_code == 429 or status_code >= 500
+    return False
+
+
+class RetryBudget:
+    """
+    Presupuesto global de reintentos: en una ventana deslizante solo se permiten reintentos
+    hasta una fracción de las llamadas realizadas (más un mínimo por segundo). Evita que
+    los reintentos multipliquen la carga cuando TMDB está degradado.
+    """
+
+    def __init__(self, ratio=0.2, min_per_second=1, window=10):
+        """
+        Inicializa el presupuesto.
+
+        Args:
+            ratio (float): Reintentos permitidos por cada llamada realizada.
+            min_per_second (float): Reintentos permitidos por segundo aunque haya poco tráfico.
+            window (int): Segundos de la ventana deslizante.
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.window = window
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Vacía los contadores de la ventana.
+        """
+        with self._lock:
+            self._requests = [0] * self.window
+            self._retries = [0] * self.window
+            self._seconds = [0] * self.window
+
+    def _slot(self, now):
+        second = int(now)
+        index = second % self.window
+        if self._seconds[index] != second:
+            self._seconds[index] = second
+            self._requests[index] = 0
+            self._retries[index] = 0
+        return index
+
+    def _totals(self, now):
+        oldest = int(now) - self.window
+        requests = sum(r for r, s in zip(self._requests, self._seconds) if s > oldest)
+        retries = sum(r for r, s in zip(self._retries, self._seconds) if s > oldest)
+        return requests, retries
+
+    def record_request(self):
+        """
+        Registra una llamada a la API (sin contar sus reintentos).
+        """
+        with self._lock:
+            self._requests[self._slot(time.time())] += 1
+
+    def try_acquire_retry(self):
+        """
+        Intenta consumir un reintento del presupuesto.
+
+        Returns:
+            bool: True si el reintento está permitido.
+        """
+        now = time.time()
+        with self._lock:
+            requests, retries = self._totals(now)
+            if retries >= self.min_per_second * self.window + self.ratio * requests:
+                return False
+            self._retries[self._slot(now)] += 1
+            return True
+
+    def stats(self):
+        """
+        Returns:
+            dict: Llamadas y reintentos en la ventana actual.
+        """
+        with self._lock:
+            requests, retries = self._totals(time.time())
+        return {'requests': requests, 'retries': retries, 'window_seconds': self.window}
+
+
+class CircuitBreaker:
+    """
+    Interruptor de circuito para un endpoint de la API. Tras varios fallos consecutivos se
+    abre y las llamadas fallan de inmediato; pasado reset_timeout pasa a semiabierto y deja
+    pasar una única llamada de prueba que lo cierra si tiene éxito o lo vuelve a abrir.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30):
+        """
+        Inicializa el interruptor.
+
+        Args:
+            name (str): Nombre del endpoint protegido.
+            failure_threshold (int): Fallos consecutivos que abren el circuito.
+            reset_timeout (float): Segundos que el circuito permanece abierto.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_owner = None
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now):
+        if self._state == self.OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow_request(self):
+        """
+        Indica si una llamada puede realizarse en el estado actual del circuito.
+
+        Returns:
+            bool: True si la llamada está permitida.
+        """
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self._probe_owner = threading.get_ident()
+                return True
+            return False
+
+    def release_probe(self):
+        """
+        Libera la llamada de prueba del hilo actual si terminó sin registrar éxito ni fallo
+        (plazo agotado, límite de salida), para que otra llamada pueda volver a probar. No
+        cuenta como fallo y no hace nada si el hilo actual no tiene la prueba.
+        """
+        with self._lock:
+            if self._probe_in_flight and self._probe_owner == threading.get_ident():
+                self._probe_in_flight = False
+                self._probe_owner = None
+
+    def record_success(self):
+        """
+        Registra una llamada correcta y cierra el circuito.
+        """
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """
+        Registra una llamada fallida y abre el circuito si se alcanza el umbral o si falla
+        la llamada de prueba.
+        """
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Estado, fallos consecutivos y segundos hasta el siguiente intento.
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            retry_in = max(self.reset_timeout - (now - self._opened_at), 0) if state == self.OPEN else 0
+            return {'state': state, 'consecutive_failures': self._failures, 'retry_in_seconds': round(retry_in, 3)}
+
+
+class CircuitBreakerRegistry:
+    """
+    Registro de interruptores de circuito, uno por endpoint de la API.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        """
+        Devuelve el interruptor de un endpoint, creándolo si no existe.
+
+        Args:
+            name (str): Nombre del endpoint.
+
+        Returns:
+            CircuitBreaker: Interruptor del endpoint.
+        """
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    name, CircuitBreaker(name, self.failure_threshold, self.reset_timeout)
+                )
+        return breaker
+
+    def reset(self):
+        """
+        Elimina todos los interruptores registrados.
+        """
+        with self._lock:
+            self._breakers.clear()
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Estado de cada interruptor por endpoint.
+        """
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+retry_budget = RetryBudget(
+    ratio=app_settings.RETRY_BUDGET_RATIO,
+    min_per_second=app_settings.RETRY_BUDGET_MIN_PER_SECOND
+)
+circuit_breakers = CircuitBreakerRegistry(
+    failure_threshold=app_settings.CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=app_settings.CIRCUIT_RESET_TIMEOUT
+)
+
+
+def backoff_delay(attempt, base_delay, max_delay):
+    """
+    Calcula la espera antes de un reintento con backoff exponencial y jitter completo.
+
+    Args:
+        attempt (int): Número de reintento (empezando en 1).
+        base_delay (float): Espera base en segundos.
+        max_delay (float): Espera máxima en segundos.
+
+    Returns:
+        float: Segundos a esperar.
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+
+def retry_with_backoff(endpoint, description, max_retries=None, base_delay=None, max_delay=None):
+    """
+    Decorador que protege una llamada a la API con la capa de resiliencia:
+
+    - respeta el plazo de la petición en curso (no reintenta ni espera más allá de él),
+    - reintenta solo errores transitorios con backoff exponencial y jitter, sin adelantarse
+      nunca a la espera indicada en Retry-After,
+    - consume el presupuesto global de reintentos,
+    - usa un interruptor de circuito por endpoint para fallar rápido si TMDB no responde.
+
+    La función decorada debe lanzar RequestException en caso de error. Si la llamada no
+    puede completarse se devuelve None, y quien llama recurre a la caché si la tiene.
+
+    Args:
+        endpoint (str): Nombre del endpoint de la API, usado para el interruptor de circuito.
+        description (str): Descripción de la operación para los mensajes de error.
+        max_retries (int, opcional): Número máximo de reintentos.
+        base_delay (float, opcional): Espera base del backoff en segundos.
+        max_delay (float, opcional): Espera máxima del backoff en segundos.
+
+    Returns:
+        función decorada que aplica la capa de resiliencia.
+    """
+    max_retries = app_settings.RETRY_MAX_RETRIES if max_retries is None else max_retries
+    base_delay = app_settings.RETRY_BASE_DELAY if base_delay is None else base_delay
+    max_delay = app_settings.RETRY_MAX_DELAY if max_delay is None else max_delay
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            breaker = circuit_breakers.get(endpoint)
+            retry_budget.record_request()
+            attempt = 0
+            while True:
+                remaining = remaining_time()
+                if remaining is not None and remaining <= 0:
+                    logger.warning("Plazo de la petición agotado al %s.", description)
+                    upstream_failures.inc(endpoint, 'deadline')
+                    return None
+                if not breaker.allow_request():
+                    logger.warning("Circuito abierto para %s, no se intenta %s.", endpoint, description)
+                    upstream_failures.inc(endpoint, 'circuit_open')
+                    return None
+                try:
+                    result = func(*args, **kwargs)
+                    breaker.record_success()
+                    return result
+                except RateLimitExceeded as e:
+                    # La llamada no salió hacia TMDB: no cuenta para el interruptor, y la
+                    # prueba del circuito semiabierto se libera en el finally.
+                    logger.warning("Límite de salida alcanzado al %s: %s", description, e)
+                    upstream_failures.inc(endpoint, 'rate_limited')
+                    return None
+                except RequestException as e:
+                    if not is_retryable(e):
+                        # La API respondió: el error es de la petición, no de TMDB.
+                        breaker.record_success()
+                        logger.warning("Error al %s: %s", description, e)
+                        upstream_failures.inc(endpoint, 'client_error')
+                        return None
+
+                    attempt += 1
+                    wait_time = backoff_delay(attempt, base_delay, max_delay)
+                    retry_after = retry_after_seconds(getattr(e, 'response', None))
+                    if retry_after is not None:
+                        # TMDB indica cuánto esperar (429/503): nunca se reintenta antes.
+                        wait_time = max(wait_time, retry_after)
+                    remaining = remaining_time()
+                    if attempt > max_retries:
+                        breaker.record_failure()
+                        logger.error("Todos los intentos de %s fallaron: %s", description, e)
+                        upstream_failures.inc(endpoint, 'retries_exhausted')
+                        return None
+                    if remaining is not None and wait_time >= remaining:
+                        breaker.record_failure()
+                        logger.warning("Sin tiempo para reintentar %s: %s", description, e)
+                        upstream_failures.inc(endpoint, 'deadline')
+                        return None
+                    if not retry_budget.try_acquire_retry():
+                        breaker.record_failure()
+                        logger.warning("Presupuesto de reintentos agotado al %s: %s", description, e)
+                        upstream_failures.inc(endpoint, 'retry_budget')
+                        return None
+                    logger.info("Intento %s de %s fallido. Reintentando en %.2f segundos...", attempt, description, wait_time)
+                    upstream_retries.inc(endpoint)
+                    time.sleep(wait_time)
+                finally:
+                    # Un intento que no registró éxito ni fallo no puede dejar la prueba
+                    # del circuito semiabierto ocupada para siempre.
+                    breaker.release_probe()
+        return wrapper
+    return decorator
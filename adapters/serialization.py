@@ -0,0 +1,124 @@
+import gzip
+import hashlib
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli es opcional
+    brotli = None
+
+# Codificaciones de contenido soportadas, en orden de preferencia.
+SUPPORTED_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def dumps(value):
+    """
+    Serializa un valor a JSON en bytes, usando orjson si está instalado.
+
+    Args:
+        value: Valor serializable a JSON.
+
+    Returns:
+        bytes: Documento JSON codificado en UTF-8.
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def loads(data):
+    """
+    Deserializa un documento JSON en bytes o texto, usando orjson si está instalado.
+
+    Args:
+        data (bytes | str): Documento JSON.
+
+    Returns:
+        El valor deserializado.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def content_hash(body):
+    """
+    Calcula el hash de contenido de un documento, usado como ETag.
+
+    Args:
+        body (bytes): Documento serializado.
+
+    Returns:
+        str: Hash hexadecimal del documento.
+    """
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def compress(body, encoding):
+    """
+    Comprime un documento con la codificación de contenido indicada.
+
+    Args:
+        body (bytes): Documento serializado.
+        encoding (str): 'gzip' o 'br'.
+
+    Returns:
+        bytes: Documento comprimido.
+    """
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=6)
+    raise ValueError(f"Codificación no soportada: {encoding}")
+
+
+class RawJSON:
+    """
+    Documento JSON ya serializado que se devuelve tal cual como cuerpo de la respuesta,
+    sin deserializarlo ni volver a codificarlo. Guarda su hash de contenido (ETag), el
+    instante en que se obtuvo el dato y sus versiones comprimidas, calculadas una sola vez.
+    """
+
+    __slots__ = ('body', 'stored_at', '_etag', '_encoded')
+
+    def __init__(self, body, stored_at=None, etag=None):
+        """
+        Args:
+            body (bytes | str): Documento JSON serializado.
+            stored_at (float, opcional): Instante (epoch) en que se obtuvo el dato de la API.
+            etag (str, opcional): Hash de contenido ya calculado.
+        """
+        self.body = body.encode('utf-8') if isinstance(body, str) else body
+        self.stored_at = stored_at
+        self._etag = etag
+        self._encoded = {}
+
+    @property
+    def etag(self):
+        """
+        Returns:
+            str: Hash de contenido del documento.
+        """
+        if self._etag is None:
+            self._etag = content_hash(self.body)
+        return self._etag
+
+    def encoded(self, encoding):
+        """
+        Obtiene el documento comprimido, calculándolo solo la primera vez.
+
+        Args:
+            encoding (str): 'gzip' o 'br'.
+
+        Returns:
+            bytes: Documento comprimido.
+        """
+        body = self._encoded.get(encoding)
+        if body is None:
+            body = self._encoded[encoding] = compress(self.body, encoding)
+        return body
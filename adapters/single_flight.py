@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+import uuid
+import redis
+from adapters.resilience import remaining_time
+
+logger = logging.getLogger(__name__)
+
+# Libera el candado solo si sigue perteneciendo a quien lo adquirió.
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _deadline_exceeded():
+    remaining = remaining_time()
+    return remaining is not None and remaining <= 0
+
+
+class _Call:
+    """
+    Llamada en curso para una clave: los hilos seguidores esperan el evento y leen su resultado.
+    """
+
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Agrupa las llamadas concurrentes por clave para que solo una consulte la API y el resto
+    espere su resultado (request coalescing).
+
+    Dentro del proceso, los hilos seguidores esperan al hilo líder. Entre procesos y nodos,
+    el líder se elige con un candado corto en Redis (SET NX PX); el resto sondea la caché
+    hasta que el líder publica el dato, el candado expira o se agota el tiempo de espera.
+
+    Los seguidores no esperan más allá del plazo de la petición en curso: si se agota,
+    devuelven None sin consultar la API.
+    """
+
+    def __init__(self, redis_client=None, lock_timeout=10, poll_interval=0.05):
+        """
+        Inicializa el coordinador de llamadas.
+
+        Args:
+            redis_client (redis.Redis, opcional): Cliente de Redis para coordinar procesos.
+            lock_timeout (float): Segundos de vida del candado y de espera máxima de los
+                seguidores, acotada por el plazo de la petición.
+            poll_interval (float): Segundos entre sondeos de la caché de los seguidores remotos.
+        """
+        self.redis_client = redis_client
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, poll=None):
+        """
+        Ejecuta fn una sola vez por clave entre todas las llamadas concurrentes.
+
+        Args:
+            key (str): Clave que identifica el dato (normalmente la clave de caché).
+            fn (callable): Función que obtiene el dato.
+            poll (callable, opcional): Función que devuelve el dato si otro proceso ya lo
+                publicó en la caché, o None si aún no está disponible.
+
+        Returns:
+            El resultado de fn, compartido con todas las llamadas agrupadas, o None si el
+            plazo de la petición se agotó esperando a otra llamada.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if call.event.wait(self._wait_timeout()):
+                if call.error is not None:
+                    raise call.error
+                return call.result
+            if _deadline_exceeded():
+                logger.warning("Plazo de la petición agotado esperando '%s'.", key)
+                return None
+            return fn()
+
+        try:
+            call.result = self._do_distributed(key, fn, poll)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def _wait_timeout(self):
+        """
+        Returns:
+            float: Segundos que puede esperar un seguidor: lock_timeout, acotado por el
+                tiempo que queda del plazo de la petición.
+        """
+        remaining = remaining_time()
+        if remaining is None:
+            return self.lock_timeout
+        return max(min(self.lock_timeout, remaining), 0)
+
+    def _do_distributed(self, key, fn, poll):
+        """
+        Coordina la llamada entre procesos mediante un candado en Redis.
+
+        Args:
+            key (str): Clave que identifica el dato.
+            fn (callable): Función que obtiene el dato.
+            poll (callable, opcional): Función que consulta si el dato ya está en caché.
+
+        Returns:
+            El resultado de fn o el dato publicado por otro proceso.
+        """
+        if not self.redis_client:
+            return fn()
+
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self._wait_timeout()
+        try:
+            while True:
+                if self.redis_client.set(lock_key, token, nx=True, px=int(self.lock_timeout * 1000)):
+                    break
+                if time.monotonic() >= deadline:
+                    if _deadline_exceeded():
+                        logger.warning("Plazo de la petición agotado esperando el candado '%s'.", lock_key)
+                        return None
+                    # El líder remoto no terminó a tiempo: se consulta la API directamente.
+                    return fn()
+                time.sleep(min(self.poll_interval, max(deadline - time.monotonic(), 0)))
+                if poll is not None:
+                    result = poll()
+                    if result is not None:
+                        return result
+        except redis.exceptions.RedisError as e:
+            logger.warning("No se pudo coordinar '%s' en Redis, continuando sin candado: %s", key, e)
+            return fn()
+
+        try:
+            return fn()
+        finally:
+            try:
+                self.redis_client.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+            except redis.exceptions.RedisError as e:
+                logger.error("Error al liberar el candado '%s': %s", lock_key, e)
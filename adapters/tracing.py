@@ -0,0 +1,369 @@
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from collections import deque
+import requests
+from settings import get_config
+
+# Carga la configuración de desarrollo desde el archivo de configuración.
+app_settings = get_config()
+
+logger = logging.getLogger(__name__)
+
+# Span activo en el contexto actual (petición, hilo o tarea asíncrona), o None si no se traza.
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+# Cabecera traceparent de W3C Trace Context: versión-trace_id-parent_id-flags.
+_TRACEPARENT = re.compile(r'^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+
+
+def parse_traceparent(header):
+    """
+    Interpreta una cabecera traceparent de W3C Trace Context.
+
+    Args:
+        header (str): Valor de la cabecera.
+
+    Returns:
+        tuple: (trace_id, parent_id, sampled) o None si la cabecera falta o no es válida.
+    """
+    match = _TRACEPARENT.match((header or '').strip().lower())
+    if not match:
+        return None
+    version, trace_id, parent_id, flags = match.groups()
+    if version == 'ff' or trace_id == '0' * 32 or parent_id == '0' * 16:
+        return None
+    return trace_id, parent_id, bool(int(flags, 16) & 1)
+
+
+def current_span():
+    """
+    Returns:
+        Span: Span activo en el contexto actual o None.
+    """
+    return _current_span.get()
+
+
+class Span:
+    """
+    Operación cronometrada dentro de una traza.
+    """
+
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'kind', 'start', 'duration', 'attributes', 'error')
+
+    def __init__(self, trace_id, parent_id, name, kind=None, attributes=None):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start = time.time()
+        self.duration = None
+        self.attributes = attributes or {}
+        self.error = None
+
+    def set_attribute(self, name, value):
+        """
+        Args:
+            name (str): Nombre del atributo.
+            value: Valor del atributo.
+        """
+        self.attributes[name] = value
+
+    @property
+    def traceparent(self):
+        """
+        Returns:
+            str: Cabecera traceparent que identifica este span como padre.
+        """
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_zipkin(self, service_name):
+        """
+        Convierte el span al formato JSON v2 de Zipkin.
+
+        Args:
+            service_name (str): Nombre del servicio que emite el span.
+
+        Returns:
+            dict: Span en formato Zipkin v2.
+        """
+        tags = {name: str(value) for name, value in self.attributes.items()}
+        if self.error is not None:
+            tags['error'] = self.error
+        span = {
+            'traceId': self.trace_id,
+            'id': self.span_id,
+            'name': self.name,
+            'timestamp': int(self.start * 1_000_000),
+            'duration': max(int((self.duration or 0) * 1_000_000), 1),
+            'localEndpoint': {'serviceName': service_name},
+            'tags': tags,
+        }
+        if self.parent_id:
+            span['parentId'] = self.parent_id
+        if self.kind:
+            span['kind'] = self.kind
+        return span
+
+
+class _NoopSpanContext:
+    """
+    Contexto que no hace nada, usado cuando la petición no se traza.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP = _NoopSpanContext()
+
+
+class _SpanContext:
+    __slots__ = ('tracer', 'span', 'started', 'token')
+
+    def __init__(self, tracer, span):
+        self.tracer = tracer
+        self.span = span
+
+    def __enter__(self):
+        self.token = _current_span.set(self.span)
+        self.started = time.perf_counter()
+        return self.span
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.span.duration = time.perf_counter() - self.started
+        if exc is not None:
+            self.span.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self.token)
+        self.tracer.record(self.span)
+        return False
+
+
+class ZipkinExporter:
+    """
+    Envía los spans terminados a un colector compatible con Zipkin (Zipkin, Jaeger,
+    OpenTelemetry Collector) en lotes desde un hilo en segundo plano. Si la cola se llena
+    los spans se descartan en lugar de frenar las peticiones.
+    """
+
+    def __init__(self, url, service_name, batch_size=100, flush_interval=2.0, max_queue=10000):
+        """
+        Args:
+            url (str): URL del endpoint /api/v2/spans del colector.
+            service_name (str): Nombre del servicio en los spans.
+            batch_size (int): Número máximo de spans por envío.
+            flush_interval (float): Segundos máximos que un span espera a ser enviado.
+            max_queue (int): Spans pendientes a partir de los cuales se descartan.
+        """
+        self.url = url
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.dropped = 0
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        # El hilo se arranca con el primer span de cada proceso: tras un fork (workers de
+        # gunicorn con preload) el hilo y la cola del padre no sirven en el hijo.
+        if self._pid != os.getpid():
+            with self._start_lock:
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue(maxsize=self.max_queue)
+                    self._thread = threading.Thread(target=self._run, args=(self._queue,), name="trace-exporter", daemon=True)
+                    self._thread.start()
+                    self._pid = os.getpid()
+
+    def export(self, span):
+        """
+        Args:
+            span (Span): Span terminado.
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self, spans):
+        while True:
+            batch = [spans.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(spans.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                requests.post(
+                    self.url,
+                    data=json.dumps([span.to_zipkin(self.service_name) for span in batch]),
+                    headers={'Content-Type': 'application/json'},
+                    timeout=5
+                )
+            except requests.exceptions.RequestException as e:
+                logger.warning("No se pudieron exportar %s spans: %s", len(batch), e)
+
+
+class Tracer:
+    """
+    Trazas ligeras por petición. El span activo viaja en una contextvar, por lo que se
+    propaga a las funciones llamadas, a las tareas asíncronas y a los hilos que copian el
+    contexto. Si la petición no se traza, abrir un span solo cuesta leer la contextvar.
+
+    Una petición se traza si llega con una cabecera traceparent muestreada (se continúa la
+    traza del cliente) o, sin ella, con probabilidad sample_rate.
+    """
+
+    def __init__(self, sample_rate=0.0, service_name='test_flask_themoviedb', exporter=None, max_recent=1000):
+        """
+        Args:
+            sample_rate (float): Probabilidad de trazar una petición sin traceparent.
+            service_name (str): Nombre del servicio en los spans exportados.
+            exporter (ZipkinExporter, opcional): Destino de los spans terminados.
+            max_recent (int): Spans terminados que se conservan en memoria.
+        """
+        self.sample_rate = sample_rate
+        self.service_name = service_name
+        self.exporter = exporter
+        self._recent = deque(maxlen=max_recent)
+
+    def start_trace(self, name, traceparent=None, kind='SERVER', **attributes):
+        """
+        Decide si se traza una petición y, en ese caso, abre su span raíz.
+
+        Args:
+            name (str): Nombre del span raíz.
+            traceparent (str, opcional): Cabecera traceparent recibida.
+            kind (str): Tipo de span.
+            **attributes: Atributos del span.
+
+        Returns:
+            contexto: Usar con 'with'; devuelve el span raíz o None si no se traza.
+        """
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+        else:
+            trace_id, parent_id = None, None
+            sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not sampled:
+            return _NOOP
+        return _SpanContext(self, Span(trace_id or os.urandom(16).hex(), parent_id, name, kind, attributes))
+
+    def span(self, name, kind=None, **attributes):
+        """
+        Abre un span hijo del span activo.
+
+        Args:
+            name (str): Nombre del span.
+            kind (str, opcional): Tipo de span ('CLIENT' para llamadas salientes).
+            **attributes: Atributos del span.
+
+        Returns:
+            contexto: Usar con 'with'; devuelve el span o None si no se traza.
+        """
+        parent = _current_span.get()
+        if parent is None:
+            return _NOOP
+        return _SpanContext(self, Span(parent.trace_id, parent.span_id, name, kind, attributes))
+
+    def record(self, span):
+        """
+        Guarda un span terminado y lo envía al exportador.
+
+        Args:
+            span (Span): Span terminado.
+        """
+        self._recent.append(span)
+        if self.exporter is not None:
+            self.exporter.export(span)
+
+    def recent(self, trace_id=None):
+        """
+        Args:
+            trace_id (str, opcional): Si se indica, solo los spans de esa traza.
+
+        Returns:
+            list: Spans terminados recientes en formato Zipkin v2.
+        """
+        spans = list(self._recent)
+        return [span.to_zipkin(self.service_name) for span in spans if trace_id is None or span.trace_id == trace_id]
+
+
+def traced(name=None):
+    """
+    Decorador que abre un span alrededor de la función (síncrona o async def) cuando la
+    petición se está trazando.
+
+    Args:
+        name (str, opcional): Nombre del span. Por defecto el nombre cualificado de la función.
+
+    Returns:
+        función decorada.
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _current_span.get() is None:
+                    return await func(*args, **kwargs)
+                with tracer.span(span_name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with tracer.span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+    return decorator
+
+
+def create_tracer(settings):
+    """
+    Crea el trazador con la configuración TRACING_*.
+
+    Args:
+        settings (Config): Objeto de configuración.
+
+    Returns:
+        Tracer: Trazador del proceso.
+    """
+    service_name = getattr(settings, 'TRACING_SERVICE_NAME', 'test_flask_themoviedb')
+    url = getattr(settings, 'TRACING_ZIPKIN_URL', None)
+    return Tracer(
+        sample_rate=getattr(settings, 'TRACING_SAMPLE_RATE', 0.0),
+        service_name=service_name,
+        exporter=ZipkinExporter(url, service_name) if url else None
+    )
+
+
+# Trazador compartido por todo el proceso
+tracer = create_tracer(app_settings)
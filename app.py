@@ -1,21 +1,83 @@
-import redis
 from flask import Flask, jsonify
-from controllers.controllers import movies_blueprint
-from settings import config
+from adapters.log import configure_logging
+from application.services import job_manager, redis_client
+from controllers.controllers import cache_warmer, movie_service, movies_blueprint, multiprocess_metrics
+from settings import get_config
 
-app = Flask(__name__)
-
-# Configura Redis
-redis_client = redis.StrictRedis(host='redis', port=6379, db=0, decode_responses=True)
-
-# Registrar el Blueprint
-app.register_blueprint(movies_blueprint, url_prefix='/')
+# Cargar la configuración seleccionada con APP_CONFIG
+app_settings = get_config()
 
 # Manejador para errores 404
-@app.errorhandler(404)
 def page_not_found(error):
     return jsonify({"message": "Page not found"}), 404
 
+def create_app(app_config=None, start_background=True):
+    """
+    Crea la aplicación Flask.
+
+    Args:
+        app_config (Config, opcional): Configuración de Flask, de los logs y de las tareas
+            en segundo plano. Por defecto, la seleccionada con APP_CONFIG. Los servicios, el
+            cliente de Redis, los limitadores y el almacén de usuarios se crean al importar
+            los módulos con la configuración de APP_CONFIG, no con app_config.
+        start_background (bool): Arranca los hilos en segundo plano del proceso. El servidor
+            de producción (gunicorn.conf.py) lo desactiva al precargar la aplicación en el
+            proceso maestro y los arranca en cada worker tras el fork.
+
+    Returns:
+        Flask: Aplicación con las rutas registradas.
+    """
+    app_config = app_config or app_settings
+
+    # Logs por niveles (LOG_LEVEL) en texto o JSON (LOG_FORMAT)
+    configure_logging(app_config)
+
+    app = Flask(__name__)
+    app.config.from_object(app_config)
+
+    # Cliente de Redis de los servicios (mismo pool de conexiones), creado al importarlos
+    app.extensions['redis'] = redis_client
+
+    # Registrar el Blueprint
+    app.register_blueprint(movies_blueprint, url_prefix='/')
+    app.register_error_handler(404, page_not_found)
+
+    if start_background:
+        start_background_tasks(app_config)
+    return app
+
+def start_background_tasks(app_config=None):
+    """
+    Arranca los hilos en segundo plano del proceso actual: la escucha de invalidaciones de
+    la caché en memoria, la escritura de métricas para agregarlas entre workers (si
+    METRICS_MULTIPROC_DIR) y, si CACHE_WARMER_ENABLED, el precalentador de caché.
+
+    Args:
+        app_config (Config, opcional): Configuración de la aplicación.
+    """
+    app_config = app_config or app_settings
+    invalidation_bus = movie_service.movie_api.invalidation_bus
+    if invalidation_bus is not None:
+        invalidation_bus.start()
+    if multiprocess_metrics is not None:
+        multiprocess_metrics.start()
+    # Precalentar la caché al arrancar y mantenerla fresca en segundo plano
+    if app_config.CACHE_WARMER_ENABLED:
+        cache_warmer.start()
+
+def stop_background_tasks():
+    """
+    Detiene los hilos en segundo plano y espera a que terminen los trabajos programados,
+    para que un worker que se apaga no deje trabajos a medias.
+    """
+    cache_warmer.stop()
+    invalidation_bus = movie_service.movie_api.invalidation_bus
+    if invalidation_bus is not None:
+        invalidation_bus.stop()
+    job_manager.shutdown(wait=True)
+    # Último estado de las métricas del worker, para que sus contadores no se pierdan
+    if multiprocess_metrics is not None:
+        multiprocess_metrics.stop()
+
 if __name__ == '__main__':
-    app.config.from_object(config['development'])
-    app.run()
+    create_app().run()
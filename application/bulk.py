@@ -0,0 +1,47 @@
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+def run_concurrently(func, items, max_workers, rate_limiter=None, progress=None):
+    """
+    Aplica func a cada elemento con un número acotado de hilos, respetando opcionalmente un
+    limitador de tasa antes de cada llamada.
+
+    Args:
+        func (callable): Función a aplicar a cada elemento.
+        items (list): Elementos a procesar.
+        max_workers (int): Número máximo de llamadas simultáneas.
+        rate_limiter (TokenBucket, opcional): Limitador consultado antes de cada llamada.
+        progress (callable, opcional): Callback progress(done, total) tras cada elemento.
+
+    Returns:
+        list: Resultados de func en el mismo orden que items. Si func lanza una excepción,
+        el resultado de ese elemento es la excepción.
+    """
+    items = list(items)
+    total = len(items)
+    if total == 0:
+        return []
+
+    done = 0
+    done_lock = threading.Lock()
+
+    def call(item):
+        nonlocal done
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        try:
+            return func(item)
+        except Exception as e:
+            return e
+        finally:
+            if progress is not None:
+                with done_lock:
+                    done += 1
+                    current = done
+                progress(current, total)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total)), thread_name_prefix="bulk") as executor:
+        futures = [executor.submit(contextvars.copy_context().run, call, item) for item in items]
+        return [future.result() for future in futures]
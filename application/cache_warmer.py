@@ -0,0 +1,215 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from settings import get_config
+
+# Cargar la configuración seleccionada con APP_CONFIG
+app_settings = get_config()
+
+logger = logging.getLogger(__name__)
+
+
+class CacheWarmer:
+    """
+    Precalienta la caché y refresca los listados registrados poco antes de que dejen de
+    estar frescos, para que ninguna petición tenga que esperar a TMDB. Puede ejecutarse en
+    un hilo dentro de la aplicación (start) o como proceso independiente (run_forever).
+
+    Cada clave se refresca cuando su edad supera CACHE_DURATION menos una antelación con
+    jitter aleatorio, de modo que las claves y los procesos no coincidan en el tiempo. Los
+    refrescos se ejecutan con un número acotado de hilos.
+    """
+
+    def __init__(self, interval=5, lead_time=30, jitter=10, max_workers=2):
+        """
+        Inicializa el precalentador.
+
+        Args:
+            interval (float): Segundos entre comprobaciones de las claves registradas.
+            lead_time (float): Segundos antes de que una clave deje de estar fresca en los
+                que se refresca.
+            jitter (float): Segundos aleatorios que se añaden a la antelación y al intervalo.
+            max_workers (int): Número máximo de refrescos simultáneos.
+        """
+        self.interval = interval
+        self.lead_time = lead_time
+        self.jitter = jitter
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cache-warmer")
+        self._keys = {}
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def register(self, movie_api):
+        """
+        Registra los listados cacheados de un adaptador (populares, favoritas y calificadas
+        de su cuenta).
+
+        Args:
+            movie_api (MovieAPIAdapter): Adaptador cuyos listados se mantienen calientes.
+        """
+        with self._lock:
+            for key, fetch in movie_api.cache_sources().items():
+                self._keys[key] = (movie_api, fetch, self._next_lead_time())
+                self._metrics.setdefault(key, {
+                    'refreshes': 0,
+                    'failures': 0,
+                    'skipped': 0,
+                    'last_refresh_at': None,
+                    'last_duration_seconds': None,
+                    'last_error': None
+                })
+
+    def _next_lead_time(self):
+        return self.lead_time + random.uniform(0, self.jitter)
+
+    def warm_all(self, force=False):
+        """
+        Precalienta las claves registradas que no están en caché o ya no están frescas,
+        esperando a que terminen. Así, varios procesos que arrancan a la vez no repiten el
+        trabajo del primero.
+
+        Args:
+            force (bool): Si es True, refresca todas las claves aunque estén frescas.
+
+        Returns:
+            dict: Resultado (True si se refrescó) por clave refrescada.
+        """
+        return self._refresh_keys(self._due_keys(lambda movie_api, lead_time: 0 if force else movie_api.cache_duration))
+
+    def run_once(self):
+        """
+        Refresca las claves que están a punto de dejar de estar frescas o que no están en
+        caché, esperando a que terminen.
+
+        Returns:
+            dict: Resultado (True si se refrescó) por clave refrescada.
+        """
+        # La antelación nunca supera la mitad de la frescura para no refrescar en bucle.
+        return self._refresh_keys(self._due_keys(
+            lambda movie_api, lead_time: max(movie_api.cache_duration - lead_time, movie_api.cache_duration / 2)
+        ))
+
+    def _due_keys(self, threshold):
+        """
+        Args:
+            threshold (callable): Recibe el adaptador y la antelación de la clave y devuelve
+                la edad en segundos a partir de la cual la clave debe refrescarse.
+
+        Returns:
+            list: Claves que no están en caché o cuya edad alcanza el umbral.
+        """
+        with self._lock:
+            items = list(self._keys.items())
+        due = []
+        for key, (movie_api, _, lead_time) in items:
+            try:
+                entry = movie_api.peek_entry(key)
+            except Exception as e:
+                logger.error("Error al consultar '%s' en caché: %s", key, e)
+                entry = None
+            if entry is None or entry.age() >= threshold(movie_api, lead_time):
+                due.append(key)
+            else:
+                self._record(key, skipped=1)
+        return due
+
+    def _refresh_keys(self, keys):
+        futures = {key: self._executor.submit(self._refresh, key) for key in keys}
+        wait(futures.values())
+        return {key: future.result() for key, future in futures.items()}
+
+    def _refresh(self, key):
+        with self._lock:
+            movie_api, fetch, _ = self._keys[key]
+            # Nueva antelación aleatoria para el siguiente ciclo de la clave.
+            self._keys[key] = (movie_api, fetch, self._next_lead_time())
+        started = time.monotonic()
+        try:
+            refreshed = movie_api.refresh_entry(key, fetch) is not None
+            error = None if refreshed else 'La API no devolvió datos'
+        except Exception as e:
+            refreshed = False
+            error = str(e)
+        duration = time.monotonic() - started
+        if refreshed:
+            self._record(key, refreshes=1, last_refresh_at=time.time(), last_duration_seconds=round(duration, 4), last_error=None)
+        else:
+            logger.warning("No se pudo precalentar '%s': %s", key, error)
+            self._record(key, failures=1, last_duration_seconds=round(duration, 4), last_error=error)
+        return refreshed
+
+    def _record(self, key, **changes):
+        with self._lock:
+            metrics = self._metrics[key]
+            for name, value in changes.items():
+                if name in ('refreshes', 'failures', 'skipped'):
+                    metrics[name] += value
+                else:
+                    metrics[name] = value
+
+    def stats(self):
+        """
+        Returns:
+            dict: Refrescos, fallos, comprobaciones sin refresco y último refresco por clave.
+        """
+        with self._lock:
+            return {key: dict(metrics) for key, metrics in self._metrics.items()}
+
+    def run_forever(self):
+        """
+        Precalienta todas las claves y después las mantiene frescas hasta que se llama a stop.
+        """
+        self.warm_all()
+        while not self._stop.wait(self.interval + random.uniform(0, self.jitter / 2)):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error("Error en el precalentador de caché: %s", e)
+
+    def start(self):
+        """
+        Arranca el precalentador en un hilo en segundo plano dentro del proceso.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run_forever, name="cache-warmer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """
+        Detiene el precalentador tras el ciclo en curso.
+        """
+        self._stop.set()
+
+
+def create_cache_warmer(*movie_apis):
+    """
+    Crea un precalentador con la configuración CACHE_WARMER_* y registra los adaptadores.
+
+    Args:
+        *movie_apis (MovieAPIAdapter): Adaptadores cuyos listados se mantienen calientes.
+
+    Returns:
+        CacheWarmer: Precalentador sin arrancar.
+    """
+    warmer = CacheWarmer(
+        interval=app_settings.CACHE_WARMER_INTERVAL,
+        lead_time=app_settings.CACHE_WARMER_LEAD_TIME,
+        jitter=app_settings.CACHE_WARMER_JITTER,
+        max_workers=app_settings.CACHE_WARMER_MAX_WORKERS
+    )
+    for movie_api in movie_apis:
+        warmer.register(movie_api)
+    return warmer
+
+
+if __name__ == '__main__':
+    # Proceso independiente: python -m application.cache_warmer
+    from adapters.log import configure_logging
+    from application.services import MovieService
+
+    configure_logging(app_settings)
+    create_cache_warmer(MovieService().movie_api).run_forever()
@@ -0,0 +1,137 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import redis
+
+logger = logging.getLogger(__name__)
+
+
+class JobManager:
+    """
+    Ejecuta operaciones largas en segundo plano y guarda su estado para poder consultarlo.
+    El estado se mantiene en memoria y, si Redis está disponible, se replica en Redis para
+    que cualquier proceso pueda consultarlo.
+    """
+
+    def __init__(self, redis_client=None, max_workers=2, ttl=3600):
+        """
+        Inicializa el gestor de trabajos.
+
+        Args:
+            redis_client (redis.Redis, opcional): Cliente de Redis para compartir el estado.
+            max_workers (int): Número máximo de trabajos ejecutándose a la vez.
+            ttl (int): Segundos que se conserva el estado de un trabajo.
+        """
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="jobs")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, job_type, func):
+        """
+        Programa un trabajo. La función recibe un callback progress(done, total) y su
+        resultado se guarda como resultado del trabajo. Si lanza una excepción o devuelve
+        (cuerpo, código de estado) con un código de error, el trabajo termina como 'failed'.
+
+        Args:
+            job_type (str): Tipo de trabajo.
+            func (callable): Función a ejecutar.
+
+        Returns:
+            dict: Estado inicial del trabajo.
+        """
+        job = {
+            'id': uuid.uuid4().hex,
+            'type': job_type,
+            'status': 'pending',
+            'created_at': time.time(),
+            'finished_at': None,
+            'progress': {'done': 0, 'total': None},
+            'result': None
+        }
+        snapshot = dict(job)
+        self._save(job)
+        self._executor.submit(self._run, job['id'], func)
+        return snapshot
+
+    def get(self, job_id):
+        """
+        Obtiene el estado de un trabajo.
+
+        Args:
+            job_id (str): ID del trabajo.
+
+        Returns:
+            dict: Estado del trabajo o None si no existe o ha expirado.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return json.loads(json.dumps(job))
+        if self.redis_client:
+            try:
+                cached_job = self.redis_client.get(f"job:{job_id}")
+                if cached_job:
+                    return json.loads(cached_job)
+            except redis.exceptions.RedisError as e:
+                logger.error("Error al recuperar el trabajo %s: %s", job_id, e)
+        return None
+
+    def shutdown(self, wait=True):
+        """
+        Deja de aceptar trabajos y, si 'wait' es True, espera a que terminen los programados
+        para que su estado final quede guardado.
+
+        Args:
+            wait (bool): Esperar a los trabajos en curso y pendientes.
+        """
+        self._executor.shutdown(wait=wait)
+
+    def _update(self, job_id, **changes):
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update(changes)
+            snapshot = dict(job)
+        self._save(snapshot)
+
+    def _save(self, job):
+        with self._lock:
+            self._jobs[job['id']] = job
+            self._expire_finished()
+        if self.redis_client:
+            try:
+                self.redis_client.setex(f"job:{job['id']}", self.ttl, json.dumps(job))
+            except redis.exceptions.RedisError as e:
+                logger.error("Error al guardar el trabajo %s: %s", job['id'], e)
+
+    def _expire_finished(self):
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job['finished_at'] is not None and now - job['finished_at'] > self.ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _run(self, job_id, func):
+        self._update(job_id, status='running')
+
+        def progress(done, total):
+            self._update(job_id, progress={'done': done, 'total': total})
+
+        try:
+            result = func(progress=progress)
+            status = 'completed'
+            # Los servicios indican los errores devolviendo (cuerpo, código de estado)
+            if isinstance(result, tuple) and len(result) == 2 and isinstance(result[1], int):
+                result, status_code = result
+                if status_code >= 400:
+                    status = 'failed'
+            self._update(job_id, status=status, result=result, finished_at=time.time())
+        except Exception as e:
+            logger.error("Error en el trabajo %s: %s", job_id, e)
+            self._update(job_id, status='failed', result={'message': str(e)}, finished_at=time.time())
@@ -1,14 +1,26 @@
 from adapters.movie_api_adapter import MovieAPIAdapter
-from datetime import datetime
-from settings import config
-import redis
-import sys
+from adapters.rate_limiter import TokenBucket
+from adapters.redis_client import get_redis_client
+from application.bulk import run_concurrently
+from application.jobs import JobManager
+from adapters.serialization import RawJSON, dumps
+from adapters.tracing import traced, tracer
+from domain.movie import project_listing, project_movie
+from domain.release_date_index import InvalidCursor, ReleaseDateIndex
+from settings import get_config
+import logging
 
-# Cargar configuración de desarrollo
-development_config = config['development']()
+# Cargar la configuración seleccionada con APP_CONFIG
+app_settings = get_config()
 
-# Inicializar cliente de Redis
-redis_client = redis.StrictRedis(host='localhost', port=6379, db=0)
+logger = logging.getLogger(__name__)
+
+# Cliente de Redis compartido por toda la aplicación
+redis_client = get_redis_client(app_settings)
+
+# Trabajos en segundo plano y limitador de las operaciones masivas hacia TMDB
+job_manager = JobManager(redis_client, max_workers=app_settings.JOB_MAX_CONCURRENT, ttl=app_settings.JOB_TTL)
+bulk_rate_limiter = TokenBucket(app_settings.BULK_RATE_LIMIT)
 
 class MovieService:
     def __init__(self, api_key=None, headers=None, account_id=None):
@@ -21,38 +33,73 @@ class MovieService:
             account_id (str): ID de cuenta.
         """
         self.movie_api = MovieAPIAdapter(
-            api_key or development_config.THEMOVIEDB_API_KEY,
-            headers or development_config.headers,
-            account_id or development_config.ACCOUNT_ID,
+            api_key or app_settings.THEMOVIEDB_API_KEY,
+            headers or app_settings.headers,
+            account_id or app_settings.ACCOUNT_ID,
             redis_client
         )
+        self.job_manager = job_manager
+        self.bulk_rate_limiter = bulk_rate_limiter
 
-    def get_popular_movies(self):
+    @traced()
+    def get_popular_movies(self, raw=False, fields=None):
         """
         Obtener las películas populares desde la API externa o la caché.
+
+        Args:
+            raw (bool): Si es True, devuelve el JSON ya serializado (RawJSON), reutilizado
+                entre peticiones mientras no cambie la entrada en caché.
+            fields (tuple, opcional): Campos de cada película a incluir en la respuesta.
         
         Returns:
             dict: Resultados de películas populares o mensaje de error.
         """
         try:
-            return self.movie_api.get_popular_movies()['results']
+            if raw:
+                entry = self.movie_api.get_popular_movies_entry()
+                if entry is None:
+                    return {'message': 'Películas populares no disponibles temporalmente'}, 503
+                return entry.derived(
+                    ('results', fields),
+                    lambda e: RawJSON(dumps(project_listing(e.value, fields)['results']), e.stored_at)
+                )
+            popular_movies = self.movie_api.get_popular_movies()
+            if popular_movies is None:
+                return {'message': 'Películas populares no disponibles temporalmente'}, 503
+            if fields:
+                return project_listing(popular_movies, fields)['results']
+            return popular_movies['results']
         except Exception as e:
-            print(f"Error al obtener películas populares: {e}", file=sys.stderr)
+            logger.error("Error al obtener películas populares: %s", e)
             return {'message': 'Error al obtener películas populares'}, 500
 
-    def get_favorite_movies(self):
+    @traced()
+    def get_favorite_movies(self, raw=False, fields=None):
         """
         Obtener las películas favoritas del usuario.
 
+        Args:
+            raw (bool): Si es True, devuelve el JSON en caché tal cual (RawJSON).
+            fields (tuple, opcional): Campos de cada película a incluir en la respuesta.
+
         Returns:
             dict: Lista de películas favoritas o mensaje de error.
         """
         try:
-            return self.movie_api.get_favorite_movies()
+            if raw:
+                entry = self.movie_api.get_favorite_movies_entry()
+                if entry is None:
+                    return {'message': 'Películas favoritas no disponibles temporalmente'}, 503
+                return _raw_listing(entry, fields)
+            favorite_movies = self.movie_api.get_favorite_movies()
+            if favorite_movies is None:
+                return {'message': 'Películas favoritas no disponibles temporalmente'}, 503
+            return project_listing(favorite_movies, fields) if fields else favorite_movies
         except Exception as e:
-            print(f"Error al obtener películas favoritas: {e}", file=sys.stderr)
+            logger.error("Error al obtener películas favoritas: %s", e)
             return {'message': 'Error al obtener películas favoritas'}, 500
 
+    @traced()
     def add_favorite_movie(self, media_id):
         """
         Agregar una película a la lista de favoritas.
@@ -69,9 +116,10 @@ class MovieService:
                 return {'message': 'No se pudo agregar la película favorita'}, 500
             return {'status_code': response.status_code, 'response': response.json()}
         except Exception as e:
-            print(f"Error al agregar película favorita: {e}", file=sys.stderr)
+            logger.error("Error al agregar película favorita: %s", e)
             return {'message': 'Error al agregar película favorita'}, 500
 
+    @traced()
     def delete_favorite_movie(self, media_id):
         """
         Eliminar una película de la lista de favoritas.
@@ -88,9 +136,10 @@ class MovieService:
                 return {'message': 'No se pudo eliminar la película favorita'}, 500
             return {'status_code': response.status_code, 'response': response.json()}
         except Exception as e:
-            print(f"Error al eliminar película favorita: {e}", file=sys.stderr)
+            logger.error("Error al eliminar película favorita: %s", e)
             return {'message': 'Error al eliminar película favorita'}, 500
 
+    @traced()
     def rate_movie(self, movie_id, rating):
         """
         Calificar una película si la calificación está en el rango permitido.
@@ -109,69 +158,358 @@ class MovieService:
                     return {'message': 'No se pudo calificar la película'}, 500
                 return {'status_code': response.status_code, 'response': response.json()}
             except Exception as e:
-                print(f"Error al calificar película: {e}", file=sys.stderr)
+                logger.error("Error al calificar película: %s", e)
                 return {'message': 'Error al calificar película'}, 500
         return {'message': 'La calificación debe estar entre 1 y 5'}, 400
 
-    def get_rated_movies(self):
+    @traced()
+    def add_favorite_movies_batch(self, media_ids):
+        """
+        Agregar varias películas a favoritas. Las llamadas a la API se envían en paralelo y la
+        caché de favoritas se actualiza una sola vez para todo el lote.
+
+        Args:
+            media_ids (list): IDs de las películas.
+
+        Returns:
+            dict: Resultado por película o mensaje de error si el lote no es válido.
+        """
+        errors = _validate_ids(media_ids)
+        if errors:
+            return {'message': 'Lote inválido', 'errors': errors}, 400
+        results = self._run_batch(
+            lambda media_id: self.movie_api.add_favorite_movie(media_id, update_cache=False),
+            media_ids,
+            lambda media_id: {'media_id': media_id}
+        )
+        self.movie_api.apply_favorite_changes(added_ids=_succeeded(results, 'media_id'))
+        return {'results': results}
+
+    @traced()
+    def delete_favorite_movies_batch(self, media_ids):
+        """
+        Eliminar varias películas de favoritas. Las llamadas a la API se envían en paralelo y
+        la caché de favoritas se actualiza una sola vez para todo el lote.
+
+        Args:
+            media_ids (list): IDs de las películas.
+
+        Returns:
+            dict: Resultado por película o mensaje de error si el lote no es válido.
+        """
+        errors = _validate_ids(media_ids)
+        if errors:
+            return {'message': 'Lote inválido', 'errors': errors}, 400
+        results = self._run_batch(
+            lambda media_id: self.movie_api.delete_favorite_movie(media_id, update_cache=False),
+            media_ids,
+            lambda media_id: {'media_id': media_id}
+        )
+        self.movie_api.apply_favorite_changes(removed_ids=_succeeded(results, 'media_id'))
+        return {'results': results}
+
+    @traced()
+    def rate_movies_batch(self, ratings):
+        """
+        Calificar varias películas. Todas las calificaciones se validan antes de enviar
+        ninguna; las llamadas a la API se envían en paralelo y la caché de calificadas se
+        actualiza una sola vez para todo el lote.
+
+        Args:
+            ratings (list): Pares (movie_id, rating) u objetos {'movie_id', 'rating'}.
+
+        Returns:
+            dict: Resultado por película o mensaje de error si el lote no es válido.
+        """
+        pairs, errors = _parse_ratings(ratings)
+        if errors:
+            return {'message': 'Lote inválido', 'errors': errors}, 400
+        results = self._run_batch(
+            lambda pair: self.movie_api.rate_movie(pair[0], pair[1], update_cache=False),
+            pairs,
+            lambda pair: {'movie_id': pair[0], 'rating': pair[1]}
+        )
+        succeeded = {result['movie_id']: result['rating'] for result in results if result['status'] == 'success'}
+        self.movie_api.apply_rating_changes(succeeded)
+        return {'results': results}
+
+    def _run_batch(self, call, items, describe):
+        """
+        Ejecuta una operación de la API para cada elemento de un lote en paralelo.
+
+        Args:
+            call (callable): Operación a ejecutar para cada elemento.
+            items (list): Elementos del lote.
+            describe (callable): Devuelve los campos que identifican a un elemento en el resultado.
+
+        Returns:
+            list: Resultado por elemento, en el mismo orden que items.
+        """
+        responses = run_concurrently(
+            call,
+            items,
+            max_workers=app_settings.BULK_MAX_WORKERS,
+            rate_limiter=self.bulk_rate_limiter
+        )
+        results = []
+        for item, response in zip(items, responses):
+            result = describe(item)
+            if _is_success(response):
+                result.update({'status': 'success', 'status_code': response.status_code})
+            else:
+                result.update({'status': 'failed', 'status_code': None})
+            results.append(result)
+        return results
+
+    @traced()
+    def get_rated_movies(self, raw=False, fields=None):
         """
         Obtener las películas calificadas por el usuario.
 
+        Args:
+            raw (bool): Si es True, devuelve el JSON en caché tal cual (RawJSON).
+            fields (tuple, opcional): Campos de cada película a incluir en la respuesta.
+
         Returns:
             dict: Lista de películas calificadas o mensaje de error.
         """
         try:
-            return self.movie_api.get_rated_movies()
+            if raw:
+                entry = self.movie_api.get_rated_movies_entry()
+                if entry is None:
+                    return {'message': 'Películas calificadas no disponibles temporalmente'}, 503
+                return _raw_listing(entry, fields)
+            rated_movies = self.movie_api.get_rated_movies()
+            if rated_movies is None:
+                return {'message': 'Películas calificadas no disponibles temporalmente'}, 503
+            return project_listing(rated_movies, fields) if fields else rated_movies
         except Exception as e:
-            print(f"Error al obtener películas calificadas: {e}", file=sys.stderr)
+            logger.error("Error al obtener películas calificadas: %s", e)
             return {'message': 'Error al obtener películas calificadas'}, 500
 
-    def get_favorite_movies_by_release_date(self):
+    @traced()
+    def get_favorite_movies_by_release_date(self, fields=None, cursor=None, limit=None):
         """
-        Obtener películas favoritas ordenadas por fecha de lanzamiento.
+        Obtener películas favoritas ordenadas por fecha de lanzamiento, paginadas por cursor.
+        El orden se calcula una vez por versión de la lista en caché y se reutiliza en las
+        peticiones siguientes hasta que la lista cambia.
+
+        Args:
+            fields (tuple, opcional): Campos de cada película a incluir en la respuesta.
+            cursor (str, opcional): Cursor devuelto por la página anterior.
+            limit (int, opcional): Número de películas por página.
 
         Returns:
-            list: Películas favoritas ordenadas o mensaje de error.
+            dict: Página de películas ('results') y cursor de la siguiente ('next_cursor'),
+                o mensaje de error.
         """
+        limit = app_settings.RELEASE_DATE_PAGE_SIZE if limit is None else limit
         try:
-            favorite_movies = self.movie_api.get_favorite_movies()
-            sorted_movies = sorted(
-                favorite_movies['results'],
-                key=lambda x: datetime.strptime(x['release_date'], "%Y-%m-%d"),
-                reverse=True
-            )
-            return sorted_movies
+            entry = self.movie_api.get_favorite_movies_entry()
+            if entry is None:
+                return {'message': 'Películas favoritas no disponibles temporalmente'}, 503
+            with tracer.span('release_date_index.page'):
+                index = entry.derived('release_date_index', lambda e: ReleaseDateIndex(e.value['results']))
+                movies, next_cursor = index.page(cursor, limit)
+                return {'results': [project_movie(movie, fields) for movie in movies], 'next_cursor': next_cursor}
+        except InvalidCursor as e:
+            return {'message': str(e)}, 400
         except Exception as e:
-            print(f"Error al obtener películas favoritas por fecha de lanzamiento: {e}", file=sys.stderr)
+            logger.error("Error al obtener películas favoritas por fecha de lanzamiento: %s", e)
             return {'message': 'Error al obtener películas favoritas por fecha de lanzamiento'}, 500
 
-    def get_rated_movies_from_favorites(self):
+    @traced()
+    def get_rated_movies_from_favorites(self, raw=False, fields=None):
         """
-        Obtener películas calificadas que también son favoritas.
+        Obtener películas calificadas que también son favoritas. La vista se mantiene en
+        caché por cuenta, por lo que normalmente es una única lectura.
+
+        Args:
+            raw (bool): Si es True, devuelve el JSON ya serializado (RawJSON).
+            fields (tuple, opcional): Campos de cada película a incluir en la respuesta.
 
         Returns:
             list: Películas calificadas en favoritas o mensaje de error.
         """
         try:
-            rated_movies = self.movie_api.get_rated_movies()['results']
-            favorite_movies_ids = {movie['id'] for movie in self.movie_api.get_favorite_movies()['results']}
-            return [movie for movie in rated_movies if movie['id'] in favorite_movies_ids]
+            return _rated_favorites_result(self.movie_api.get_rated_favorite_movies_entry(), raw, fields)
         except Exception as e:
-            print(f"Error al obtener películas calificadas desde favoritos: {e}", file=sys.stderr)
+            logger.error("Error al obtener películas calificadas desde favoritos: %s", e)
             return {'message': 'Error al obtener películas calificadas desde favoritos'}, 500
 
-    def delete_all_favorite_movies(self):
+    @traced()
+    def delete_all_favorite_movies(self, progress=None):
         """
-        Eliminar todas las películas favoritas del usuario.
+        Eliminar todas las películas favoritas del usuario. Las bajas se envían a la API en
+        paralelo con un número acotado de hilos y respetando el límite de tasa, y la caché
+        de favoritas se actualiza una sola vez al terminar.
+
+        Args:
+            progress (callable, opcional): Callback progress(done, total) tras cada película.
 
         Returns:
-            dict: Estado de la operación o mensaje de error.
+            dict: Estado de la operación con el resultado de cada película o mensaje de error.
         """
         try:
-            favorite_movies = self.movie_api.get_favorite_movies()['results']
-            for movie in favorite_movies:
-                self.movie_api.delete_favorite_movie(movie['id'])
-            return {'status': 'success', 'message': 'Todas las películas favoritas han sido eliminadas'}
+            favorite_movies = self.movie_api.get_favorite_movies()
+            if favorite_movies is None:
+                return {'message': 'Películas favoritas no disponibles temporalmente'}, 503
+            media_ids = [movie['id'] for movie in favorite_movies['results']]
+
+            responses = run_concurrently(
+                lambda media_id: self.movie_api.delete_favorite_movie(media_id, update_cache=False),
+                media_ids,
+                max_workers=app_settings.BULK_MAX_WORKERS,
+                rate_limiter=self.bulk_rate_limiter,
+                progress=progress
+            )
+            results = [
+                {'media_id': media_id, 'status': 'deleted' if _is_success(response) else 'failed'}
+                for media_id, response in zip(media_ids, responses)
+            ]
+            deleted_ids = [result['media_id'] for result in results if result['status'] == 'deleted']
+            self.movie_api.apply_favorite_changes(removed_ids=deleted_ids)
+
+            if favorite_movies.get('truncated'):
+                # Solo se conocen las favoritas de las primeras PAGINATION_MAX_PAGES páginas.
+                return {'status': 'partial', 'message': 'Se eliminaron las favoritas de las primeras páginas; quedan más por eliminar', 'results': results, 'truncated': True}
+            if len(deleted_ids) == len(media_ids):
+                return {'status': 'success', 'message': 'Todas las películas favoritas han sido eliminadas', 'results': results}
+            return {'status': 'partial', 'message': 'Algunas películas favoritas no se pudieron eliminar', 'results': results}
         except Exception as e:
-            print(f"Error al eliminar todas las películas favoritas: {e}", file=sys.stderr)
+            logger.error("Error al eliminar todas las películas favoritas: %s", e)
             return {'message': 'Error al eliminar todas las películas favoritas'}, 500
+
+    def start_delete_all_favorite_movies(self):
+        """
+        Programar en segundo plano la eliminación de todas las películas favoritas.
+
+        Returns:
+            dict: Estado inicial del trabajo.
+        """
+        return self.job_manager.submit('delete_all_favorite_movies', self.delete_all_favorite_movies)
+
+    def get_job(self, job_id):
+        """
+        Obtener el estado de un trabajo en segundo plano.
+
+        Args:
+            job_id (str): ID del trabajo.
+
+        Returns:
+            dict: Estado del trabajo o None si no existe.
+        """
+        return self.job_manager.get(job_id)
+
+def _raw_listing(entry, fields):
+    """
+    Obtiene el JSON serializado de un listado en caché, proyectado si se piden campos.
+
+    Args:
+        entry (CacheEntry): Entrada en caché del listado.
+        fields (tuple, opcional): Campos de cada película a incluir.
+
+    Returns:
+        RawJSON: Documento JSON listo para enviarse.
+    """
+    if not fields:
+        return entry.derived('listing', lambda e: RawJSON(e.body, e.stored_at, e.etag))
+    return entry.derived(('listing', fields), lambda e: RawJSON(dumps(project_listing(e.value, fields)), e.stored_at))
+
+def _rated_favorites_result(entry, raw, fields):
+    """
+    Construye el resultado de la vista de calificadas en favoritas.
+
+    Args:
+        entry (CacheEntry): Entrada en caché de la vista, o None si no está disponible.
+        raw (bool): Si es True, devuelve el JSON ya serializado (RawJSON).
+        fields (tuple, opcional): Campos de cada película a incluir.
+
+    Returns:
+        list: Películas calificadas en favoritas, RawJSON o mensaje de error.
+    """
+    if entry is None:
+        return {'message': 'Películas calificadas en favoritos no disponibles temporalmente'}, 503
+    with tracer.span('serialize', raw=raw):
+        if raw:
+            return entry.derived(
+                ('results', fields),
+                lambda e: RawJSON(dumps([project_movie(movie, fields) for movie in e.value['results']]), e.stored_at)
+            )
+        return [project_movie(movie, fields) for movie in entry.value['results']]
+
+def _is_success(response):
+    """
+    Indica si la respuesta de una operación de la API fue correcta.
+
+    Args:
+        response: Respuesta de la API, None o la excepción producida.
+
+    Returns:
+        bool: True si la operación se completó.
+    """
+    return response is not None and not isinstance(response, Exception)
+
+def _validate_ids(media_ids):
+    """
+    Valida la lista de IDs de un lote.
+
+    Args:
+        media_ids (list): IDs recibidos.
+
+    Returns:
+        list: Errores encontrados, vacía si el lote es válido.
+    """
+    if not isinstance(media_ids, list) or not media_ids:
+        return [{'error': 'Se esperaba una lista no vacía de IDs'}]
+    if len(media_ids) > app_settings.BATCH_MAX_SIZE:
+        return [{'error': f'El lote no puede superar {app_settings.BATCH_MAX_SIZE} elementos'}]
+    errors = []
+    seen = set()
+    for index, media_id in enumerate(media_ids):
+        if not isinstance(media_id, int) or isinstance(media_id, bool) or media_id <= 0:
+            errors.append({'index': index, 'error': 'El ID debe ser un entero positivo'})
+        elif media_id in seen:
+            errors.append({'index': index, 'error': 'ID duplicado'})
+        else:
+            seen.add(media_id)
+    return errors
+
+def _parse_ratings(ratings):
+    """
+    Valida y normaliza las calificaciones de un lote.
+
+    Args:
+        ratings (list): Pares (movie_id, rating) u objetos {'movie_id', 'rating'}.
+
+    Returns:
+        tuple: (lista de pares (movie_id, rating), lista de errores).
+    """
+    if not isinstance(ratings, list) or not ratings:
+        return [], [{'error': 'Se esperaba una lista no vacía de calificaciones'}]
+    if len(ratings) > app_settings.BATCH_MAX_SIZE:
+        return [], [{'error': f'El lote no puede superar {app_settings.BATCH_MAX_SIZE} elementos'}]
+    pairs = []
+    for item in ratings:
+        if isinstance(item, dict):
+            pairs.append((item.get('movie_id'), item.get('rating')))
+        elif isinstance(item, (list, tuple)) and len(item) == 2:
+            pairs.append(tuple(item))
+        else:
+            pairs.append((None, None))
+    errors = _validate_ids([movie_id for movie_id, _ in pairs])
+    for index, (_, rating) in enumerate(pairs):
+        if not isinstance(rating, (int, float)) or isinstance(rating, bool) or not 1 <= rating <= 5:
+            errors.append({'index': index, 'error': 'La calificación debe estar entre 1 y 5'})
+    return pairs, sorted(errors, key=lambda error: error.get('index', -1))
+
+def _succeeded(results, id_field):
+    """
+    Args:
+        results (list): Resultados por elemento de un lote.
+        id_field (str): Campo con el ID de la película.
+
+    Returns:
+        list: IDs de los elementos completados con éxito.
+    """
+    return [result[id_field] for result in results if result['status'] == 'success']
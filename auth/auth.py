@@ -1,29 +1,138 @@
-from flask import request, jsonify
+import math
+import threading
+import time
+from flask import g, request, jsonify
+from adapters.redis_client import get_redis_client
+from adapters.tracing import tracer
+from auth.rate_limit import inbound_rate_limiter
+from auth.user_store import UserStoreUnavailable, create_user_store
+from settings import get_config
 
-# Usuarios con permisos predefinidos
+# Cargar la configuración seleccionada con APP_CONFIG
+app_settings = get_config()
+
+# Usuarios con permisos predefinidos, cargados en el almacén si USER_STORE_SEED es True
 USERS = [
     {'id': 1, 'username': 'admin', 'permission': 'ADMIN'},
     {'id': 2, 'username': 'consumer', 'permission': 'USER'}
 ]
 
+# Almacén de usuarios configurado (memoria, SQLite o Redis) con caché en memoria delante
+user_store = create_user_store(app_settings, get_redis_client(app_settings), USERS)
+
+class AuthLatency:
+    """
+    Acumula la duración de la autenticación de las peticiones.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds):
+        """
+        Args:
+            seconds (float): Duración de una autenticación.
+        """
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Número de autenticaciones, duración media y máxima en segundos.
+        """
+        with self._lock:
+            average = self.total_seconds / self.count if self.count else 0.0
+            return {'count': self.count, 'avg_seconds': average, 'max_seconds': self.max_seconds}
+
+auth_latency = AuthLatency()
+
 def get_user_by_id(user_id):
     """
-    Obtiene un usuario por ID.
+    Obtiene un usuario por ID del almacén de usuarios.
     
     Args:
         user_id (int): El ID del usuario que se desea obtener.
     
     Returns:
         dict o None: El diccionario del usuario si se encuentra, de lo contrario None.
+
+    Raises:
+        UserStoreUnavailable: Si el almacén de usuarios no está disponible.
+    """
+    return user_store.get(user_id)
+
+def authenticate_request():
+    """
+    Valida el encabezado 'Authorization' de la petición actual. La duración se acumula en
+    auth_latency y se guarda en g.auth_seconds.
+
+    Returns:
+        tuple: (usuario, None) si el ID es válido o (None, respuesta de error) en caso contrario.
+    """
+    started = time.perf_counter()
+    try:
+        with tracer.span('auth.authenticate'):
+            return _authenticate()
+    finally:
+        elapsed = time.perf_counter() - started
+        g.auth_seconds = elapsed
+        auth_latency.record(elapsed)
+
+def _authenticate():
+    # Obtener el ID de usuario del encabezado Authorization
+    user_id = request.headers.get('Authorization')
+
+    # Verificar si el ID de usuario está presente en el encabezado
+    if not user_id:
+        return None, (jsonify({'message': 'User ID is missing!'}), 403)
+
+    # Intentar convertir el ID de usuario a entero, devolver error si falla
+    try:
+        user_id = int(user_id)
+    except ValueError:
+        return None, (jsonify({'message': 'Invalid user ID format!'}), 403)
+
+    # Buscar el usuario en el almacén de usuarios
+    try:
+        user = get_user_by_id(user_id)
+    except UserStoreUnavailable:
+        return None, (jsonify({'message': 'User store temporarily unavailable'}), 503)
+    if not user:
+        return None, (jsonify({'message': 'Invalid user ID!'}), 403)
+
+    return user, None
+
+def check_rate_limit(user):
+    """
+    Aplica el límite de peticiones del usuario autenticado a la ruta actual.
+
+    Args:
+        user (dict): Usuario autenticado.
+
+    Returns:
+        tuple o None: Respuesta de error 429 con Retry-After si se superó el límite, o None.
     """
-    for user in USERS:
-        if user['id'] == user_id:
-            return user
-    return None
+    with tracer.span('auth.rate_limit'):
+        decision = inbound_rate_limiter.check(user, request.endpoint)
+    if decision.allowed:
+        return None
+    retry_after = max(math.ceil(decision.retry_after), 1)
+    response = jsonify({'message': 'Too many requests!', 'retry_after': retry_after})
+    response.headers['Retry-After'] = str(retry_after)
+    response.headers['X-RateLimit-Limit'] = str(decision.limit)
+    response.headers['X-RateLimit-Remaining'] = '0'
+    return response, 429
 
 def token_required(f):
     """
-    Decorador para verificar que el encabezado 'Authorization' contiene un ID de usuario válido.
+    Decorador para verificar que el encabezado 'Authorization' contiene un ID de usuario válido
+    y que el usuario no ha superado su límite de peticiones en la ruta.
     
     Args:
         f (función): La función decorada.
@@ -32,23 +141,12 @@ def token_required(f):
         función decorada o mensaje JSON de error si el ID de usuario no es válido.
     """
     def decorator(*args, **kwargs):
-        # Obtener el ID de usuario del encabezado Authorization
-        user_id = request.headers.get('Authorization')
-
-        # Verificar si el ID de usuario está presente en el encabezado
-        if not user_id:
-            return jsonify({'message': 'User ID is missing!'}), 403
-
-        # Intentar convertir el ID de usuario a entero, devolver error si falla
-        try:
-            user_id = int(user_id)
-        except ValueError:
-            return jsonify({'message': 'Invalid user ID format!'}), 403
-
-        # Buscar el usuario en la lista de usuarios
-        user = get_user_by_id(user_id)
-        if not user:
-            return jsonify({'message': 'Invalid user ID!'}), 403
+        user, error = authenticate_request()
+        if error:
+            return error
+        error = check_rate_limit(user)
+        if error:
+            return error
 
         # Llamar a la función decorada pasando el usuario encontrado
         return f(user, *args, **kwargs)
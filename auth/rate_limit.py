@@ -0,0 +1,211 @@
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict, namedtuple
+import redis
+from adapters.redis_client import get_redis_client
+from settings import get_config
+
+# Cargar la configuración seleccionada con APP_CONFIG
+app_settings = get_config()
+
+logger = logging.getLogger(__name__)
+
+# Resultado de comprobar una petición: si se permite, segundos hasta poder reintentar,
+# límite aplicado y peticiones restantes antes de agotarlo.
+RateLimitDecision = namedtuple('RateLimitDecision', ['allowed', 'retry_after', 'limit', 'remaining'])
+
+# GCRA sobre varias claves a la vez (límite por usuario y por usuario y ruta): la petición
+# solo se registra si todas las claves la permiten. Cada clave guarda su TAT (theoretical
+# arrival time) y expira cuando deja de importar. Se usa el reloj del servidor de Redis.
+_GCRA_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local new_tats = {}
+local retry_after = 0
+local remaining = math.huge
+for i = 1, #KEYS do
+    local interval = tonumber(ARGV[2 * i - 1])
+    local period = tonumber(ARGV[2 * i])
+    local tat = math.max(tonumber(redis.call('GET', KEYS[i])) or now, now)
+    local new_tat = tat + interval
+    local allow_at = new_tat - period
+    if now < allow_at then
+        retry_after = math.max(retry_after, allow_at - now)
+        remaining = 0
+    else
+        remaining = math.min(remaining, math.floor((now - allow_at) / interval))
+    end
+    new_tats[i] = new_tat
+end
+if retry_after > 0 then
+    return {0, tostring(retry_after), 0}
+end
+for i = 1, #KEYS do
+    redis.call('SET', KEYS[i], tostring(new_tats[i]), 'PX', math.ceil((new_tats[i] - now) * 1000))
+end
+return {1, '0', remaining}
+"""
+
+
+def parse_quota(value):
+    """
+    Interpreta una cuota con el formato 'peticiones/segundos', por ejemplo '60/60'.
+
+    Args:
+        value (str): Cuota configurada.
+
+    Returns:
+        tuple: (peticiones, segundos).
+
+    Raises:
+        ValueError: Si el formato no es válido.
+    """
+    requests_count, _, period = str(value).partition('/')
+    quota = (int(requests_count), float(period or 1))
+    if quota[0] <= 0 or quota[1] <= 0:
+        raise ValueError(f"Cuota inválida: {value}")
+    return quota
+
+
+class _LocalGCRA:
+    """
+    GCRA en memoria del proceso. Solo ve las peticiones que recibe este proceso, por lo que
+    si deniega una petición el límite global también está superado.
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._tats = OrderedDict()
+        self._blocked_until = {}
+        self._lock = threading.Lock()
+
+    def check(self, quotas, now):
+        """
+        Comprueba y registra una petición contra varias claves.
+
+        Args:
+            quotas (list): Tuplas (clave, peticiones, segundos).
+            now (float): Instante actual (epoch).
+
+        Returns:
+            tuple: (permitida, segundos hasta poder reintentar, peticiones restantes).
+        """
+        with self._lock:
+            retry_after = max((self._blocked_until.get(key, 0) - now for key, _, _ in quotas), default=0)
+            if retry_after > 0:
+                return False, retry_after, 0
+            new_tats = []
+            remaining = math.inf
+            for key, limit, period in quotas:
+                interval = period / limit
+                new_tat = max(self._tats.get(key, now), now) + interval
+                allow_at = new_tat - period
+                if now < allow_at:
+                    retry_after = max(retry_after, allow_at - now)
+                else:
+                    remaining = min(remaining, int((now - allow_at) // interval))
+                new_tats.append((key, new_tat))
+            if retry_after > 0:
+                return False, retry_after, 0
+            for key, new_tat in new_tats:
+                self._tats[key] = new_tat
+                self._tats.move_to_end(key)
+            while len(self._tats) > self.maxsize:
+                self._tats.popitem(last=False)
+            return True, 0.0, remaining
+
+    def block(self, quotas, until):
+        """
+        Recuerda una denegación de Redis para rechazar localmente hasta 'until'.
+
+        Args:
+            quotas (list): Tuplas (clave, peticiones, segundos).
+            until (float): Instante (epoch) hasta el que se rechaza.
+        """
+        with self._lock:
+            for key, _, _ in quotas:
+                self._blocked_until[key] = until
+            if len(self._blocked_until) > self.maxsize:
+                now = time.time()
+                self._blocked_until = {k: v for k, v in self._blocked_until.items() if v > now}
+
+
+class InboundRateLimiter:
+    """
+    Limita las peticiones entrantes por usuario y por usuario y ruta con GCRA en Redis, de
+    modo que el límite es global entre procesos. Las cuotas dependen del permiso del usuario.
+
+    Antes de consultar Redis se comprueba un GCRA local: los clientes que ya superaron su
+    cuota en este proceso, o a los que Redis acaba de rechazar, se rechazan sin salir del
+    proceso. Sin Redis se aplica solo el límite local.
+    """
+
+    def __init__(self, redis_client, quotas, enabled=True):
+        """
+        Inicializa el limitador.
+
+        Args:
+            redis_client (redis.Redis): Cliente de Redis compartido, o None para limitar solo en local.
+            quotas (dict): Por permiso, tupla ((peticiones, segundos) por usuario,
+                (peticiones, segundos) por usuario y ruta).
+            enabled (bool): Si es False todas las peticiones se permiten.
+        """
+        self.redis_client = redis_client
+        self.quotas = quotas
+        self.enabled = enabled
+        self._local = _LocalGCRA()
+
+    def _quotas_for(self, user, route):
+        user_quota, route_quota = self.quotas.get(user['permission'], self.quotas['USER'])
+        return [
+            (f"ratelimit:{user['id']}", user_quota[0], user_quota[1]),
+            (f"ratelimit:{user['id']}:{route}", route_quota[0], route_quota[1]),
+        ]
+
+    def check(self, user, route):
+        """
+        Comprueba y registra una petición de un usuario a una ruta.
+
+        Args:
+            user (dict): Usuario autenticado.
+            route (str): Nombre del endpoint.
+
+        Returns:
+            RateLimitDecision: Resultado de la comprobación.
+        """
+        if not self.enabled:
+            return RateLimitDecision(True, 0.0, None, None)
+        quotas = self._quotas_for(user, route)
+        limit = min(quota[1] for quota in quotas)
+        now = time.time()
+
+        allowed, retry_after, remaining = self._local.check(quotas, now)
+        if not allowed or not self.redis_client:
+            return RateLimitDecision(allowed, retry_after, limit, remaining)
+
+        args = []
+        for _, requests_count, period in quotas:
+            args.extend([period / requests_count, period])
+        try:
+            allowed, retry_after, remaining = self.redis_client.eval(
+                _GCRA_SCRIPT, len(quotas), *[key for key, _, _ in quotas], *args
+            )
+        except redis.exceptions.RedisError as e:
+            logger.warning("Límite de peticiones sin Redis, usando el límite local: %s", e)
+            return RateLimitDecision(True, 0.0, limit, remaining)
+        retry_after = float(retry_after)
+        if not allowed:
+            self._local.block(quotas, now + retry_after)
+        return RateLimitDecision(bool(allowed), retry_after, limit, int(remaining))
+
+
+inbound_rate_limiter = InboundRateLimiter(
+    get_redis_client(app_settings),
+    {
+        'ADMIN': (parse_quota(app_settings.RATE_LIMIT_ADMIN), parse_quota(app_settings.RATE_LIMIT_ADMIN_ROUTE)),
+        'USER': (parse_quota(app_settings.RATE_LIMIT_USER), parse_quota(app_settings.RATE_LIMIT_USER_ROUTE)),
+    },
+    enabled=app_settings.RATE_LIMIT_ENABLED
+)
@@ -0,0 +1,290 @@
+import logging
+import sqlite3
+import threading
+import redis
+from adapters.cache import LocalCache
+
+logger = logging.getLogger(__name__)
+
+# Marca en la caché un ID que no corresponde a ningún usuario.
+_NOT_FOUND = object()
+
+
+class UserStoreUnavailable(Exception):
+    """
+    El almacén de usuarios no respondió, por lo que no se sabe si el usuario existe.
+    """
+
+
+class MemoryUserStore:
+    """
+    Almacén de usuarios en memoria indexado por ID. Útil para desarrollo y pruebas.
+    """
+
+    def __init__(self, users=()):
+        """
+        Args:
+            users (iterable): Usuarios iniciales.
+        """
+        self._users = {}
+        for user in users:
+            self.add(user)
+
+    def get(self, user_id):
+        """
+        Args:
+            user_id (int): ID del usuario.
+
+        Returns:
+            dict: Usuario o None si no existe.
+        """
+        return self._users.get(user_id)
+
+    def add(self, user):
+        """
+        Agrega o reemplaza un usuario.
+
+        Args:
+            user (dict): Usuario con 'id', 'username' y 'permission'.
+        """
+        self._users[user['id']] = {'id': user['id'], 'username': user['username'], 'permission': user['permission']}
+
+    def add_if_missing(self, user):
+        """
+        Agrega un usuario solo si su ID no existe.
+
+        Args:
+            user (dict): Usuario con 'id', 'username' y 'permission'.
+        """
+        if user['id'] not in self._users:
+            self.add(user)
+
+
+class SQLiteUserStore:
+    """
+    Almacén de usuarios en SQLite. El ID es la clave primaria, por lo que cada búsqueda es
+    una consulta indexada. Cada hilo usa su propia conexión.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Ruta de la base de datos.
+        """
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                "id INTEGER PRIMARY KEY, username TEXT NOT NULL UNIQUE, permission TEXT NOT NULL)"
+            )
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(self.path)
+        return connection
+
+    def get(self, user_id):
+        """
+        Args:
+            user_id (int): ID del usuario.
+
+        Returns:
+            dict: Usuario o None si no existe.
+        """
+        row = self._connection().execute(
+            "SELECT id, username, permission FROM users WHERE id = ?", (user_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'id': row[0], 'username': row[1], 'permission': row[2]}
+
+    def add(self, user):
+        """
+        Agrega o reemplaza un usuario.
+
+        Args:
+            user (dict): Usuario con 'id', 'username' y 'permission'.
+        """
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO users (id, username, permission) VALUES (?, ?, ?)",
+                (user['id'], user['username'], user['permission'])
+            )
+
+    def add_if_missing(self, user):
+        """
+        Agrega un usuario solo si no existe otro con su ID o su nombre; las filas existentes
+        no se modifican.
+
+        Args:
+            user (dict): Usuario con 'id', 'username' y 'permission'.
+        """
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR IGNORE INTO users (id, username, permission) VALUES (?, ?, ?)",
+                (user['id'], user['username'], user['permission'])
+            )
+
+
+class RedisUserStore:
+    """
+    Almacén de usuarios en Redis: un hash 'user:{id}' por usuario.
+    """
+
+    def __init__(self, redis_client):
+        """
+        Args:
+            redis_client (redis.Redis): Cliente de Redis compartido.
+        """
+        self.redis_client = redis_client
+
+    def get(self, user_id):
+        """
+        Args:
+            user_id (int): ID del usuario.
+
+        Returns:
+            dict: Usuario o None si no existe.
+        """
+        fields = self.redis_client.hgetall(f"user:{user_id}")
+        if not fields:
+            return None
+        fields = {
+            (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+            for k, v in fields.items()
+        }
+        return {'id': user_id, 'username': fields.get('username'), 'permission': fields.get('permission')}
+
+    def add(self, user):
+        """
+        Agrega o reemplaza un usuario.
+
+        Args:
+            user (dict): Usuario con 'id', 'username' y 'permission'.
+        """
+        self.redis_client.hset(f"user:{user['id']}", mapping={'username': user['username'], 'permission': user['permission']})
+
+    def add_if_missing(self, user):
+        """
+        Agrega un usuario sin modificar los campos que ya existan en su hash.
+
+        Args:
+            user (dict): Usuario con 'id', 'username' y 'permission'.
+        """
+        key = f"user:{user['id']}"
+        with self.redis_client.pipeline() as pipe:
+            pipe.hsetnx(key, 'username', user['username'])
+            pipe.hsetnx(key, 'permission', user['permission'])
+            pipe.execute()
+
+
+class CachedUserStore:
+    """
+    Caché en memoria (TTL y LRU) delante de un almacén de usuarios, de modo que resolver el
+    usuario de una petición no sale del proceso salvo la primera vez. Los IDs inexistentes
+    también se cachean para que no puedan usarse para saturar el almacén.
+    """
+
+    def __init__(self, store, ttl=60, maxsize=10000):
+        """
+        Args:
+            store: Almacén con el método get(user_id).
+            ttl (float): Segundos que se conserva un usuario resuelto.
+            maxsize (int): Número máximo de usuarios en caché.
+        """
+        self.store = store
+        self.ttl = ttl
+        self._cache = LocalCache(maxsize)
+
+    def get(self, user_id):
+        """
+        Args:
+            user_id (int): ID del usuario.
+
+        Returns:
+            dict: Usuario o None si no existe.
+
+        Raises:
+            UserStoreUnavailable: Si el almacén no está disponible. El fallo no se cachea.
+        """
+        key = f"user_{user_id}"
+        user = self._cache.get(key)
+        if user is not None:
+            return None if user is _NOT_FOUND else user
+        try:
+            user = self.store.get(user_id)
+        except (sqlite3.Error, redis.exceptions.RedisError) as e:
+            logger.warning("No se pudo consultar el usuario %s: %s", user_id, e)
+            raise UserStoreUnavailable(str(e)) from e
+        self._cache.set(key, _NOT_FOUND if user is None else user, self.ttl)
+        return user
+
+    def add(self, user):
+        """
+        Agrega o reemplaza un usuario en el almacén y descarta su copia en caché.
+
+        Args:
+            user (dict): Usuario con 'id', 'username' y 'permission'.
+        """
+        self.store.add(user)
+        self.invalidate(user['id'])
+
+    def invalidate(self, user_id):
+        """
+        Descarta la copia en caché de un usuario, por ejemplo tras cambiar su permiso.
+
+        Args:
+            user_id (int): ID del usuario.
+        """
+        self._cache.delete(f"user_{user_id}")
+
+    def stats(self):
+        """
+        Returns:
+            dict: Aciertos, fallos, expulsiones y expiraciones de la caché de usuarios.
+        """
+        return self._cache.stats().get('user', {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0})
+
+
+def create_user_store(settings, redis_client=None, default_users=()):
+    """
+    Crea el almacén de usuarios configurado en USER_STORE ('memory', 'sqlite' o 'redis'),
+    con la caché en memoria delante.
+
+    Args:
+        settings (Config): Objeto de configuración con los parámetros USER_*.
+        redis_client (redis.Redis, opcional): Cliente de Redis para el almacén 'redis'.
+        default_users (iterable): Usuarios que se cargan si USER_STORE_SEED es True. Solo
+            se agregan los que no existen, de modo que los cambios guardados en un almacén
+            persistente no se sobrescriben al arrancar.
+
+    Returns:
+        CachedUserStore: Almacén listo para usarse.
+
+    Raises:
+        ValueError: Si el tipo de almacén no es válido.
+    """
+    kind = getattr(settings, 'USER_STORE', 'memory')
+    if kind == 'memory':
+        store = MemoryUserStore()
+    elif kind == 'sqlite':
+        store = SQLiteUserStore(getattr(settings, 'USER_STORE_PATH', 'users.db'))
+    elif kind == 'redis':
+        store = RedisUserStore(redis_client)
+    else:
+        raise ValueError(f"Almacén de usuarios desconocido: {kind}")
+
+    if getattr(settings, 'USER_STORE_SEED', True):
+        try:
+            for user in default_users:
+                store.add_if_missing(user)
+        except (sqlite3.Error, redis.exceptions.RedisError) as e:
+            logger.warning("No se pudieron cargar los usuarios iniciales: %s", e)
+
+    return CachedUserStore(
+        store,
+        ttl=getattr(settings, 'USER_CACHE_TTL', 60),
+        maxsize=getattr(settings, 'USER_CACHE_MAXSIZE', 10000)
+    )
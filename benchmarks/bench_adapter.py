@@ -0,0 +1,44 @@
+from benchmarks.fixtures import SIZES, listing, make_adapter, make_movies
+from benchmarks.harness import Case
+
+KEY = "popular_movies"
+
+
+def cases(sizes=SIZES):
+    """
+    Casos de escritura y lectura de la caché del adaptador (_cache_response y
+    _get_cached_response), leyendo de la caché en memoria (l1) y de Redis (redis).
+
+    Args:
+        sizes (tuple): Tamaños de listado a medir.
+
+    Returns:
+        list: Casos de benchmark.
+    """
+    result = []
+    for size in sizes:
+        def cache_response(size=size):
+            adapter = make_adapter()
+            data = listing(make_movies(size))
+            return lambda: adapter._cache_response(KEY, adapter.cache_duration, data)
+
+        def get_cached_l1(size=size):
+            adapter = make_adapter()
+            adapter._cache_response(KEY, adapter.cache_duration, listing(make_movies(size)))
+            return lambda: adapter._get_cached_response(KEY)
+
+        def get_cached_redis(size=size):
+            adapter = make_adapter()
+            adapter._cache_response(KEY, adapter.cache_duration, listing(make_movies(size)))
+
+            def run():
+                adapter.local_cache.delete(KEY)
+                return adapter._get_cached_response(KEY)
+            return run
+
+        result.extend([
+            Case(f"adapter.cache_response[{size}]", cache_response),
+            Case(f"adapter.get_cached_response.l1[{size}]", get_cached_l1),
+            Case(f"adapter.get_cached_response.redis[{size}]", get_cached_redis),
+        ])
+    return result
@@ -0,0 +1,94 @@
+import requests_mock
+from flask import Flask
+from benchmarks.fixtures import ACCOUNT_ID, API_KEY, BASE_URL, forget, listing, make_movies, make_service, seed_lists
+from benchmarks.harness import Case
+
+LIST_SIZE = 1000
+POPULAR_KEY = "popular_movies"
+LIST_KEYS = (f"favorite_movies_{ACCOUNT_ID}", f"rated_movies_{ACCOUNT_ID}", f"rated_favorite_movies_{ACCOUNT_ID}")
+
+_client = None
+
+
+def _get_client():
+    """
+    Crea una sola vez la aplicación de prueba: servicio sobre Redis en memoria, límite de
+    entrada sin tope efectivo (se mide su coste, no su efecto) y TMDB simulado con
+    requests_mock.
+
+    Returns:
+        FlaskClient: Cliente de prueba autenticado como usuario 2 (USER).
+    """
+    global _client
+    if _client is None:
+        import controllers.controllers as controllers
+        from auth.rate_limit import inbound_rate_limiter
+
+        service = make_service()
+        controllers.movie_service = service
+        inbound_rate_limiter.redis_client = service.movie_api.redis_client
+        unlimited = ((10 ** 9, 1), (10 ** 9, 1))
+        inbound_rate_limiter.quotas = {'ADMIN': unlimited, 'USER': unlimited}
+
+        movies = make_movies(LIST_SIZE + LIST_SIZE // 2)
+        mocker = requests_mock.Mocker()
+        mocker.start()
+        mocker.get(f"{BASE_URL}/movie/popular?api_key={API_KEY}", json=listing(movies[:20]))
+        mocker.get(f"{BASE_URL}/account/{ACCOUNT_ID}/favorite/movies", json=listing(movies[:LIST_SIZE]))
+        mocker.get(f"{BASE_URL}/account/{ACCOUNT_ID}/rated/movies", json=listing(movies[LIST_SIZE // 2:]))
+
+        app = Flask(__name__)
+        app.register_blueprint(controllers.movies_blueprint)
+        _client = app.test_client()
+        _client.environ_base['HTTP_AUTHORIZATION'] = '2'
+        _client.service = service
+    return _client
+
+
+def _checked(response, path):
+    if response.status_code != 200:
+        raise RuntimeError(f"{path} respondió {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return response
+
+
+def _hit(path):
+    def setup():
+        client = _get_client()
+        seed_lists(client.service.movie_api, LIST_SIZE)
+        _checked(client.get(path), path)
+        return lambda: client.get(path)
+    return setup
+
+
+def _miss(path, *keys):
+    def setup():
+        client = _get_client()
+
+        def run():
+            forget(client.service.movie_api, *keys)
+            return client.get(path)
+        _checked(run(), path)
+        return run
+    return setup
+
+
+def cases(sizes=None):
+    """
+    Casos de los endpoints a través del cliente de prueba de Flask, con la caché caliente
+    (hit) y vaciando la caché antes de cada petición para que se consulte TMDB (miss).
+
+    Args:
+        sizes (tuple, opcional): No se usa; los listados tienen LIST_SIZE películas.
+
+    Returns:
+        list: Casos de benchmark.
+    """
+    return [
+        Case("endpoints.populars.hit", _hit('/populars')),
+        Case("endpoints.populars.miss", _miss('/populars', POPULAR_KEY)),
+        Case(f"endpoints.get_favorite_movies.hit[{LIST_SIZE}]", _hit('/get_favorite_movies')),
+        Case(f"endpoints.get_favorite_movies.miss[{LIST_SIZE}]", _miss('/get_favorite_movies', *LIST_KEYS)),
+        Case(f"endpoints.get_favorite_movies_by_release_date.hit[{LIST_SIZE}]", _hit('/get_favorite_movies_by_release_date')),
+        Case(f"endpoints.rated_movies_from_favorites.hit[{LIST_SIZE}]", _hit('/rated_movies_from_favorites')),
+        Case(f"endpoints.rated_movies_from_favorites.miss[{LIST_SIZE}]", _miss('/rated_movies_from_favorites', *LIST_KEYS)),
+    ]
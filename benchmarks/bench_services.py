@@ -0,0 +1,60 @@
+import time
+from adapters.cache import CacheEntry
+from benchmarks.fixtures import ACCOUNT_ID, SIZES, forget, make_service, seed_lists
+from benchmarks.harness import Case
+
+FAVORITES_KEY = f"favorite_movies_{ACCOUNT_ID}"
+VIEW_KEY = f"rated_favorite_movies_{ACCOUNT_ID}"
+
+
+def cases(sizes=SIZES):
+    """
+    Casos de MovieService sobre listas en caché. 'warm' reutiliza lo derivado de la entrada
+    (índice por fecha, vista y JSON serializado); 'cold' lo recalcula en cada operación,
+    como ocurre tras un cambio en la lista.
+
+    Args:
+        sizes (tuple): Tamaños de listado a medir.
+
+    Returns:
+        list: Casos de benchmark.
+    """
+    result = []
+    for size in sizes:
+        def release_date_warm(size=size):
+            service = make_service()
+            seed_lists(service.movie_api, size)
+            return service.get_favorite_movies_by_release_date
+
+        def release_date_cold(size=size):
+            service = make_service()
+            seed_lists(service.movie_api, size)
+            adapter = service.movie_api
+            value = adapter._get_cached_response(FAVORITES_KEY)
+
+            def run():
+                adapter.local_cache.set(FAVORITES_KEY, CacheEntry(value, time.time()), adapter.stale_duration)
+                return service.get_favorite_movies_by_release_date()
+            return run
+
+        def rated_from_favorites_warm(size=size):
+            service = make_service()
+            seed_lists(service.movie_api, size)
+            return lambda: service.get_rated_movies_from_favorites(raw=True)
+
+        def rated_from_favorites_cold(size=size):
+            service = make_service()
+            seed_lists(service.movie_api, size)
+
+            def run():
+                forget(service.movie_api, VIEW_KEY)
+                return service.get_rated_movies_from_favorites(raw=True)
+            return run
+
+        result.extend([
+            Case(f"services.release_date.warm[{size}]", release_date_warm),
+            Case(f"services.release_date.cold[{size}]", release_date_cold),
+            Case(f"services.rated_from_favorites.warm[{size}]", rated_from_favorites_warm),
+            Case(f"services.rated_from_favorites.cold[{size}]", rated_from_favorites_cold),
+        ])
+    return result
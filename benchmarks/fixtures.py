@@ -0,0 +1,113 @@
+import random
+import fakeredis
+from adapters.movie_api_adapter import MovieAPIAdapter
+from adapters.rate_limiter import TokenBucket
+from application.services import MovieService
+from settings import get_config
+
+# Cargar la configuración seleccionada con APP_CONFIG
+app_settings = get_config()
+
+ACCOUNT_ID = "12345"
+API_KEY = "bench_key"
+BASE_URL = app_settings.TMDB_BASE_URL.rstrip('/')
+
+# Tamaños de listado medidos por defecto
+SIZES = (20, 1000, 10000, 100000)
+
+
+def make_movies(count, seed=0):
+    """
+    Genera películas deterministas con los campos que devuelve TMDB.
+
+    Args:
+        count (int): Número de películas.
+        seed (int): Semilla del generador.
+
+    Returns:
+        list: Películas (dict) con id, title, release_date, rating y campos extra.
+    """
+    rng = random.Random(seed)
+    movies = []
+    for movie_id in range(1, count + 1):
+        release_date = None if rng.random() < 0.02 else (
+            f"{rng.randint(1950, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        )
+        movies.append({
+            'id': movie_id,
+            'title': f"Movie {movie_id}",
+            'release_date': release_date,
+            'rating': rng.randint(1, 20) / 2,
+            'overview': "Lorem ipsum dolor sit amet " * 4,
+            'popularity': rng.random() * 100,
+            'vote_average': rng.random() * 10,
+        })
+    return movies
+
+
+def listing(movies):
+    """
+    Args:
+        movies (list): Películas del listado.
+
+    Returns:
+        dict: Respuesta de una sola página con el formato de TMDB.
+    """
+    return {'page': 1, 'results': movies, 'total_pages': 1, 'total_results': len(movies)}
+
+
+def make_adapter(redis_client=None):
+    """
+    Crea un adaptador sobre Redis en memoria (fakeredis) y sin límite de salida.
+
+    Args:
+        redis_client (redis.Redis, opcional): Cliente a usar; por defecto uno nuevo en memoria.
+
+    Returns:
+        MovieAPIAdapter: Adaptador listo para medir.
+    """
+    unlimited = {'read': TokenBucket(1e9), 'write': TokenBucket(1e9)}
+    return MovieAPIAdapter(
+        API_KEY, {}, ACCOUNT_ID, redis_client or fakeredis.FakeStrictRedis(), rate_limiters=unlimited
+    )
+
+
+def make_service(adapter=None):
+    """
+    Crea un servicio cuyo adaptador usa Redis en memoria.
+
+    Args:
+        adapter (MovieAPIAdapter, opcional): Adaptador a usar; por defecto make_adapter().
+
+    Returns:
+        MovieService: Servicio listo para medir.
+    """
+    service = MovieService(API_KEY, {}, ACCOUNT_ID)
+    service.movie_api = adapter or make_adapter()
+    return service
+
+
+def seed_lists(adapter, size):
+    """
+    Guarda en caché favoritas y calificadas de 'size' películas, con la mitad en común.
+
+    Args:
+        adapter (MovieAPIAdapter): Adaptador cuya caché se llena.
+        size (int): Número de películas de cada lista.
+    """
+    movies = make_movies(size + size // 2)
+    adapter._cache_response(f"favorite_movies_{ACCOUNT_ID}", adapter.cache_duration, listing(movies[:size]))
+    adapter._cache_response(f"rated_movies_{ACCOUNT_ID}", adapter.cache_duration, listing(movies[size // 2:]))
+
+
+def forget(adapter, *keys):
+    """
+    Elimina claves de la caché en memoria y de Redis para forzar un fallo de caché.
+
+    Args:
+        adapter (MovieAPIAdapter): Adaptador.
+        *keys (str): Claves a eliminar.
+    """
+    for key in keys:
+        adapter.local_cache.delete(key)
+    adapter.redis_client.delete(*keys)
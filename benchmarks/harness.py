@@ -0,0 +1,140 @@
+import json
+import platform
+import statistics
+import time
+from collections import namedtuple
+
+# Caso de benchmark: nombre único y función que prepara el escenario y devuelve la
+# operación a medir (sin argumentos).
+Case = namedtuple('Case', ['name', 'setup'])
+
+
+def measure(func, min_time=0.2, repeat=5):
+    """
+    Mide una operación: calibra el número de iteraciones para que cada ronda dure al menos
+    min_time segundos y repite la medición 'repeat' veces.
+
+    Args:
+        func (callable): Operación a medir.
+        min_time (float): Duración mínima de cada ronda en segundos.
+        repeat (int): Número de rondas.
+
+    Returns:
+        dict: Segundos por operación (mediana y mínimo), iteraciones por ronda y rondas.
+    """
+    func()
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 2 if elapsed == 0 else max(min(int(min_time / elapsed * 1.2), 10), 2)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        timings.append((time.perf_counter() - started) / loops)
+    return {'median': statistics.median(timings), 'min': min(timings), 'loops': loops, 'repeat': repeat}
+
+
+def calibrate():
+    """
+    Mide una carga fija de Python puro para normalizar los resultados entre máquinas.
+
+    Returns:
+        float: Segundos por ejecución de la carga de referencia.
+    """
+    def reference():
+        data = {i: str(i) for i in range(2000)}
+        sorted(data.values())
+        return sum(len(value) for value in data.values())
+
+    return measure(reference, min_time=0.1, repeat=7)['min']
+
+
+def run_cases(cases, pattern=None, min_time=0.2, repeat=5, progress=None):
+    """
+    Ejecuta los casos cuyo nombre contiene 'pattern'.
+
+    Args:
+        cases (iterable): Casos (Case) a ejecutar.
+        pattern (str, opcional): Subcadena que deben contener los nombres.
+        min_time (float): Duración mínima de cada ronda en segundos.
+        repeat (int): Número de rondas por caso.
+        progress (callable, opcional): Recibe el nombre y el resultado de cada caso.
+
+    Returns:
+        dict: Documento de resultados con el entorno, la calibración y el resultado por caso.
+    """
+    results = {}
+    for case in cases:
+        if pattern and pattern not in case.name:
+            continue
+        result = measure(case.setup(), min_time=min_time, repeat=repeat)
+        results[case.name] = result
+        if progress:
+            progress(case.name, result)
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'calibration': calibrate(),
+        'results': results,
+    }
+
+
+def compare(current, baseline, tolerance=0.25, min_delta=5e-6):
+    """
+    Compara unos resultados con la línea base. Los tiempos se normalizan con la calibración
+    de cada documento, de modo que una máquina más lenta no cuenta como regresión.
+
+    Args:
+        current (dict): Documento de resultados actual.
+        baseline (dict): Documento de resultados de referencia.
+        tolerance (float): Empeoramiento relativo permitido (0.25 = 25 %).
+        min_delta (float): Empeoramiento absoluto en segundos por debajo del cual no se
+            considera regresión, para que el ruido no haga fallar los casos de microsegundos.
+
+    Returns:
+        list: Tuplas (caso, segundos de referencia normalizados, segundos actuales
+            normalizados, ratio) de los casos que empeoran más de la tolerancia.
+    """
+    scale = baseline['calibration'] / current['calibration']
+    regressions = []
+    for name, result in current['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+        # Se compara el mínimo de las rondas, que es el menos sensible al ruido de la máquina.
+        normalized = result['min'] * scale
+        ratio = normalized / reference['min']
+        if ratio > 1 + tolerance and normalized - reference['min'] > min_delta:
+            regressions.append((name, reference['min'], normalized, ratio))
+    return regressions
+
+
+def load(path):
+    """
+    Args:
+        path (str): Ruta de un documento de resultados.
+
+    Returns:
+        dict: Documento de resultados.
+    """
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save(document, path):
+    """
+    Args:
+        document (dict): Documento de resultados.
+        path (str): Ruta de destino.
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(document, file, indent=2, sort_keys=True)
+        file.write('\n')
@@ -0,0 +1,71 @@
+import argparse
+import logging
+import os
+import sys
+from benchmarks import bench_adapter, bench_endpoints, bench_services
+from benchmarks.fixtures import SIZES
+from benchmarks.harness import compare, load, run_cases, save
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+RESULTS_PATH = os.path.join(os.path.dirname(__file__), 'results.json')
+
+
+def main(argv=None):
+    """
+    Ejecuta los benchmarks, guarda los resultados en JSON y los compara con la línea base.
+
+    Returns:
+        int: 0 si no hay regresiones, 1 si algún caso empeora más de la tolerancia.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks del adaptador, el servicio y los endpoints.")
+    parser.add_argument('-k', '--filter', help="Solo los casos cuyo nombre contiene este texto.")
+    parser.add_argument('--sizes', default=','.join(map(str, SIZES)), help="Tamaños de listado separados por comas.")
+    parser.add_argument('--min-time', type=float, default=0.2, help="Duración mínima de cada ronda en segundos.")
+    parser.add_argument('--repeat', type=int, default=5, help="Rondas por caso.")
+    parser.add_argument('--output', default=RESULTS_PATH, help="Ruta del JSON de resultados.")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Ruta del JSON de la línea base.")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Empeoramiento permitido (0.25 = 25 %%).")
+    parser.add_argument('--min-delta', type=float, default=5, help="Empeoramiento absoluto ignorado, en microsegundos.")
+    parser.add_argument('--update-baseline', action='store_true', help="Guarda los resultados como nueva línea base.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    sizes = tuple(int(size) for size in args.sizes.split(','))
+    cases = bench_adapter.cases(sizes) + bench_services.cases(sizes) + bench_endpoints.cases()
+
+    def progress(name, result):
+        print(f"{name:<60} {result['median'] * 1e6:>14.1f} us  (x{result['loops']})")
+
+    document = run_cases(cases, args.filter, args.min_time, args.repeat, progress)
+    save(document, args.output)
+    print(f"Resultados guardados en {args.output}")
+
+    if args.update_baseline:
+        if os.path.exists(args.baseline):
+            # Se conservan los casos que no se ejecutaron en esta pasada.
+            baseline = load(args.baseline)
+            scale = baseline['calibration'] / document['calibration']
+            baseline['results'].update({
+                name: dict(result, median=result['median'] * scale, min=result['min'] * scale)
+                for name, result in document['results'].items()
+            })
+            document = baseline
+        save(document, args.baseline)
+        print(f"Línea base actualizada en {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No hay línea base; ejecute con --update-baseline para crearla.")
+        return 0
+
+    regressions = compare(document, load(args.baseline), args.tolerance, args.min_delta / 1e6)
+    for name, reference, current, ratio in regressions:
+        print(f"REGRESIÓN {name}: {reference * 1e6:.1f} us -> {current * 1e6:.1f} us (x{ratio:.2f})", file=sys.stderr)
+    if regressions:
+        return 1
+    print(f"Sin regresiones respecto a la línea base (tolerancia {args.tolerance:.0%}).")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
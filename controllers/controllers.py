@@ -1,36 +1,275 @@
-from flask import Blueprint, jsonify
+import time
+from flask import Blueprint, Response, g, jsonify, request, url_for
 from application.services import MovieService
-from settings import config
+from application.cache_warmer import create_cache_warmer
+from settings import get_config
 from auth.auth import token_required, permission_required
+from adapters.serialization import SUPPORTED_ENCODINGS, RawJSON
+from domain.movie import parse_fields
+from adapters.resilience import circuit_breakers, retry_budget, set_deadline, reset_deadline
+from adapters.metrics import create_multiprocess_metrics, http_request_duration, http_requests, registry
+from adapters.profiler import ProfilerBusy, SamplingProfiler, collapse
+from adapters.tracing import tracer
+from adapters.redis_client import redis_pool_stats
+from auth.auth import auth_latency, user_store
 
-# Cargar configuración de desarrollo
-development_config = config['development']()
+# Cargar la configuración seleccionada con APP_CONFIG
+app_settings = get_config()
 
 # Crear blueprint para las rutas de películas
 movies_blueprint = Blueprint('movies', __name__)
 
 # Inicializar servicio de películas con API Key y otros parámetros
 movie_service = MovieService(
-    api_key=development_config.THEMOVIEDB_API_KEY,
-    headers=development_config.headers,
-    account_id=development_config.ACCOUNT_ID
+    api_key=app_settings.THEMOVIEDB_API_KEY,
+    headers=app_settings.headers,
+    account_id=app_settings.ACCOUNT_ID
 )
 
+# Precalentador de los listados en caché del servicio; la aplicación decide si arrancarlo
+cache_warmer = create_cache_warmer(movie_service.movie_api)
+
+# Perfilador por muestreo que se activa bajo demanda desde /profile
+profiler = SamplingProfiler(app_settings.PROFILING_INTERVAL)
+
+# Agregador de las métricas de todos los workers (None si METRICS_MULTIPROC_DIR está vacío)
+multiprocess_metrics = create_multiprocess_metrics(app_settings)
+
+def _collect_component_metrics():
+    """
+    Lee, al exportar /metrics, el estado de la caché en memoria, los pools de conexiones,
+    los interruptores de circuito, los limitadores de salida, la autenticación y el
+    precalentador.
+
+    Returns:
+        list: Tuplas (nombre, tipo, descripción, muestras) para el registro de métricas.
+    """
+    movie_api = movie_service.movie_api
+    l1_stats = movie_api.cache_stats()
+    http_totals = movie_api.pool_stats()['totals']
+    auth = auth_latency.snapshot()
+    budget = retry_budget.stats()
+    warmer_stats = cache_warmer.stats()
+    families = [
+        ('cache_l1_events_total', 'counter', 'Eventos de la caché en memoria (L1) por familia de claves.', [
+            ({'family': family, 'event': event}, value)
+            for family, stats in l1_stats.items() for event, value in stats.items()
+        ]),
+        ('user_cache_events_total', 'counter', 'Eventos de la caché de usuarios.', [
+            ({'event': event}, value) for event, value in user_store.stats().items()
+        ]),
+        ('http_pool_connections_total', 'counter', 'Conexiones HTTP hacia TMDB abiertas (new) o reutilizadas (reused).', [
+            ({'kind': 'new'}, http_totals['new_connections']),
+            ({'kind': 'reused'}, http_totals['reused_connections']),
+        ]),
+        ('circuit_breaker_open', 'gauge', 'Estado del interruptor de circuito por endpoint (1 si no está cerrado).', [
+            ({'endpoint': name, 'state': snapshot['state']}, 0 if snapshot['state'] == 'closed' else 1)
+            for name, snapshot in circuit_breakers.snapshot().items()
+        ]),
+        ('retry_budget_window', 'gauge', 'Llamadas y reintentos en la ventana del presupuesto de reintentos.', [
+            ({'kind': kind}, budget[kind]) for kind in ('requests', 'retries')
+        ]),
+        ('outbound_rate_limit_rate', 'gauge', 'Tasa actual (peticiones/s) de los limitadores de salida hacia TMDB.', [
+            ({'limiter': kind}, limiter.stats()['current_rate']) for kind, limiter in movie_api.rate_limiters.items()
+        ]),
+        ('auth_requests_total', 'counter', 'Autenticaciones de peticiones.', [({}, auth['count'])]),
+        ('auth_duration_seconds_max', 'gauge', 'Duración máxima de una autenticación.', [({}, auth['max_seconds'])]),
+        ('cache_warmer_refreshes_total', 'counter', 'Refrescos del precalentador por clave y resultado.', [
+            ({'key': key, 'result': result}, stats[name])
+            for key, stats in warmer_stats.items()
+            for result, name in (('ok', 'refreshes'), ('failed', 'failures'), ('skipped', 'skipped'))
+        ]),
+    ]
+    if movie_api.redis_client is not None:
+        pool = redis_pool_stats(movie_api.redis_client)
+        families.append(('redis_pool_connections', 'gauge', 'Conexiones del pool de Redis.', [
+            ({'state': 'created'}, pool['created_connections']),
+            ({'state': 'in_use'}, pool['in_use_connections']),
+            ({'state': 'max'}, pool['max_connections']),
+        ]))
+    return families
+
+registry.register_collector(_collect_component_metrics)
+
+def _json_result(result, public=False):
+    """
+    Convierte el resultado de un servicio en respuesta JSON, respetando el código de estado
+    cuando el servicio devuelve una tupla (cuerpo, código) y enviando tal cual el JSON ya
+    serializado (RawJSON), con validadores y compresión.
+    
+    Args:
+        result: Diccionario, RawJSON o tupla (diccionario, código de estado).
+        public (bool): Si la respuesta es igual para todos los usuarios y puede guardarse
+            en cachés compartidas (CDN).
+    
+    Returns:
+        Response: Respuesta JSON con su código de estado.
+    """
+    if isinstance(result, tuple):
+        body, status_code = result
+        return jsonify(body), status_code
+    if isinstance(result, RawJSON):
+        return _raw_json_response(result, public)
+    return jsonify(result)
+
+def _negotiate_encoding(raw):
+    """
+    Elige la codificación de contenido según Accept-Encoding, solo para cuerpos grandes.
+    
+    Args:
+        raw (RawJSON): Documento a enviar.
+    
+    Returns:
+        str: 'br', 'gzip' o None si se envía sin comprimir.
+    """
+    if len(raw.body) < app_settings.COMPRESSION_MIN_SIZE:
+        return None
+    accepted = [(request.accept_encodings.quality(encoding), encoding) for encoding in SUPPORTED_ENCODINGS]
+    accepted = [item for item in accepted if item[0] > 0]
+    if not accepted:
+        return None
+    # Ante igual calidad se respeta el orden de preferencia de SUPPORTED_ENCODINGS.
+    return max(accepted, key=lambda item: item[0])[1]
+
+def _raw_json_response(raw, public):
+    """
+    Construye la respuesta de un documento en caché con ETag (hash de contenido),
+    Cache-Control según el tiempo de frescura restante, 304 ante If-None-Match y
+    compresión gzip/br.
+    
+    Args:
+        raw (RawJSON): Documento a enviar.
+        public (bool): Si la respuesta puede guardarse en cachés compartidas.
+    
+    Returns:
+        Response: Respuesta 200 o 304.
+    """
+    encoding = _negotiate_encoding(raw)
+    etag = raw.etag if encoding is None else f"{raw.etag}-{encoding}"
+
+    if_none_match = request.if_none_match
+    if any(if_none_match.contains_weak(candidate) for candidate in (raw.etag, etag)) or if_none_match.star_tag:
+        response = Response(status=304)
+    else:
+        body = raw.body if encoding is None else raw.encoded(encoding)
+        response = Response(body, mimetype='application/json')
+        if encoding is not None:
+            response.content_encoding = encoding
+
+    max_age = app_settings.CACHE_DURATION
+    if raw.stored_at is not None:
+        max_age = max(int(max_age - (time.time() - raw.stored_at)), 0)
+    response.set_etag(etag)
+    response.cache_control.max_age = max_age
+    if public:
+        response.cache_control.public = True
+    else:
+        response.cache_control.private = True
+        response.vary.add('Authorization')
+    response.vary.add('Accept-Encoding')
+    return response
+
+def _requested_fields():
+    """
+    Lee el parámetro ?fields= con los campos de película que pide el cliente.
+    
+    Returns:
+        tuple: (campos o None, None) o (None, respuesta de error 400) si el parámetro no es válido.
+    """
+    try:
+        return parse_fields(request.args.get('fields')), None
+    except ValueError as e:
+        return None, (jsonify({'message': str(e)}), 400)
+
+@movies_blueprint.before_request
+def start_request_deadline():
+    """
+    Fija el plazo de la petición, que limita los reintentos y esperas hacia TMDB.
+    """
+    g.deadline_token = set_deadline(app_settings.REQUEST_DEADLINE)
+    g.request_started = time.perf_counter()
+
+@movies_blueprint.after_request
+def add_server_timing(response):
+    """
+    Expone en la cabecera Server-Timing lo que tardó la autenticación de la petición.
+    """
+    auth_seconds = g.get('auth_seconds')
+    if auth_seconds is not None:
+        response.headers.add('Server-Timing', f"auth;dur={auth_seconds * 1000:.3f}")
+    return response
+
+@movies_blueprint.after_request
+def record_request_metrics(response):
+    """
+    Registra la duración y el código de estado de la petición por ruta.
+    """
+    started = g.get('request_started')
+    if started is not None:
+        route = request.endpoint or 'unknown'
+        http_request_duration.observe(time.perf_counter() - started, route, request.method)
+        http_requests.inc(route, request.method, str(response.status_code))
+    return response
+
+@movies_blueprint.before_request
+def start_request_trace():
+    """
+    Abre el span raíz de la petición si se traza (traceparent muestreado o TRACING_SAMPLE_RATE).
+    """
+    context = tracer.start_trace(
+        f"{request.method} {request.endpoint}", request.headers.get('traceparent'), method=request.method, path=request.path
+    )
+    span = context.__enter__()
+    if span is not None:
+        g.trace_context = context
+
+@movies_blueprint.after_request
+def add_trace_headers(response):
+    """
+    Devuelve en la cabecera traceparent la traza de la petición para poder buscarla.
+    """
+    context = g.get('trace_context')
+    if context is not None:
+        context.span.set_attribute('status_code', response.status_code)
+        response.headers['traceparent'] = context.span.traceparent
+    return response
+
+@movies_blueprint.teardown_request
+def end_request_trace(error=None):
+    """
+    Cierra el span raíz de la petición.
+    """
+    context = g.pop('trace_context', None)
+    if context is not None:
+        context.__exit__(type(error) if error else None, error, None)
+
+@movies_blueprint.teardown_request
+def end_request_deadline(error=None):
+    """
+    Restaura el plazo anterior al terminar la petición.
+    """
+    token = g.pop('deadline_token', None)
+    if token is not None:
+        reset_deadline(token)
+
 @movies_blueprint.route('/populars', methods=['GET'])
 def get_popular_movies():
     """
-    Obtener películas populares.
+    Obtener películas populares. Admite ?fields=id,title,... para limitar los campos.
     
     Returns:
         JSON: Lista de películas populares.
     """
-    return jsonify(movie_service.get_popular_movies())
+    fields, error = _requested_fields()
+    if error:
+        return error
+    return _json_result(movie_service.get_popular_movies(raw=True, fields=fields), public=True)
 
 @movies_blueprint.route('/get_favorite_movies', methods=['GET'], endpoint='get_favorite_movies')
 @token_required
 def get_favorite_movies(user):
     """
-    Obtener películas favoritas del usuario autenticado.
+    Obtener películas favoritas del usuario autenticado. Admite ?fields=id,title,...
     
     Args:
         user: Usuario autenticado.
@@ -38,7 +277,10 @@ def get_favorite_movies(user):
     Returns:
         JSON: Lista de películas favoritas.
     """
-    return jsonify(movie_service.get_favorite_movies())
+    fields, error = _requested_fields()
+    if error:
+        return error
+    return _json_result(movie_service.get_favorite_movies(raw=True, fields=fields))
 
 @movies_blueprint.route('/add_favorite/<int:media_id>', methods=['POST'], endpoint='add_favorite')
 @token_required
@@ -86,11 +328,54 @@ def rate_movie(user, movie_id, rating):
     """
     return jsonify(movie_service.rate_movie(movie_id, rating))
 
+@movies_blueprint.route('/add_favorites', methods=['POST'], endpoint='add_favorites')
+@token_required
+def add_favorite_movies_batch(user):
+    """
+    Agregar varias películas a favoritos. El cuerpo es una lista JSON de IDs.
+    
+    Args:
+        user: Usuario autenticado.
+    
+    Returns:
+        JSON: Estado de la operación por película.
+    """
+    return _json_result(movie_service.add_favorite_movies_batch(request.get_json(silent=True)))
+
+@movies_blueprint.route('/delete_favorites', methods=['DELETE'], endpoint='delete_favorites')
+@token_required
+def delete_favorite_movies_batch(user):
+    """
+    Eliminar varias películas de favoritos. El cuerpo es una lista JSON de IDs.
+    
+    Args:
+        user: Usuario autenticado.
+    
+    Returns:
+        JSON: Estado de la operación por película.
+    """
+    return _json_result(movie_service.delete_favorite_movies_batch(request.get_json(silent=True)))
+
+@movies_blueprint.route('/rate_movies', methods=['POST'], endpoint='rate_movies')
+@token_required
+def rate_movies_batch(user):
+    """
+    Calificar varias películas. El cuerpo es una lista JSON de pares [movie_id, rating]
+    u objetos {"movie_id": ..., "rating": ...}.
+    
+    Args:
+        user: Usuario autenticado.
+    
+    Returns:
+        JSON: Estado de la operación por película.
+    """
+    return _json_result(movie_service.rate_movies_batch(request.get_json(silent=True)))
+
 @movies_blueprint.route('/get_rated_movies', methods=['GET'], endpoint='get_rated_movies')
 @token_required
 def get_rated_movies(user):
     """
-    Obtener películas calificadas del usuario.
+    Obtener películas calificadas del usuario. Admite ?fields=id,title,...
     
     Args:
         user: Usuario autenticado.
@@ -98,27 +383,44 @@ def get_rated_movies(user):
     Returns:
         JSON: Lista de películas calificadas.
     """
-    return jsonify(movie_service.get_rated_movies())
+    fields, error = _requested_fields()
+    if error:
+        return error
+    return _json_result(movie_service.get_rated_movies(raw=True, fields=fields))
 
 @movies_blueprint.route('/get_favorite_movies_by_release_date', methods=['GET'], endpoint='get_favorite_movies_by_release_date')
 @token_required
 def get_favorite_movies_by_release_date(user):
     """
-    Obtener películas favoritas ordenadas por fecha de lanzamiento.
+    Obtener películas favoritas ordenadas por fecha de lanzamiento. Admite ?fields=id,title,...
+    y se pagina con ?limit= y ?cursor= (el cursor lo devuelve la página anterior).
     
     Args:
         user: Usuario autenticado.
     
     Returns:
-        JSON: Lista de películas favoritas ordenada.
+        JSON: Página de películas favoritas ordenada y cursor de la siguiente.
     """
-    return jsonify(movie_service.get_favorite_movies_by_release_date())
+    fields, error = _requested_fields()
+    if error:
+        return error
+    limit = request.args.get('limit', str(app_settings.RELEASE_DATE_PAGE_SIZE))
+    limit = int(limit) if limit.isdigit() else 0
+    if not 1 <= limit <= app_settings.RELEASE_DATE_MAX_PAGE_SIZE:
+        return jsonify({'message': f'El límite debe estar entre 1 y {app_settings.RELEASE_DATE_MAX_PAGE_SIZE}'}), 400
+    return _json_result(movie_service.get_favorite_movies_by_release_date(
+        fields=fields,
+        cursor=request.args.get('cursor'),
+        limit=limit
+    ))
 
 @movies_blueprint.route('/rated_movies_from_favorites', methods=['GET'], endpoint='rated_movies_from_favorites')
 @token_required
 def rated_movies_from_favorites(user):
     """
-    Obtener películas calificadas y en favoritos.
+    Obtener películas calificadas y en favoritos. La vista se mantiene en caché, por lo que
+    normalmente se sirve con una única lectura; si falta, se calcula descargando a la vez
+    las listas de calificadas y favoritas.
     
     Args:
         user: Usuario autenticado.
@@ -126,19 +428,115 @@ def rated_movies_from_favorites(user):
     Returns:
         JSON: Lista de películas calificadas en favoritos.
     """
-    return jsonify(movie_service.get_rated_movies_from_favorites())
+    fields, error = _requested_fields()
+    if error:
+        return error
+    return _json_result(movie_service.get_rated_movies_from_favorites(raw=True, fields=fields))
 
 @movies_blueprint.route('/delete_favorite_movies', methods=['DELETE'])
 @token_required
 @permission_required('ADMIN')
 def delete_favorite_movies(user):
     """
-    Eliminar todas las películas de favoritos (requiere permisos de admin).
+    Eliminar todas las películas de favoritos (requiere permisos de admin). La operación
+    se ejecuta en segundo plano y su estado se consulta en /jobs/<job_id>.
     
     Args:
         user: Usuario autenticado con permisos de admin.
     
     Returns:
-        JSON: Respuesta de la operación.
+        JSON: Estado inicial del trabajo (202 Accepted).
+    """
+    job = movie_service.start_delete_all_favorite_movies()
+    return jsonify(job), 202, {'Location': url_for('movies.get_job', job_id=job['id'])}
+
+@movies_blueprint.route('/jobs/<job_id>', methods=['GET'], endpoint='get_job')
+@token_required
+@permission_required('ADMIN')
+def get_job(user, job_id):
+    """
+    Obtener el estado de un trabajo en segundo plano (requiere permisos de admin).
+    
+    Args:
+        user: Usuario autenticado con permisos de admin.
+        job_id (str): ID del trabajo.
+    
+    Returns:
+        JSON: Estado, progreso y resultado por película del trabajo.
+    """
+    job = movie_service.get_job(job_id)
+    if job is None:
+        return jsonify({'message': 'Job not found'}), 404
+    return jsonify(job)
+
+@movies_blueprint.route('/circuit_breakers', methods=['GET'], endpoint='circuit_breakers')
+@token_required
+def get_circuit_breakers(user):
+    """
+    Obtener el estado de los interruptores de circuito por endpoint de TMDB y del
+    presupuesto de reintentos.
+    
+    Args:
+        user: Usuario autenticado.
+    
+    Returns:
+        JSON: Estado de cada interruptor y contadores del presupuesto de reintentos.
+    """
+    return jsonify({
+        'circuit_breakers': circuit_breakers.snapshot(),
+        'retry_budget': retry_budget.stats()
+    })
+
+@movies_blueprint.route('/cache_warmer', methods=['GET'], endpoint='cache_warmer')
+@token_required
+@permission_required('ADMIN')
+def get_cache_warmer_stats(user):
+    """
+    Obtener las métricas de refresco del precalentador de caché por clave (requiere permisos de admin).
+    
+    Args:
+        user: Usuario autenticado.
+    
+    Returns:
+        JSON: Refrescos, fallos y último refresco de cada clave.
+    """
+    return jsonify(cache_warmer.stats())
+
+@movies_blueprint.route('/metrics', methods=['GET'], endpoint='metrics')
+def get_metrics():
+    """
+    Exportar las métricas en el formato de texto de Prometheus: latencia por ruta, aciertos
+    de caché por familia, llamadas y reintentos hacia TMDB, tiempo de ida y vuelta de Redis
+    y el estado de los componentes. Con METRICS_MULTIPROC_DIR se agregan las de todos los
+    workers; si no, son las del proceso que atiende la petición.
+    
+    Returns:
+        Response: Métricas en texto plano.
+    """
+    text = multiprocess_metrics.render() if multiprocess_metrics else registry.render()
+    return Response(text, content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@movies_blueprint.route('/profile', methods=['GET'], endpoint='profile')
+@token_required
+@permission_required('ADMIN')
+def get_profile(user):
+    """
+    Perfilar el proceso por muestreo durante ?seconds=N segundos (requiere permisos de admin
+    y PROFILING_ENABLED). Con ?idle=1 se incluyen los hilos que están esperando.
+    
+    Args:
+        user: Usuario autenticado.
+    
+    Returns:
+        Response: Pilas colapsadas ('pila cuenta' por línea), listas para flamegraph.pl o speedscope.
     """
-    return jsonify(movie_service.delete_all_favorite_movies())
+    if not app_settings.PROFILING_ENABLED:
+        return jsonify({'message': 'Profiling is disabled'}), 404
+    seconds = request.args.get('seconds', '5')
+    if not seconds.isdigit() or not 1 <= int(seconds) <= app_settings.PROFILING_MAX_SECONDS:
+        return jsonify({'message': f"seconds must be between 1 and {app_settings.PROFILING_MAX_SECONDS}"}), 400
+    try:
+        samples = profiler.profile(int(seconds), include_idle=request.args.get('idle') == '1')
+    except ProfilerBusy as e:
+        return jsonify({'message': str(e)}), 409
+    return Response(collapse(samples), content_type='text/plain; charset=utf-8')
@@ -1,6 +1,104 @@
 class Movie:
+    """
+    Película con los campos que usa el servicio. Es un registro compacto (__slots__) que se
+    construye a partir de la respuesta de TMDB descartando el resto de campos.
+    """
+
+    __slots__ = ('id', 'title', 'release_date', 'rating')
+
+    # Campos que se conservan en caché y que pueden pedirse con ?fields=
+    FIELDS = __slots__
+
     def __init__(self, id, title, release_date, rating=None):
         self.id = id
         self.title = title
         self.release_date = release_date
         self.rating = rating
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Crea una película a partir de un elemento de un listado de TMDB o de la caché.
+
+        Args:
+            data (dict): Elemento del listado.
+
+        Returns:
+            Movie: Película con los campos conocidos.
+        """
+        return cls(data.get('id'), data.get('title'), data.get('release_date'), data.get('rating'))
+
+    def to_dict(self, fields=None):
+        """
+        Convierte la película en diccionario. Sin 'fields' se omiten los campos vacíos para
+        mantener la respuesta compacta.
+
+        Args:
+            fields (tuple, opcional): Campos a incluir.
+
+        Returns:
+            dict: Representación de la película.
+        """
+        if fields is None:
+            return {field: getattr(self, field) for field in self.FIELDS if getattr(self, field) is not None}
+        return {field: getattr(self, field) for field in fields}
+
+    def __eq__(self, other):
+        if not isinstance(other, Movie):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.FIELDS)
+
+    def __repr__(self):
+        return f"Movie(id={self.id!r}, title={self.title!r}, release_date={self.release_date!r}, rating={self.rating!r})"
+
+
+def parse_fields(value):
+    """
+    Interpreta el parámetro ?fields= de los endpoints de listados.
+
+    Args:
+        value (str): Campos separados por comas, o None.
+
+    Returns:
+        tuple: Campos pedidos, o None si no se indicó ninguno.
+
+    Raises:
+        ValueError: Si se pide un campo desconocido.
+    """
+    if not value:
+        return None
+    fields = tuple(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+    unknown = [field for field in fields if field not in Movie.FIELDS]
+    if unknown:
+        raise ValueError(f"Campos desconocidos: {', '.join(unknown)}. Disponibles: {', '.join(Movie.FIELDS)}")
+    return fields or None
+
+
+def project_movie(data, fields=None):
+    """
+    Conserva de un elemento de un listado solo los campos de Movie presentes en él.
+
+    Args:
+        data (dict): Elemento del listado.
+        fields (tuple, opcional): Campos a conservar. Por defecto, todos los de Movie.
+
+    Returns:
+        dict: Elemento proyectado.
+    """
+    return {field: data[field] for field in (fields or Movie.FIELDS) if field in data}
+
+
+def project_listing(response, fields=None):
+    """
+    Proyecta todos los elementos de una respuesta de listado conservando su paginación.
+
+    Args:
+        response (dict): Respuesta de listado con 'results'.
+        fields (tuple, opcional): Campos a conservar en cada elemento.
+
+    Returns:
+        dict: Nueva respuesta con los elementos proyectados.
+    """
+    projected = dict(response)
+    projected['results'] = [project_movie(movie, fields) for movie in response.get('results', [])]
+    return projected
@@ -0,0 +1,106 @@
+import base64
+import json
+from bisect import bisect_left
+from domain.movie import Movie
+
+
+def _sort_key(movie):
+    """
+    Clave comparable de una película para ordenar por fecha de lanzamiento. Las fechas
+    ISO (AAAA-MM-DD) se comparan como texto, sin convertirlas; las películas sin fecha
+    quedan al final del orden descendente y el ID desempata.
+
+    Args:
+        movie (Movie): Película.
+
+    Returns:
+        tuple: (tiene fecha, fecha, id).
+    """
+    release_date = movie.release_date or ''
+    return (1 if release_date else 0, release_date, movie.id or 0)
+
+
+class InvalidCursor(ValueError):
+    """
+    El cursor recibido del cliente no es válido.
+    """
+
+
+def encode_cursor(key):
+    """
+    Args:
+        key (tuple): Clave de la última película devuelta.
+
+    Returns:
+        str: Cursor opaco para pedir la página siguiente.
+    """
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Args:
+        cursor (str): Cursor recibido del cliente.
+
+    Returns:
+        tuple: Clave de la última película de la página anterior.
+
+    Raises:
+        InvalidCursor: Si el cursor no es válido.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        has_date, release_date, movie_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (int(has_date), str(release_date), int(movie_id))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Cursor inválido") from e
+
+
+class ReleaseDateIndex:
+    """
+    Vista de las películas ordenadas por fecha de lanzamiento (más recientes primero), con
+    paginación por cursor. Se construye una vez por versión de la lista y cada página cuesta
+    O(log n + tamaño de página).
+    """
+
+    __slots__ = ('_items', '_keys')
+
+    def __init__(self, movies):
+        """
+        Args:
+            movies (list): Elementos del listado de favoritas (dict) o películas (Movie).
+        """
+        keyed = []
+        for movie in movies:
+            if isinstance(movie, Movie):
+                keyed.append((_sort_key(movie), movie.to_dict()))
+            else:
+                keyed.append((_sort_key(Movie.from_dict(movie)), movie))
+        # Se guarda en orden ascendente para poder buscar el cursor con bisect. Se conservan
+        # los elementos originales para proyectarlos igual que el resto de listados.
+        keyed.sort(key=lambda pair: pair[0])
+        self._keys = [key for key, _ in keyed]
+        self._items = [item for _, item in keyed]
+
+    def __len__(self):
+        return len(self._items)
+
+    def page(self, cursor=None, limit=20):
+        """
+        Obtiene una página del orden descendente por fecha de lanzamiento.
+
+        Args:
+            cursor (str, opcional): Cursor devuelto por la página anterior.
+            limit (int): Número máximo de películas de la página.
+
+        Returns:
+            tuple: (elementos del listado, cursor de la página siguiente o None).
+
+        Raises:
+            InvalidCursor: Si el cursor no es válido.
+        """
+        end = len(self._items) if cursor is None else bisect_left(self._keys, decode_cursor(cursor))
+        start = max(end - limit, 0)
+        movies = self._items[start:end][::-1]
+        next_cursor = encode_cursor(self._keys[start]) if start > 0 and movies else None
+        return movies, next_cursor
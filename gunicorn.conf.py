@@ -0,0 +1,112 @@
+import gc
+import math
+import os
+import settings
+
+# Cargar la configuración seleccionada con APP_CONFIG ('config' es un ajuste de gunicorn y
+# no puede usarse como nombre en este archivo)
+app_config = settings.get_config()
+
+
+def _cgroup_cpu_limit():
+    """
+    Lee el límite de CPU del contenedor (cgroup v2 o v1).
+
+    Returns:
+        float: CPUs permitidas por la cuota, o None si no hay límite.
+    """
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as file:
+            quota, period = file.read().split()[:2]
+        return None if quota == 'max' else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as quota_file, \
+                open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as period_file:
+            quota, period = int(quota_file.read()), int(period_file.read())
+        return None if quota <= 0 else quota / period
+    except (OSError, ValueError):
+        return None
+
+
+def available_cpus():
+    """
+    CPUs que puede usar el proceso: las asignadas por afinidad, acotadas por la cuota del
+    contenedor (os.cpu_count() devuelve las del host).
+
+    Returns:
+        int: Número de CPUs, al menos 1.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+    return max(cpus, 1)
+
+
+def worker_count(settings, cpus=None):
+    """
+    Args:
+        settings (Config): Configuración con SERVER_WORKERS y SERVER_WORKERS_PER_CPU.
+        cpus (int, opcional): CPUs disponibles; por defecto available_cpus().
+
+    Returns:
+        int: SERVER_WORKERS si es mayor que 0; si no, SERVER_WORKERS_PER_CPU por CPU.
+    """
+    if settings.SERVER_WORKERS > 0:
+        return settings.SERVER_WORKERS
+    return max(int((cpus or available_cpus()) * settings.SERVER_WORKERS_PER_CPU), 1)
+
+
+# La aplicación se importa una vez en el proceso maestro (servicios, usuarios, blueprint,
+# registros de métricas) y los workers la heredan con el fork.
+wsgi_app = 'app:create_app(start_background=False)'
+preload_app = True
+
+bind = app_config.SERVER_BIND
+workers = worker_count(app_config)
+# Hilos por worker: las vistas pasan casi todo el tiempo esperando a Redis y a TMDB.
+worker_class = 'gthread'
+threads = app_config.SERVER_THREADS
+timeout = app_config.SERVER_TIMEOUT
+# Al recibir SIGTERM los workers dejan de aceptar conexiones y terminan las peticiones en
+# curso durante graceful_timeout segundos antes de ser detenidos.
+graceful_timeout = app_config.SERVER_GRACEFUL_TIMEOUT
+keepalive = app_config.SERVER_KEEPALIVE
+max_requests = app_config.SERVER_MAX_REQUESTS
+max_requests_jitter = max_requests // 10
+accesslog = '-'
+errorlog = '-'
+
+
+def on_starting(server):
+    # Las métricas de una ejecución anterior no deben sumarse a las nuevas
+    from adapters.metrics import create_multiprocess_metrics
+    multiprocess_metrics = create_multiprocess_metrics(app_config)
+    if multiprocess_metrics is not None:
+        multiprocess_metrics.clear()
+    elif workers > 1:
+        server.log.warning(
+            "METRICS_MULTIPROC_DIR está vacío: /metrics solo muestra las métricas del worker que atiende cada petición"
+        )
+
+
+def pre_fork(server, worker):
+    # Los objetos precargados pasan a una generación permanente: el recolector deja de
+    # recorrerlos y de escribir en sus cabeceras, por lo que sus páginas de memoria siguen
+    # compartidas entre el maestro y los workers (copy-on-write).
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from app import start_background_tasks
+    start_background_tasks(app_config)
+
+
+def worker_exit(server, worker):
+    from app import stop_background_tasks
+    stop_background_tasks()
@@ -0,0 +1,353 @@
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from adapters.rate_limiter import TokenBucket
+
+# Películas por página, como en TMDB
+PAGE_SIZE = 20
+
+_ROUTES = [
+    ('GET', re.compile(r'^/3/movie/popular$'), 'popular'),
+    ('GET', re.compile(r'^/3/account/(?P<account_id>\d+)/favorite/movies$'), 'favorite_movies'),
+    ('GET', re.compile(r'^/3/account/(?P<account_id>\d+)/rated/movies$'), 'rated_movies'),
+    ('POST', re.compile(r'^/3/account/(?P<account_id>\d+)/favorite$'), 'set_favorite'),
+    ('POST', re.compile(r'^/3/movie/(?P<movie_id>\d+)/rating$'), 'rate_movie'),
+    ('DELETE', re.compile(r'^/3/movie/(?P<movie_id>\d+)/rating$'), 'delete_rating'),
+]
+
+
+def parse_latency(spec):
+    """
+    Interpreta una distribución de latencia en milisegundos:
+
+    - 'fixed:50'
+    - 'uniform:20,80'
+    - 'normal:50,10' (media y desviación, truncada en 0)
+    - 'lognormal:50,0.5' (mediana y sigma, con cola larga)
+    - 'exponential:50' (media)
+
+    Args:
+        spec (str): Distribución; vacía o '0' para no añadir latencia.
+
+    Returns:
+        callable: Devuelve una latencia en segundos en cada llamada.
+
+    Raises:
+        ValueError: Si la distribución no es válida.
+    """
+    if not spec or spec == '0':
+        return lambda: 0.0
+    kind, _, args = spec.partition(':')
+    try:
+        values = [float(value) for value in args.split(',')]
+        # Todo está en milisegundos salvo la sigma de 'lognormal'.
+        values = [value / 1000 if i == 0 or kind != 'lognormal' else value for i, value in enumerate(values)]
+        if kind == 'fixed':
+            return lambda: values[0]
+        if kind == 'uniform':
+            return lambda: random.uniform(values[0], values[1])
+        if kind == 'normal':
+            return lambda: max(random.gauss(values[0], values[1]), 0.0)
+        if kind == 'lognormal':
+            return lambda: random.lognormvariate(math.log(values[0]), values[1])
+        if kind == 'exponential':
+            return lambda: random.expovariate(1 / values[0])
+    except (IndexError, ValueError, ZeroDivisionError):
+        pass
+    raise ValueError(f"Distribución de latencia inválida: {spec}")
+
+
+class FakeTMDBState:
+    """
+    Catálogo de películas y listas de la cuenta (favoritas y calificadas) del servidor falso.
+    """
+
+    def __init__(self, movies=500, favorites=100, rated=100, seed=0):
+        """
+        Args:
+            movies (int): Películas del catálogo (también el listado de populares).
+            favorites (int): Películas favoritas iniciales.
+            rated (int): Películas calificadas iniciales.
+            seed (int): Semilla para que los datos sean reproducibles.
+        """
+        rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.movies = {}
+        for movie_id in range(1, movies + 1):
+            self.movies[movie_id] = {
+                'id': movie_id,
+                'title': f"Movie {movie_id}",
+                'release_date': f"{rng.randint(1950, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                'overview': "Lorem ipsum dolor sit amet",
+                'popularity': round(rng.random() * 100, 3),
+                'vote_average': round(rng.random() * 10, 1),
+            }
+        ids = list(self.movies)
+        self.favorites = dict.fromkeys(rng.sample(ids, min(favorites, len(ids))))
+        self.ratings = {movie_id: rng.randint(1, 20) / 2 for movie_id in rng.sample(ids, min(rated, len(ids)))}
+
+    def page(self, name, page):
+        """
+        Args:
+            name (str): 'popular', 'favorite_movies' o 'rated_movies'.
+            page (int): Número de página (desde 1).
+
+        Returns:
+            dict: Página con el formato de TMDB.
+        """
+        with self._lock:
+            if name == 'popular':
+                movies = list(self.movies.values())
+            elif name == 'favorite_movies':
+                movies = [self.movies[movie_id] for movie_id in self.favorites]
+            else:
+                movies = [dict(self.movies[movie_id], rating=rating) for movie_id, rating in self.ratings.items()]
+        total_pages = max(math.ceil(len(movies) / PAGE_SIZE), 1)
+        start = (page - 1) * PAGE_SIZE
+        return {
+            'page': page,
+            'results': movies[start:start + PAGE_SIZE],
+            'total_pages': total_pages,
+            'total_results': len(movies),
+        }
+
+    def set_favorite(self, movie_id, favorite):
+        """
+        Returns:
+            bool: False si la película no existe.
+        """
+        with self._lock:
+            if movie_id not in self.movies:
+                return False
+            if favorite:
+                self.favorites[movie_id] = None
+            else:
+                self.favorites.pop(movie_id, None)
+            return True
+
+    def rate(self, movie_id, value):
+        """
+        Args:
+            movie_id (int): ID de la película.
+            value (float): Calificación, o None para eliminarla.
+
+        Returns:
+            bool: False si la película no existe.
+        """
+        with self._lock:
+            if movie_id not in self.movies:
+                return False
+            if value is None:
+                self.ratings.pop(movie_id, None)
+            else:
+                self.ratings[movie_id] = value
+            return True
+
+
+class FaultInjector:
+    """
+    Decide la latencia y los fallos de cada respuesta del servidor falso.
+    """
+
+    def __init__(self, latency='0', error_rate=0.0, throttle_rate=0.0, retry_after=1, max_rps=None,
+                 slow_body_rate=0.0, slow_body_delay=1.0):
+        """
+        Args:
+            latency (str): Distribución de latencia (ver parse_latency).
+            error_rate (float): Probabilidad de responder 500/502/503.
+            throttle_rate (float): Probabilidad de responder 429 aunque no se supere max_rps.
+            retry_after (int): Segundos de la cabecera Retry-After de las respuestas 429.
+            max_rps (float, opcional): Peticiones por segundo admitidas; el resto recibe 429.
+            slow_body_rate (float): Probabilidad de enviar el cuerpo lentamente.
+            slow_body_delay (float): Segundos que tarda en enviarse un cuerpo lento.
+        """
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.bucket = TokenBucket(max_rps) if max_rps else None
+        self.slow_body_rate = slow_body_rate
+        self.slow_body_delay = slow_body_delay
+
+
+class FakeTMDBServer(ThreadingHTTPServer):
+    """
+    Servidor HTTP/1.1 con conexiones persistentes que imita los endpoints de TMDB que usa
+    MovieAPIAdapter, con latencia y fallos configurables.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, state=None, faults=None):
+        """
+        Args:
+            address (tuple): (host, puerto); puerto 0 para elegir uno libre.
+            state (FakeTMDBState, opcional): Datos servidos.
+            faults (FaultInjector, opcional): Latencia y fallos inyectados.
+        """
+        super().__init__(address, FakeTMDBHandler)
+        self.state = state or FakeTMDBState()
+        self.faults = faults or FaultInjector()
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        """
+        Returns:
+            str: URL base para TMDB_BASE_URL.
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/3"
+
+    def record(self, route, status):
+        with self._stats_lock:
+            self.stats[f"{route} {status}"] += 1
+
+
+class FakeTMDBHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Cabeceras y cuerpo se escriben por separado; sin esto Nagle añade ~40 ms por respuesta.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if url.path == '/__stats' and method == 'GET':
+            with self.server._stats_lock:
+                return self._send(200, dict(self.server.stats), route='stats')
+
+        for route_method, pattern, route in _ROUTES:
+            match = pattern.match(url.path)
+            if match and route_method == method:
+                break
+        else:
+            return self._send(404, {'success': False, 'status_code': 34, 'status_message': 'The resource you requested could not be found.'}, route='unknown')
+
+        faults = self.server.faults
+        time.sleep(faults.latency())
+        if (faults.bucket is not None and not faults.bucket.try_acquire()) or random.random() < faults.throttle_rate:
+            return self._send(429, {'status_code': 25, 'status_message': 'Your request count is over the allowed limit.'},
+                              route=route, headers={'Retry-After': str(faults.retry_after)})
+        if random.random() < faults.error_rate:
+            return self._send(random.choice((500, 502, 503)), {'status_code': 11, 'status_message': 'Internal error.'}, route=route)
+
+        handler = getattr(self, f"_handle_{route}")
+        status, payload = handler(parse_qs(url.query), match.groupdict(), body)
+        self._send(status, payload, route=route, slow=random.random() < faults.slow_body_rate)
+
+    def _handle_listing(self, name, query):
+        try:
+            page = max(int(query.get('page', ['1'])[0]), 1)
+        except ValueError:
+            return 400, {'status_code': 22, 'status_message': 'Invalid page.'}
+        return 200, self.server.state.page(name, page)
+
+    def _handle_popular(self, query, params, body):
+        return self._handle_listing('popular', query)
+
+    def _handle_favorite_movies(self, query, params, body):
+        return self._handle_listing('favorite_movies', query)
+
+    def _handle_rated_movies(self, query, params, body):
+        return self._handle_listing('rated_movies', query)
+
+    def _handle_set_favorite(self, query, params, body):
+        try:
+            payload = json.loads(body or b'{}')
+            movie_id = int(payload['media_id'])
+        except (ValueError, KeyError, TypeError):
+            return 400, {'status_code': 5, 'status_message': 'Invalid parameters.'}
+        if not self.server.state.set_favorite(movie_id, bool(payload.get('favorite'))):
+            return 404, {'status_code': 34, 'status_message': 'The resource you requested could not be found.'}
+        return (201, {'success': True, 'status_code': 1, 'status_message': 'Success.'}) if payload.get('favorite') else \
+            (200, {'success': True, 'status_code': 13, 'status_message': 'The item/record was deleted successfully.'})
+
+    def _handle_rate_movie(self, query, params, body):
+        try:
+            value = float(json.loads(body or b'{}')['value'])
+        except (ValueError, KeyError, TypeError):
+            return 400, {'status_code': 5, 'status_message': 'Invalid parameters.'}
+        if not self.server.state.rate(int(params['movie_id']), value):
+            return 404, {'status_code': 34, 'status_message': 'The resource you requested could not be found.'}
+        return 201, {'success': True, 'status_code': 1, 'status_message': 'Success.'}
+
+    def _handle_delete_rating(self, query, params, body):
+        if not self.server.state.rate(int(params['movie_id']), None):
+            return 404, {'status_code': 34, 'status_message': 'The resource you requested could not be found.'}
+        return 200, {'success': True, 'status_code': 13, 'status_message': 'The item/record was deleted successfully.'}
+
+    def _send(self, status, payload, route, headers=None, slow=False):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json;charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if slow:
+            # Cuerpo enviado en trozos durante slow_body_delay segundos.
+            chunks = [data[i:i + 256] for i in range(0, len(data), 256)] or [data]
+            pause = self.server.faults.slow_body_delay / len(chunks)
+            for chunk in chunks:
+                self.wfile.write(chunk)
+                self.wfile.flush()
+                time.sleep(pause)
+        else:
+            self.wfile.write(data)
+        self.server.record(route, status)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor falso de TMDB para pruebas de carga.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--movies', type=int, default=500, help="Películas del catálogo.")
+    parser.add_argument('--favorites', type=int, default=100, help="Favoritas iniciales.")
+    parser.add_argument('--rated', type=int, default=100, help="Calificadas iniciales.")
+    parser.add_argument('--latency', default='0', help="Distribución de latencia en ms, p. ej. lognormal:50,0.5.")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Probabilidad de 500/502/503.")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="Probabilidad de 429.")
+    parser.add_argument('--retry-after', type=int, default=1, help="Segundos de Retry-After en los 429.")
+    parser.add_argument('--max-rps', type=float, default=None, help="Peticiones por segundo antes de responder 429.")
+    parser.add_argument('--slow-body-rate', type=float, default=0.0, help="Probabilidad de enviar el cuerpo lentamente.")
+    parser.add_argument('--slow-body-delay', type=float, default=1.0, help="Segundos que tarda un cuerpo lento.")
+    args = parser.parse_args(argv)
+
+    server = FakeTMDBServer(
+        (args.host, args.port),
+        FakeTMDBState(args.movies, args.favorites, args.rated),
+        FaultInjector(args.latency, args.error_rate, args.throttle_rate, args.retry_after, args.max_rps,
+                      args.slow_body_rate, args.slow_body_delay)
+    )
+    print(f"TMDB falso escuchando en {server.base_url} (TMDB_BASE_URL={server.base_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+import requests
+
+# Peticiones por defecto: (nombre, método, ruta, peso)
+DEFAULT_MIX = [
+    ('populars', 'GET', '/populars', 3),
+    ('get_favorite_movies', 'GET', '/get_favorite_movies', 4),
+    ('get_rated_movies', 'GET', '/get_rated_movies', 2),
+    ('favorites_by_release_date', 'GET', '/get_favorite_movies_by_release_date', 2),
+    ('rated_movies_from_favorites', 'GET', '/rated_movies_from_favorites', 2),
+    ('add_favorite', 'POST', '/add_favorite/{movie_id}', 1),
+    ('rate_movie', 'POST', '/rate_movie/{movie_id}/{rating}', 1),
+]
+
+
+def parse_mix(spec):
+    """
+    Filtra y repondera la mezcla por defecto con 'nombre=peso,nombre=peso'.
+
+    Args:
+        spec (str): Mezcla; vacía para usar DEFAULT_MIX.
+
+    Returns:
+        list: Peticiones (nombre, método, ruta, peso).
+
+    Raises:
+        ValueError: Si un nombre no existe o un peso no es válido.
+    """
+    if not spec:
+        return list(DEFAULT_MIX)
+    known = {name: (name, method, path) for name, method, path, _ in DEFAULT_MIX}
+    mix = []
+    for item in spec.split(','):
+        name, _, weight = item.partition('=')
+        if name not in known:
+            raise ValueError(f"Petición desconocida en la mezcla: {name}")
+        mix.append(known[name] + (float(weight or 1),))
+    return mix
+
+
+def percentile(values, fraction):
+    """
+    Args:
+        values (list): Valores ordenados de menor a mayor.
+        fraction (float): Percentil entre 0 y 1.
+
+    Returns:
+        float: Valor del percentil (por el método del rango más cercano), o 0 si no hay valores.
+    """
+    if not values:
+        return 0.0
+    index = max(math.ceil(fraction * len(values)) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+def summarize(samples, elapsed):
+    """
+    Resume las muestras por petición.
+
+    Args:
+        samples (list): Tuplas (nombre, código de estado, segundos); el código es 'error'
+            si la petición no obtuvo respuesta.
+        elapsed (float): Duración de la prueba en segundos.
+
+    Returns:
+        dict: Por petición y en total ('all'): peticiones, rendimiento (peticiones/s),
+            p50, p90, p99 y máximo en milisegundos, y peticiones por código de estado.
+    """
+    groups = defaultdict(list)
+    statuses = defaultdict(Counter)
+    for name, status, duration in samples:
+        for key in (name, 'all'):
+            groups[key].append(duration)
+            statuses[key][str(status)] += 1
+
+    summary = {}
+    for name, durations in groups.items():
+        durations.sort()
+        summary[name] = {
+            'requests': len(durations),
+            'throughput': len(durations) / elapsed if elapsed else 0.0,
+            'p50_ms': percentile(durations, 0.50) * 1000,
+            'p90_ms': percentile(durations, 0.90) * 1000,
+            'p99_ms': percentile(durations, 0.99) * 1000,
+            'max_ms': durations[-1] * 1000,
+            'statuses': dict(statuses[name]),
+        }
+    return summary
+
+
+def run(base_url, duration=30, concurrency=8, rps=None, mix=None, user_id='1', max_movie_id=500, timeout=30, seed=None):
+    """
+    Genera carga contra la aplicación con 'concurrency' hilos durante 'duration' segundos.
+
+    Sin 'rps' cada hilo envía la siguiente petición en cuanto recibe la respuesta (carga
+    cerrada). Con 'rps' las peticiones se programan a ritmo fijo y la latencia se mide desde
+    el momento programado, de modo que las esperas en cola cuentan (sin omisión coordinada).
+
+    Args:
+        base_url (str): URL de la aplicación, p. ej. http://127.0.0.1:5000.
+        duration (float): Segundos de prueba.
+        concurrency (int): Hilos (y conexiones) simultáneos.
+        rps (float, opcional): Peticiones por segundo totales.
+        mix (list, opcional): Peticiones (nombre, método, ruta, peso); por defecto DEFAULT_MIX.
+        user_id (str): Valor del encabezado Authorization.
+        max_movie_id (int): Mayor ID de película usado en las escrituras.
+        timeout (float): Segundos máximos por petición.
+        seed (int, opcional): Semilla para reproducir la secuencia de peticiones.
+
+    Returns:
+        dict: Resumen de summarize() más la duración real ('elapsed') de la prueba.
+    """
+    mix = mix or DEFAULT_MIX
+    base_url = base_url.rstrip('/')
+    weights = [weight for *_, weight in mix]
+    samples = []
+    samples_lock = threading.Lock()
+    started = time.perf_counter()
+    deadline = started + duration
+    interval = concurrency / rps if rps else None
+
+    def worker(index):
+        rng = random.Random(None if seed is None else seed + index)
+        session = requests.Session()
+        session.headers['Authorization'] = str(user_id)
+        local = []
+        # Desfase inicial para repartir las peticiones programadas entre los hilos
+        scheduled = started + (interval * index / concurrency if interval else 0)
+        while True:
+            if interval:
+                now = time.perf_counter()
+                if scheduled > now:
+                    time.sleep(scheduled - now)
+                start = scheduled
+                scheduled += interval
+            else:
+                start = time.perf_counter()
+            if start >= deadline:
+                break
+            name, method, path, _ = rng.choices(mix, weights)[0]
+            url = base_url + path.format(movie_id=rng.randint(1, max_movie_id), rating=rng.randint(1, 10))
+            try:
+                status = session.request(method, url, timeout=timeout).status_code
+            except requests.RequestException:
+                status = 'error'
+            local.append((name, status, time.perf_counter() - start))
+        session.close()
+        with samples_lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(index,), daemon=True) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.perf_counter() - started
+    summary = summarize(samples, elapsed)
+    summary['elapsed'] = elapsed
+    return summary
+
+
+def format_summary(summary):
+    """
+    Args:
+        summary (dict): Resultado de run().
+
+    Returns:
+        str: Tabla con una fila por petición y el total al final.
+    """
+    names = sorted(name for name in summary if name not in ('all', 'elapsed'))
+    lines = [f"{'petición':<30} {'n':>7} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'máx ms':>8}  estados"]
+    for name in names + (['all'] if 'all' in summary else []):
+        row = summary[name]
+        statuses = ' '.join(f"{status}:{count}" for status, count in sorted(row['statuses'].items()))
+        lines.append(
+            f"{name:<30} {row['requests']:>7} {row['throughput']:>8.1f} {row['p50_ms']:>8.1f} "
+            f"{row['p90_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}  {statuses}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generador de carga para la aplicación.")
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help="URL de la aplicación.")
+    parser.add_argument('--duration', type=float, default=30, help="Segundos de prueba.")
+    parser.add_argument('--concurrency', type=int, default=8, help="Hilos simultáneos.")
+    parser.add_argument('--rps', type=float, default=None, help="Peticiones por segundo (carga abierta).")
+    parser.add_argument('--mix', default='', help="Mezcla 'nombre=peso,...' de " + ', '.join(name for name, *_ in DEFAULT_MIX) + '.')
+    parser.add_argument('--user', default='1', help="ID de usuario del encabezado Authorization.")
+    parser.add_argument('--max-movie-id', type=int, default=500, help="Mayor ID de película en las escrituras.")
+    parser.add_argument('--timeout', type=float, default=30, help="Segundos máximos por petición.")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--json', dest='output', default=None, help="Guarda el resumen en un fichero JSON.")
+    args = parser.parse_args(argv)
+
+    summary = run(
+        args.url, duration=args.duration, concurrency=args.concurrency, rps=args.rps, mix=parse_mix(args.mix),
+        user_id=args.user, max_movie_id=args.max_movie_id, timeout=args.timeout, seed=args.seed
+    )
+    print(format_summary(summary))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(summary, file, indent=2, sort_keys=True)
+            file.write('\n')
+
+
+if __name__ == '__main__':
+    main()
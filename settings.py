@@ -1,11 +1,122 @@
 from decouple import config
 
 class Config:
+    # Configuración que usan la aplicación y el servidor ('development' o 'production')
+    APP_CONFIG = config('APP_CONFIG', default='development')
+
     # Configuración de TheMovieDB
     THEMOVIEDB_API_KEY = config('THEMOVIEDB_API_KEY')
     ACCOUNT_ID = config('ACCOUNT_ID')
     ACCESS_TOKEN = config('THEMOVIEDB_ACCESS_TOKEN')
-    CACHE_DURATION = config('CACHE_DURATION', default=30)
+    # URL base de la API; se puede apuntar al servidor falso de loadtest/fake_tmdb.py
+    TMDB_BASE_URL = config('TMDB_BASE_URL', default='https://api.themoviedb.org/3')
+    CACHE_DURATION = config('CACHE_DURATION', default=300, cast=int)
+    CACHE_STALE_DURATION = config('CACHE_STALE_DURATION', default=600, cast=int)
+    CACHE_REFRESH_WORKERS = config('CACHE_REFRESH_WORKERS', default=2, cast=int)
+    L1_CACHE_MAXSIZE = config('L1_CACHE_MAXSIZE', default=1024, cast=int)
+    COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)
+    SINGLE_FLIGHT_LOCK_TIMEOUT = config('SINGLE_FLIGHT_LOCK_TIMEOUT', default=10, cast=float)
+    SINGLE_FLIGHT_POLL_INTERVAL = config('SINGLE_FLIGHT_POLL_INTERVAL', default=0.05, cast=float)
+
+    # Precalentador de caché: refresca los listados antes de que dejen de estar frescos
+    CACHE_WARMER_ENABLED = config('CACHE_WARMER_ENABLED', default=False, cast=bool)
+    CACHE_WARMER_INTERVAL = config('CACHE_WARMER_INTERVAL', default=5, cast=float)
+    CACHE_WARMER_LEAD_TIME = config('CACHE_WARMER_LEAD_TIME', default=30, cast=float)
+    CACHE_WARMER_JITTER = config('CACHE_WARMER_JITTER', default=10, cast=float)
+    CACHE_WARMER_MAX_WORKERS = config('CACHE_WARMER_MAX_WORKERS', default=2, cast=int)
+
+    # Almacén de usuarios ('memory', 'sqlite' o 'redis') y caché de usuarios resueltos
+    USER_STORE = config('USER_STORE', default='memory')
+    USER_STORE_PATH = config('USER_STORE_PATH', default='users.db')
+    USER_STORE_SEED = config('USER_STORE_SEED', default=True, cast=bool)
+    USER_CACHE_TTL = config('USER_CACHE_TTL', default=60, cast=float)
+    USER_CACHE_MAXSIZE = config('USER_CACHE_MAXSIZE', default=10000, cast=int)
+
+    # Límite de peticiones entrantes por usuario y por usuario y ruta ('peticiones/segundos')
+    RATE_LIMIT_ENABLED = config('RATE_LIMIT_ENABLED', default=True, cast=bool)
+    RATE_LIMIT_USER = config('RATE_LIMIT_USER', default='120/60')
+    RATE_LIMIT_USER_ROUTE = config('RATE_LIMIT_USER_ROUTE', default='60/60')
+    RATE_LIMIT_ADMIN = config('RATE_LIMIT_ADMIN', default='1200/60')
+    RATE_LIMIT_ADMIN_ROUTE = config('RATE_LIMIT_ADMIN_ROUTE', default='600/60')
+
+    # Cliente de Redis compartido por toda la aplicación
+    REDIS_HOST = config('REDIS_HOST', default='localhost')
+    REDIS_PORT = config('REDIS_PORT', default=6379, cast=int)
+    REDIS_DB = config('REDIS_DB', default=0, cast=int)
+    REDIS_PASSWORD = config('REDIS_PASSWORD', default=None)
+    REDIS_MAX_CONNECTIONS = config('REDIS_MAX_CONNECTIONS', default=50, cast=int)
+    REDIS_POOL_TIMEOUT = config('REDIS_POOL_TIMEOUT', default=1, cast=float)
+    REDIS_SOCKET_TIMEOUT = config('REDIS_SOCKET_TIMEOUT', default=1, cast=float)
+    REDIS_CONNECT_TIMEOUT = config('REDIS_CONNECT_TIMEOUT', default=0.5, cast=float)
+    REDIS_HEALTH_CHECK_INTERVAL = config('REDIS_HEALTH_CHECK_INTERVAL', default=30, cast=int)
+
+    # Configuración del pool de conexiones HTTP hacia TheMovieDB
+    HTTP_POOL_CONNECTIONS = config('HTTP_POOL_CONNECTIONS', default=10, cast=int)
+    HTTP_POOL_MAXSIZE = config('HTTP_POOL_MAXSIZE', default=20, cast=int)
+    HTTP_POOL_BLOCK = config('HTTP_POOL_BLOCK', default=False, cast=bool)
+    HTTP_CONNECT_TIMEOUT = config('HTTP_CONNECT_TIMEOUT', default=3.05, cast=float)
+    HTTP_READ_TIMEOUT = config('HTTP_READ_TIMEOUT', default=10, cast=float)
+    HTTP_KEEP_ALIVE = config('HTTP_KEEP_ALIVE', default=True, cast=bool)
+
+    # Limitadores de salida hacia TheMovieDB compartidos en Redis (llamadas por segundo)
+    OUTBOUND_READ_RATE = config('OUTBOUND_READ_RATE', default=30, cast=float)
+    OUTBOUND_READ_BURST = config('OUTBOUND_READ_BURST', default=30, cast=float)
+    OUTBOUND_WRITE_RATE = config('OUTBOUND_WRITE_RATE', default=10, cast=float)
+    OUTBOUND_WRITE_BURST = config('OUTBOUND_WRITE_BURST', default=10, cast=float)
+
+    # Descarga paralela de listados paginados (favoritas y calificadas)
+    PAGINATION_MAX_WORKERS = config('PAGINATION_MAX_WORKERS', default=4, cast=int)
+    PAGINATION_MAX_PAGES = config('PAGINATION_MAX_PAGES', default=500, cast=int)
+
+    # Capa de resiliencia: plazo por petición, reintentos con jitter, presupuesto de
+    # reintentos e interruptores de circuito por endpoint de TMDB
+    REQUEST_DEADLINE = config('REQUEST_DEADLINE', default=10, cast=float)
+    RETRY_MAX_RETRIES = config('RETRY_MAX_RETRIES', default=3, cast=int)
+    RETRY_BASE_DELAY = config('RETRY_BASE_DELAY', default=0.2, cast=float)
+    RETRY_MAX_DELAY = config('RETRY_MAX_DELAY', default=2, cast=float)
+    RETRY_BUDGET_RATIO = config('RETRY_BUDGET_RATIO', default=0.2, cast=float)
+    RETRY_BUDGET_MIN_PER_SECOND = config('RETRY_BUDGET_MIN_PER_SECOND', default=1, cast=float)
+    CIRCUIT_FAILURE_THRESHOLD = config('CIRCUIT_FAILURE_THRESHOLD', default=5, cast=int)
+    CIRCUIT_RESET_TIMEOUT = config('CIRCUIT_RESET_TIMEOUT', default=30, cast=float)
+
+    # Operaciones masivas y trabajos en segundo plano
+    BULK_MAX_WORKERS = config('BULK_MAX_WORKERS', default=8, cast=int)
+    BULK_RATE_LIMIT = config('BULK_RATE_LIMIT', default=20, cast=float)
+    BATCH_MAX_SIZE = config('BATCH_MAX_SIZE', default=100, cast=int)
+    JOB_MAX_CONCURRENT = config('JOB_MAX_CONCURRENT', default=2, cast=int)
+    JOB_TTL = config('JOB_TTL', default=3600, cast=int)
+
+    # Paginación por cursor de las favoritas ordenadas por fecha de lanzamiento
+    RELEASE_DATE_PAGE_SIZE = config('RELEASE_DATE_PAGE_SIZE', default=20, cast=int)
+    RELEASE_DATE_MAX_PAGE_SIZE = config('RELEASE_DATE_MAX_PAGE_SIZE', default=100, cast=int)
+
+    # Logs por niveles ('text' o 'json') y trazas por petición (exportadas en formato Zipkin)
+    LOG_LEVEL = config('LOG_LEVEL', default='INFO')
+    LOG_FORMAT = config('LOG_FORMAT', default='text')
+    TRACING_SAMPLE_RATE = config('TRACING_SAMPLE_RATE', default=0.0, cast=float)
+    TRACING_ZIPKIN_URL = config('TRACING_ZIPKIN_URL', default=None)
+    TRACING_SERVICE_NAME = config('TRACING_SERVICE_NAME', default='test_flask_themoviedb')
+
+    # Perfilado por muestreo bajo demanda desde /profile (solo ADMIN)
+    PROFILING_ENABLED = config('PROFILING_ENABLED', default=False, cast=bool)
+    PROFILING_MAX_SECONDS = config('PROFILING_MAX_SECONDS', default=30, cast=int)
+    PROFILING_INTERVAL = config('PROFILING_INTERVAL', default=0.005, cast=float)
+
+    # Métricas agregadas entre los workers de gunicorn: directorio compartido (vacío para
+    # exportar solo las del proceso) y segundos entre escrituras de cada worker
+    METRICS_MULTIPROC_DIR = config('METRICS_MULTIPROC_DIR', default='')
+    METRICS_WRITE_INTERVAL = config('METRICS_WRITE_INTERVAL', default=1, cast=float)
+
+    # Servidor de producción (gunicorn): workers según las CPU disponibles (SERVER_WORKERS=0),
+    # hilos por worker y apagado ordenado
+    SERVER_BIND = config('SERVER_BIND', default='0.0.0.0:5000')
+    SERVER_WORKERS = config('SERVER_WORKERS', default=0, cast=int)
+    SERVER_WORKERS_PER_CPU = config('SERVER_WORKERS_PER_CPU', default=2, cast=float)
+    SERVER_THREADS = config('SERVER_THREADS', default=4, cast=int)
+    SERVER_TIMEOUT = config('SERVER_TIMEOUT', default=30, cast=int)
+    SERVER_GRACEFUL_TIMEOUT = config('SERVER_GRACEFUL_TIMEOUT', default=25, cast=int)
+    SERVER_KEEPALIVE = config('SERVER_KEEPALIVE', default=5, cast=int)
+    SERVER_MAX_REQUESTS = config('SERVER_MAX_REQUESTS', default=0, cast=int)
 
     @property
     def headers(self):
@@ -17,6 +128,28 @@ class Config:
 class DevelopmentConfig(Config):
     DEBUG = True
 
+class ProductionConfig(Config):
+    DEBUG = False
+
 config = {
-    'development': DevelopmentConfig
+    'development': DevelopmentConfig,
+    'production': ProductionConfig
 }
+
+def get_config(name=None):
+    """
+    Crea la configuración seleccionada.
+
+    Args:
+        name (str, opcional): 'development' o 'production'. Por defecto, APP_CONFIG.
+
+    Returns:
+        Config: Configuración seleccionada.
+
+    Raises:
+        ValueError: Si la configuración no existe.
+    """
+    name = name or Config.APP_CONFIG
+    if name not in config:
+        raise ValueError(f"Configuración desconocida: {name}")
+    return config[name]()
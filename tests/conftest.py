@@ -0,0 +1,8 @@
+import pytest
+from adapters.resilience import circuit_breakers, retry_budget
+
+@pytest.fixture(autouse=True)
+def reset_resilience():
+    circuit_breakers.reset()
+    retry_budget.reset()
+    yield
@@ -0,0 +1,84 @@
+import os
+import runpy
+import subprocess
+import sys
+import fakeredis
+import pytest
+from types import SimpleNamespace
+from adapters.cache import InvalidationBus, LocalCache
+from app import create_app
+from settings import config, get_config
+
+GUNICORN_CONF = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'gunicorn.conf.py')
+
+def test_create_app_applies_config_and_registers_routes():
+    settings = config['development']()
+    settings.CACHE_WARMER_ENABLED = False
+
+    app = create_app(settings, start_background=False)
+    client = app.test_client()
+
+    assert app.config['DEBUG'] is True
+    assert app.config['SERVER_THREADS'] == settings.SERVER_THREADS
+    assert client.get('/metrics').status_code == 200
+    assert client.get('/missing').get_json() == {"message": "Page not found"}
+
+def test_production_config_disables_debug():
+    settings = get_config('production')
+    settings.CACHE_WARMER_ENABLED = False
+
+    app = create_app(settings, start_background=False)
+
+    assert app.config['DEBUG'] is False
+
+def test_get_config_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        get_config('staging')
+
+def test_create_app_exposes_the_services_redis_client():
+    from application.services import redis_client
+
+    app = create_app(config['development'](), start_background=False)
+
+    assert app.extensions['redis'] is redis_client
+
+def test_worker_count_uses_cpus_unless_configured():
+    conf = runpy.run_path(GUNICORN_CONF)
+    worker_count = conf['worker_count']
+
+    assert worker_count(SimpleNamespace(SERVER_WORKERS=0, SERVER_WORKERS_PER_CPU=2), cpus=4) == 8
+    assert worker_count(SimpleNamespace(SERVER_WORKERS=0, SERVER_WORKERS_PER_CPU=0.5), cpus=1) == 1
+    assert worker_count(SimpleNamespace(SERVER_WORKERS=3, SERVER_WORKERS_PER_CPU=2), cpus=16) == 3
+    assert conf['available_cpus']() >= 1
+    assert conf['preload_app'] is True
+    assert conf['wsgi_app'] == 'app:create_app(start_background=False)'
+
+def test_invalidation_bus_gets_new_origin_after_fork():
+    bus = InvalidationBus(fakeredis.FakeStrictRedis(), LocalCache(10))
+    bus.start()
+    origin = bus.origin
+
+    bus.reset_after_fork()
+
+    assert bus.origin != origin
+    assert bus._thread is None
+    bus.start()
+    assert bus._thread.is_alive()
+    bus.stop()
+
+def test_importing_app_starts_no_background_threads():
+    from controllers.controllers import movie_service
+
+    assert movie_service.movie_api.invalidation_bus._thread is None
+
+def test_modules_load_the_config_selected_by_app_config():
+    code = (
+        "import application.services, adapters.movie_api_adapter, controllers.controllers;"
+        "print({type(module.app_settings).__name__ for module in "
+        "(application.services, adapters.movie_api_adapter, controllers.controllers)})"
+    )
+    env = dict(os.environ, APP_CONFIG='production')
+    output = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(GUNICORN_CONF)).stdout
+
+    assert output.strip() == "{'ProductionConfig'}"
@@ -0,0 +1,28 @@
+from benchmarks.harness import compare, measure
+
+def _document(calibration, **results):
+    return {'calibration': calibration, 'results': {name: {'min': value, 'median': value} for name, value in results.items()}}
+
+def test_measure_reports_time_per_operation():
+    calls = []
+    result = measure(lambda: calls.append(1), min_time=0.01, repeat=3)
+
+    assert result['repeat'] == 3
+    assert result['loops'] >= 1
+    assert 0 < result['min'] <= result['median']
+    assert len(calls) >= 1 + 3 * result['loops']
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    baseline = _document(1.0, fast=0.010, slow=0.010, new=None)
+    del baseline['results']['new']
+    current = _document(1.0, fast=0.011, slow=0.020, new=0.5)
+
+    assert [name for name, *_ in compare(current, baseline, tolerance=0.25)] == ['slow']
+
+def test_compare_normalizes_by_machine_speed_and_ignores_tiny_deltas():
+    baseline = _document(1.0, case=0.010, tiny=0.000002)
+    slower_machine = _document(2.0, case=0.020, tiny=0.000004)
+    assert compare(slower_machine, baseline) == []
+
+    noisy = _document(1.0, case=0.010, tiny=0.000004)
+    assert compare(noisy, baseline) == []
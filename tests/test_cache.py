@@ -0,0 +1,45 @@
+import time
+from adapters.cache import _MISSING, CacheEntry, LocalCache, key_family
+
+def test_key_family_strips_account_id():
+    assert key_family("favorite_movies_12345") == "favorite_movies"
+    assert key_family("popular_movies") == "popular_movies"
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalCache(maxsize=2)
+    cache.set("rated_movies_1", {"id": 1}, 30)
+    cache.set("rated_movies_2", {"id": 2}, 30)
+    assert cache.get("rated_movies_1") == {"id": 1}
+
+    cache.set("rated_movies_3", {"id": 3}, 30)
+
+    assert cache.get("rated_movies_2") is None
+    assert cache.get("rated_movies_1") == {"id": 1}
+    assert cache.stats()["rated_movies"] == {'hits': 2, 'misses': 1, 'evictions': 1, 'expirations': 0}
+
+def test_local_cache_expires_entries():
+    cache = LocalCache(maxsize=2)
+    cache.set("popular_movies", {"results": []}, 0.01)
+    time.sleep(0.02)
+
+    assert cache.get("popular_movies") is None
+    assert cache.stats()["popular_movies"]["expirations"] == 1
+
+def test_cache_entry_from_redis_is_parsed_lazily():
+    entry = CacheEntry.from_redis_mapping({b"body": b'{"results":[{"id":1}]}', b"stored_at": b"1.5"})
+
+    assert entry.body == b'{"results":[{"id":1}]}'
+    assert entry._value is _MISSING and entry.stored_at == 1.5
+    assert entry.value == {"results": [{"id": 1}]}
+
+def test_cache_entry_derived_is_computed_once():
+    entry = CacheEntry({"results": [1, 2]}, 0.0)
+    calls = []
+
+    def build(e):
+        calls.append(1)
+        return len(e.value["results"])
+
+    assert entry.derived("count", build) == 2
+    assert entry.derived("count", build) == 2
+    assert len(calls) == 1
@@ -0,0 +1,65 @@
+import time
+import fakeredis
+import requests_mock
+from adapters.movie_api_adapter import MovieAPIAdapter
+from application.cache_warmer import CacheWarmer
+
+POPULAR_URL = "https://api.themoviedb.org/3/movie/popular?api_key=fake_api_key"
+FAVORITES_URL = "https://api.themoviedb.org/3/account/12345/favorite/movies"
+RATED_URL = "https://api.themoviedb.org/3/account/12345/rated/movies"
+
+
+def _mock_lists(m):
+    m.get(POPULAR_URL, json={"results": [{"id": 1}]})
+    m.get(FAVORITES_URL, json={"results": [{"id": 2}]})
+    m.get(RATED_URL, json={"results": [{"id": 2, "rating": 4}]})
+
+
+def test_warm_all_fills_every_registered_key():
+    adapter = MovieAPIAdapter("fake_api_key", {}, "12345", fakeredis.FakeStrictRedis())
+    warmer = CacheWarmer(lead_time=0, jitter=0)
+    warmer.register(adapter)
+
+    with requests_mock.Mocker() as m:
+        _mock_lists(m)
+        assert warmer.warm_all() == {"popular_movies": True, "favorite_movies_12345": True, "rated_movies_12345": True}
+        # Con todo fresco, un segundo arranque no vuelve a llamar a TMDB.
+        calls = m.call_count
+        assert warmer.warm_all() == {}
+        assert m.call_count == calls
+
+    assert adapter.get_rated_favorite_movies()["results"] == [{"id": 2, "rating": 4}]
+    assert warmer.stats()["popular_movies"]["refreshes"] == 1
+
+def test_run_once_refreshes_only_keys_close_to_expiry():
+    adapter = MovieAPIAdapter("fake_api_key", {}, "12345", fakeredis.FakeStrictRedis())
+    adapter.cache_duration = 100
+    adapter._cache_response("popular_movies", 100, {"results": [{"id": 1}]})
+    adapter._cache_response("favorite_movies_12345", 100, {"results": []})
+    adapter._cache_response("rated_movies_12345", 100, {"results": []})
+    old_entry = adapter._cache_response("popular_movies", 100, {"results": [{"id": 1}]})
+    old_entry.stored_at = time.time() - 95
+    adapter.redis_client.hset("popular_movies", "stored_at", repr(old_entry.stored_at))
+    warmer = CacheWarmer(lead_time=10, jitter=0)
+    warmer.register(adapter)
+
+    with requests_mock.Mocker() as m:
+        m.get(POPULAR_URL, json={"results": [{"id": 3}]})
+        assert warmer.run_once() == {"popular_movies": True}
+
+    assert adapter.get_popular_movies() == {"results": [{"id": 3}]}
+    assert warmer.stats()["favorite_movies_12345"]["skipped"] == 1
+
+def test_failed_refresh_is_recorded():
+    adapter = MovieAPIAdapter("fake_api_key", {}, "12345")
+    warmer = CacheWarmer(jitter=0)
+    warmer.register(adapter)
+
+    with requests_mock.Mocker() as m:
+        _mock_lists(m)
+        m.get(POPULAR_URL, status_code=404)
+        results = warmer.warm_all()
+
+    assert results["popular_movies"] is False
+    assert warmer.stats()["popular_movies"]["failures"] == 1
+    assert warmer.stats()["popular_movies"]["last_error"]
@@ -1,7 +1,12 @@
+import gzip
+from collections import Counter
+import json
+import time
 import pytest
 from unittest.mock import MagicMock
 from flask import Flask
 from controllers.controllers import movies_blueprint
+from adapters.serialization import RawJSON
 
 @pytest.fixture
 def client():
@@ -75,30 +80,199 @@ def test_get_rated_movies(client, mock_movie_service):
     mock_movie_service.get_rated_movies.assert_called_once()
 
 def test_get_favorite_movies_by_release_date(client, mock_movie_service):
-    mock_movie_service.get_favorite_movies_by_release_date.return_value = [
-        {'title': 'Movie1', 'release_date': '2023-10-10'}
-    ]
+    mock_movie_service.get_favorite_movies_by_release_date.return_value = {
+        'results': [{'title': 'Movie1', 'release_date': '2023-10-10'}],
+        'next_cursor': 'abc'
+    }
     set_authorization_header(client, 2)
     
-    response = client.get('/get_favorite_movies_by_release_date')
+    response = client.get('/get_favorite_movies_by_release_date?limit=1&cursor=xyz')
     assert response.status_code == 200
-    assert response.json == [{'title': 'Movie1', 'release_date': '2023-10-10'}]
-    mock_movie_service.get_favorite_movies_by_release_date.assert_called_once()
+    assert response.json == {'results': [{'title': 'Movie1', 'release_date': '2023-10-10'}], 'next_cursor': 'abc'}
+    mock_movie_service.get_favorite_movies_by_release_date.assert_called_once_with(fields=None, cursor='xyz', limit=1)
+
+def test_get_favorite_movies_by_release_date_invalid_limit(client, mock_movie_service):
+    set_authorization_header(client, 2)
+    
+    response = client.get('/get_favorite_movies_by_release_date?limit=0')
+    assert response.status_code == 400
+    mock_movie_service.get_favorite_movies_by_release_date.assert_not_called()
 
 def test_rated_movies_from_favorites(client, mock_movie_service):
-    mock_movie_service.get_rated_movies_from_favorites.return_value = [{'title': 'RatedFavMovie1'}]
+    mock_movie_service.get_rated_movies_from_favorites.return_value = RawJSON(b'[{"title":"RatedFavMovie1"}]')
     set_authorization_header(client, 2)
     
     response = client.get('/rated_movies_from_favorites')
     assert response.status_code == 200
     assert response.json == [{'title': 'RatedFavMovie1'}]
-    mock_movie_service.get_rated_movies_from_favorites.assert_called_once()
+    mock_movie_service.get_rated_movies_from_favorites.assert_called_once_with(raw=True, fields=None)
+
+def test_rated_movies_from_favorites_requires_user(client, mock_movie_service):
+
+    response = client.get('/rated_movies_from_favorites')
+    assert response.status_code == 403
+    mock_movie_service.get_rated_movies_from_favorites.assert_not_called()
 
 def test_delete_favorite_movies_as_admin(client, mock_movie_service):
-    mock_movie_service.delete_all_favorite_movies.return_value = {'status_code': 204, 'response': {"success": True}}
+    mock_movie_service.start_delete_all_favorite_movies.return_value = {'id': 'abc', 'status': 'pending'}
     set_authorization_header(client, 1)
     
     response = client.delete('/delete_favorite_movies')
+    assert response.status_code == 202
+    assert response.json == {'id': 'abc', 'status': 'pending'}
+    assert response.headers['Location'].endswith('/jobs/abc')
+    mock_movie_service.start_delete_all_favorite_movies.assert_called_once()
+
+def test_delete_favorite_movies_as_user_is_denied(client, mock_movie_service):
+    set_authorization_header(client, 2)
+
+    response = client.delete('/delete_favorite_movies')
+    assert response.status_code == 403
+    mock_movie_service.start_delete_all_favorite_movies.assert_not_called()
+
+def test_get_job(client, mock_movie_service):
+    mock_movie_service.get_job.return_value = {'id': 'abc', 'status': 'completed'}
+    set_authorization_header(client, 1)
+
+    response = client.get('/jobs/abc')
     assert response.status_code == 200
-    assert response.json == {'status_code': 204, 'response': {"success": True}}
-    mock_movie_service.delete_all_favorite_movies.assert_called_once()
+    assert response.json == {'id': 'abc', 'status': 'completed'}
+    mock_movie_service.get_job.assert_called_once_with('abc')
+
+def test_get_missing_job(client, mock_movie_service):
+    mock_movie_service.get_job.return_value = None
+    set_authorization_header(client, 1)
+
+    response = client.get('/jobs/missing')
+    assert response.status_code == 404
+
+def test_get_circuit_breakers(client):
+    set_authorization_header(client, 1)
+
+    response = client.get('/circuit_breakers')
+    assert response.status_code == 200
+    assert set(response.json) == {'circuit_breakers', 'retry_budget'}
+
+def test_authenticated_responses_report_auth_timing(client):
+    set_authorization_header(client, 1)
+
+    response = client.get('/circuit_breakers')
+    assert response.headers['Server-Timing'].startswith('auth;dur=')
+
+def test_cache_warmer_stats_requires_admin(client):
+    set_authorization_header(client, 2)
+    assert client.get('/cache_warmer').status_code == 403
+
+    set_authorization_header(client, 1)
+    response = client.get('/cache_warmer')
+    assert response.status_code == 200
+    assert 'popular_movies' in response.json
+
+def test_add_favorites_batch(client, mock_movie_service):
+    mock_movie_service.add_favorite_movies_batch.return_value = {'results': [{'media_id': 1, 'status': 'success'}]}
+    set_authorization_header(client, 2)
+
+    response = client.post('/add_favorites', json=[1])
+    assert response.status_code == 200
+    assert response.json == {'results': [{'media_id': 1, 'status': 'success'}]}
+    mock_movie_service.add_favorite_movies_batch.assert_called_once_with([1])
+
+def test_delete_favorites_batch(client, mock_movie_service):
+    mock_movie_service.delete_favorite_movies_batch.return_value = {'results': []}
+    set_authorization_header(client, 2)
+
+    response = client.delete('/delete_favorites', json=[1, 2])
+    assert response.status_code == 200
+    mock_movie_service.delete_favorite_movies_batch.assert_called_once_with([1, 2])
+
+def test_rate_movies_batch_invalid(client, mock_movie_service):
+    mock_movie_service.rate_movies_batch.return_value = ({'message': 'Lote inválido', 'errors': []}, 400)
+    set_authorization_header(client, 2)
+
+    response = client.post('/rate_movies', json=[[1, 9]])
+    assert response.status_code == 400
+    assert response.json['message'] == 'Lote inválido'
+
+def test_get_popular_movies_serves_raw_json(client, mock_movie_service):
+    mock_movie_service.get_popular_movies.return_value = RawJSON(b'[{"title":"Movie1"}]')
+
+    response = client.get('/populars')
+    assert response.status_code == 200
+    assert response.data == b'[{"title":"Movie1"}]'
+    assert response.mimetype == 'application/json'
+    mock_movie_service.get_popular_movies.assert_called_once_with(raw=True, fields=None)
+
+def test_list_endpoint_passes_requested_fields(client, mock_movie_service):
+    mock_movie_service.get_favorite_movies.return_value = {'results': [{'id': 1}]}
+    set_authorization_header(client, 2)
+
+    response = client.get('/get_favorite_movies?fields=id,title')
+    assert response.status_code == 200
+    mock_movie_service.get_favorite_movies.assert_called_once_with(raw=True, fields=('id', 'title'))
+
+def test_list_endpoint_rejects_unknown_fields(client, mock_movie_service):
+    response = client.get('/populars?fields=id,overview')
+    assert response.status_code == 400
+    assert 'overview' in response.json['message']
+    mock_movie_service.get_popular_movies.assert_not_called()
+
+def test_raw_json_response_has_validators(client, mock_movie_service):
+    raw = RawJSON(b'[{"title":"Movie1"}]', stored_at=time.time())
+    mock_movie_service.get_popular_movies.return_value = raw
+
+    response = client.get('/populars')
+    assert response.headers['ETag'] == f'"{raw.etag}"'
+    assert response.cache_control.public
+    assert 0 < response.cache_control.max_age <= 300
+
+    response = client.get('/populars', headers={'If-None-Match': f'"{raw.etag}"'})
+    assert response.status_code == 304
+    assert response.data == b''
+
+def test_large_raw_json_response_is_compressed(client, mock_movie_service):
+    raw = RawJSON(json.dumps([{'id': i, 'title': f'Movie {i}'} for i in range(200)]).encode())
+    mock_movie_service.get_rated_movies.return_value = raw
+    set_authorization_header(client, 2)
+
+    response = client.get('/get_rated_movies', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == raw.body
+    assert response.cache_control.private
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+    response = client.get('/get_rated_movies', headers={'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+
+def test_metrics_endpoint_exports_route_latency(client, mock_movie_service):
+    mock_movie_service.get_popular_movies.return_value = [{'title': 'Movie1'}]
+    client.get('/populars')
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    text = response.get_data(as_text=True)
+    assert 'http_requests_total{route="movies.get_popular_movies",method="GET",status="200"}' in text
+    assert 'http_request_duration_seconds_count{route="movies.get_popular_movies",method="GET"}' in text
+
+def test_traced_request_returns_traceparent(client, mock_movie_service):
+    mock_movie_service.get_popular_movies.return_value = [{'title': 'Movie1'}]
+    traceparent = '00-' + 'd' * 32 + '-' + 'e' * 16 + '-01'
+
+    response = client.get('/populars', headers={'traceparent': traceparent})
+    assert response.headers['traceparent'].startswith('00-' + 'd' * 32 + '-')
+    assert 'traceparent' not in client.get('/populars').headers
+
+def test_profile_requires_admin_and_flag(client, monkeypatch):
+    set_authorization_header(client, 2)
+    assert client.get('/profile?seconds=1').status_code == 403
+
+    set_authorization_header(client, 1)
+    monkeypatch.setattr("controllers.controllers.app_settings.PROFILING_ENABLED", False)
+    assert client.get('/profile?seconds=1').status_code == 404
+
+    monkeypatch.setattr("controllers.controllers.app_settings.PROFILING_ENABLED", True)
+    assert client.get('/profile?seconds=0').status_code == 400
+    monkeypatch.setattr("controllers.controllers.profiler.profile", MagicMock(return_value=Counter({'MainThread;main (app.py:1)': 3})))
+    response = client.get('/profile?seconds=1')
+    assert response.status_code == 200
+    assert response.get_data(as_text=True) == 'MainThread;main (app.py:1) 3\n'
@@ -0,0 +1,84 @@
+import threading
+import fakeredis
+import pytest
+import requests
+from adapters.movie_api_adapter import MovieAPIAdapter
+from adapters.rate_limiter import TokenBucket
+from loadtest.fake_tmdb import FakeTMDBServer, FakeTMDBState, FaultInjector, parse_latency
+from loadtest.load_generator import parse_mix, percentile, summarize
+
+def _start(state=None, faults=None):
+    server = FakeTMDBServer(('127.0.0.1', 0), state or FakeTMDBState(movies=60, favorites=45, rated=5), faults)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+@pytest.fixture
+def fake_tmdb():
+    server = _start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def _adapter(server):
+    unlimited = {'read': TokenBucket(1e9), 'write': TokenBucket(1e9)}
+    return MovieAPIAdapter(
+        "fake_api_key", {}, "12345", fakeredis.FakeStrictRedis(), rate_limiters=unlimited, api_url=server.base_url
+    )
+
+def test_adapter_merges_paginated_favorites_from_fake_server(fake_tmdb):
+    response = _adapter(fake_tmdb).get_favorite_movies()
+
+    assert response['total_results'] == 45
+    assert len(response['results']) == 45
+    assert len({movie['id'] for movie in response['results']}) == 45
+
+def test_fake_server_applies_favorite_and_rating_changes(fake_tmdb):
+    adapter = _adapter(fake_tmdb)
+    movie_id = next(movie_id for movie_id in fake_tmdb.state.movies if movie_id not in fake_tmdb.state.favorites)
+
+    assert adapter.add_favorite_movie(movie_id).status_code == 201
+    assert adapter.rate_movie(movie_id, 7.5).status_code == 201
+
+    assert movie_id in fake_tmdb.state.favorites
+    assert fake_tmdb.state.ratings[movie_id] == 7.5
+    assert fake_tmdb.state.page('rated_movies', 1)['total_results'] == 6
+
+def test_fake_server_throttles_with_retry_after():
+    server = _start(faults=FaultInjector(throttle_rate=1.0, retry_after=3))
+    try:
+        response = requests.get(f"{server.base_url}/movie/popular", timeout=5)
+        stats = requests.get(f"http://127.0.0.1:{server.server_address[1]}/__stats", timeout=5).json()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '3'
+    assert stats == {'popular 429': 1}
+
+def test_parse_latency_distributions():
+    assert parse_latency('0')() == 0.0
+    assert parse_latency('fixed:50')() == 0.05
+    assert 0.02 <= parse_latency('uniform:20,80')() <= 0.08
+    assert parse_latency('lognormal:50,0.5')() > 0
+    with pytest.raises(ValueError):
+        parse_latency('gamma:1')
+
+def test_summarize_reports_percentiles_per_request():
+    samples = [('populars', 200, i / 1000) for i in range(1, 101)] + [('rate_movie', 'error', 0.5)]
+
+    summary = summarize(samples, elapsed=2.0)
+
+    assert summary['populars']['requests'] == 100
+    assert summary['populars']['throughput'] == 50
+    assert summary['populars']['p50_ms'] == pytest.approx(50)
+    assert summary['populars']['p99_ms'] == pytest.approx(99)
+    assert summary['all']['statuses'] == {'200': 100, 'error': 1}
+    assert percentile([], 0.5) == 0.0
+
+def test_parse_mix_reweights_known_requests():
+    assert parse_mix('populars=2,rate_movie') == [
+        ('populars', 'GET', '/populars', 2.0), ('rate_movie', 'POST', '/rate_movie/{movie_id}/{rating}', 1.0)
+    ]
+    with pytest.raises(ValueError):
+        parse_mix('unknown=1')
@@ -0,0 +1,57 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from adapters.http_session import PooledHTTPAdapter, create_session, session_pool_stats
+
+
+class _Settings:
+    HTTP_POOL_CONNECTIONS = 2
+    HTTP_POOL_MAXSIZE = 4
+    HTTP_POOL_BLOCK = True
+    HTTP_KEEP_ALIVE = True
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"results": []}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def test_create_session_uses_configured_pool():
+    session = create_session(_Settings)
+    adapter = session.get_adapter("https://api.themoviedb.org/3/movie/popular")
+
+    assert isinstance(adapter, PooledHTTPAdapter)
+    assert adapter._pool_connections == 2
+    assert adapter._pool_maxsize == 4
+    assert adapter._pool_block is True
+
+def test_session_reuses_connections(local_server):
+    session = create_session(_Settings)
+
+    for _ in range(3):
+        assert session.get(f"{local_server}/movie/popular", timeout=2).status_code == 200
+
+    stats = session_pool_stats(session)
+    assert stats["totals"]["requests"] == 3
+    assert stats["totals"]["new_connections"] == 1
+    assert stats["totals"]["reused_connections"] == 2
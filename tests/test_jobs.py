@@ -0,0 +1,70 @@
+import time
+import fakeredis
+from adapters.rate_limiter import TokenBucket
+from application.bulk import run_concurrently
+from application.jobs import JobManager
+
+def _wait_for(job_manager, job_id, status):
+    for _ in range(100):
+        job = job_manager.get(job_id)
+        if job['status'] == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not reach {status}")
+
+def test_job_runs_in_background_and_reports_progress():
+    job_manager = JobManager(fakeredis.FakeStrictRedis())
+
+    def work(progress):
+        progress(1, 1)
+        return {'status': 'success'}
+
+    job = job_manager.submit('test', work)
+    assert job['status'] == 'pending'
+
+    finished = _wait_for(job_manager, job['id'], 'completed')
+    assert finished['progress'] == {'done': 1, 'total': 1}
+    assert finished['result'] == {'status': 'success'}
+
+def test_job_status_is_shared_through_redis():
+    redis_client = fakeredis.FakeStrictRedis()
+    job = JobManager(redis_client).submit('test', lambda progress: 'ok')
+    other_process = JobManager(redis_client)
+
+    for _ in range(100):
+        if other_process.get(job['id'])['status'] == 'completed':
+            break
+        time.sleep(0.01)
+    assert other_process.get(job['id'])['result'] == 'ok'
+
+def test_failed_job_is_reported():
+    job_manager = JobManager()
+
+    def work(progress):
+        raise RuntimeError("boom")
+
+    job = job_manager.submit('test', work)
+    assert _wait_for(job_manager, job['id'], 'failed')['result'] == {'message': 'boom'}
+
+def test_job_returning_an_error_status_is_failed():
+    job_manager = JobManager()
+
+    job = job_manager.submit('test', lambda progress: ({'message': 'no disponible'}, 503))
+    assert _wait_for(job_manager, job['id'], 'failed')['result'] == {'message': 'no disponible'}
+
+def test_run_concurrently_keeps_order_and_captures_errors():
+    def work(item):
+        if item == 2:
+            raise ValueError("bad item")
+        return item * 10
+
+    results = run_concurrently(work, [1, 2, 3], max_workers=3)
+    assert results[0] == 10
+    assert isinstance(results[1], ValueError)
+    assert results[2] == 30
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=100, capacity=1)
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() > 0
+    assert bucket.acquire(timeout=0.1)
@@ -0,0 +1,106 @@
+import json
+import os
+import subprocess
+import sys
+from adapters.metrics import MetricsRegistry, MultiprocessMetrics, merge_snapshots
+
+def test_counter_accumulates_per_label_set():
+    registry = MetricsRegistry()
+    counter = registry.counter("events_total", "Eventos.", ("kind",))
+    counter.inc("a")
+    counter.inc("a", amount=2)
+    counter.inc("b")
+
+    assert counter.value("a") == 3
+    assert 'events_total{kind="a"} 3' in registry.render()
+    assert registry.counter("events_total", "Eventos.", ("kind",)) is counter
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latencia.", ("route",), buckets=(0.1, 1))
+    histogram.observe(0.05, "r")
+    histogram.observe(0.5, "r")
+    histogram.observe(5, "r")
+
+    text = registry.render()
+    assert '# TYPE latency_seconds histogram' in text
+    assert 'latency_seconds_bucket{route="r",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="r",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="r",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="r"} 3' in text
+    assert histogram.count("r") == 3
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("quoted_total", "Comillas.", ("value",)).inc('a"b\\c')
+
+    assert 'quoted_total{value="a\\"b\\\\c"} 1' in registry.render()
+
+def test_collectors_run_at_render_time_and_errors_are_isolated():
+    registry = MetricsRegistry()
+    state = {"size": 1}
+    registry.register_collector(lambda: [("queue_size", "gauge", "Tamaño.", [({"queue": "q"}, state["size"])])])
+    registry.register_collector(lambda: 1 / 0)
+
+    state["size"] = 4
+    text = registry.render()
+    assert '# TYPE queue_size gauge' in text
+    assert 'queue_size{queue="q"} 4' in text
+    assert '# Error en el recolector' in text
+
+def _worker_registry(requests, size):
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Peticiones.", ("status",)).inc(200, amount=requests)
+    registry.histogram("latency_seconds", "Latencia.", ("route",), buckets=(0.1,)).observe(0.05, "r")
+    registry.register_collector(lambda: [
+        ("cache_entries", "gauge", "Entradas.", [({"cache": "l1"}, size)]),
+        ("refreshes_total", "counter", "Refrescos.", [({}, 1)]),
+    ])
+    return registry
+
+def test_merge_sums_counters_and_labels_gauges_of_live_workers():
+    text = merge_snapshots([
+        (101, _worker_registry(2, 5).snapshot(), True),
+        (102, _worker_registry(3, 7).snapshot(), True),
+        (103, _worker_registry(4, 9).snapshot(), False),
+    ])
+
+    assert 'requests_total{status="200"} 9' in text
+    assert 'latency_seconds_bucket{route="r",le="0.1"} 3' in text
+    assert 'latency_seconds_count{route="r"} 3' in text
+    assert 'refreshes_total 3' in text
+    assert 'cache_entries{cache="l1",pid="101"} 5' in text
+    assert 'cache_entries{cache="l1",pid="102"} 7' in text
+    assert 'pid="103"' not in text
+
+def test_multiprocess_metrics_includes_other_and_finished_workers(tmp_path):
+    finished = subprocess.Popen([sys.executable, "-c", "pass"])
+    finished.wait()
+    with open(tmp_path / f"metrics_{finished.pid}.json", "w") as file:
+        json.dump(_worker_registry(2, 5).snapshot(), file)
+    with open(tmp_path / "metrics_archive.json", "w") as file:
+        json.dump(_worker_registry(4, 9).snapshot(), file)
+    metrics = MultiprocessMetrics(_worker_registry(1, 3), str(tmp_path))
+
+    text = metrics.render()
+
+    assert 'requests_total{status="200"} 7' in text
+    assert 'latency_seconds_count{route="r"} 3' in text
+    assert f'cache_entries{{cache="l1",pid="{os.getpid()}"}} 3' in text
+    assert text.count('cache_entries{') == 1
+    # El fichero del proceso terminado se suma al archivo en lugar de quedarse en el directorio
+    assert not (tmp_path / f"metrics_{finished.pid}.json").exists()
+    assert metrics.render().count('requests_total{status="200"} 7') == 1
+
+def test_stopped_workers_are_folded_into_one_archive(tmp_path):
+    for requests in (2, 3):
+        metrics = MultiprocessMetrics(_worker_registry(requests, 5), str(tmp_path), interval=60)
+        metrics.start()
+        metrics.stop()
+        metrics._pid = None
+
+    assert sorted(path.name for path in tmp_path.glob("*.json")) == ["metrics_archive.json"]
+    assert 'requests_total{status="200"} 5' in MultiprocessMetrics(MetricsRegistry(), str(tmp_path)).render()
+
+    metrics.clear()
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,39 @@
+import pytest
+from domain.movie import Movie, parse_fields, project_listing
+from domain.release_date_index import ReleaseDateIndex
+
+def test_movie_is_slotted():
+    movie = Movie(1, 'Movie1', '2023-10-10')
+    with pytest.raises(AttributeError):
+        movie.overview = 'not stored'
+
+def test_movie_to_dict_omits_empty_fields_unless_requested():
+    movie = Movie.from_dict({'id': 1, 'title': 'Movie1', 'overview': 'ignored'})
+    assert movie.to_dict() == {'id': 1, 'title': 'Movie1'}
+    assert movie.to_dict(('id', 'rating')) == {'id': 1, 'rating': None}
+
+def test_project_listing_keeps_only_movie_fields():
+    response = {'page': 1, 'results': [{'id': 1, 'title': 'Movie1', 'backdrop_path': '/a.jpg', 'genre_ids': [1]}]}
+    assert project_listing(response) == {'page': 1, 'results': [{'id': 1, 'title': 'Movie1'}]}
+    assert project_listing(response, ('id',)) == {'page': 1, 'results': [{'id': 1}]}
+
+def test_parse_fields():
+    assert parse_fields(None) is None
+    assert parse_fields('id, title,id') == ('id', 'title')
+    with pytest.raises(ValueError):
+        parse_fields('id,overview')
+
+def test_release_date_index_pages_are_stable():
+    index = ReleaseDateIndex([
+        {'id': i, 'title': f'Movie{i}', 'release_date': f'2020-01-{i % 5 + 1:02d}'} for i in range(1, 11)
+    ] + [{'id': 11, 'title': 'NoDate'}])
+
+    ids, cursor = [], None
+    while True:
+        movies, cursor = index.page(cursor, limit=3)
+        ids.extend(movie['id'] for movie in movies)
+        if cursor is None:
+            break
+    assert len(ids) == 11 and len(set(ids)) == 11
+    assert ids[-1] == 11
+    assert ids[:2] == [9, 4]
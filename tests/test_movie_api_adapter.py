@@ -1,6 +1,10 @@
 import pytest
 import requests
 import requests_mock
+import fakeredis
+import threading
+import time
+from unittest.mock import MagicMock
 from adapters.movie_api_adapter import MovieAPIAdapter
 
 @pytest.fixture
@@ -64,3 +68,274 @@ def test_get_rated_movies(movie_api_adapter):
         assert response == mock_response
         assert "results" in response
         assert len(response["results"]) == 2
+
+def test_get_favorite_movies_fetches_all_pages(movie_api_adapter):
+    def page_callback(request, context):
+        page = int(request.qs["page"][0])
+        return {"page": page, "total_pages": 3, "total_results": 3, "results": [{"id": page}]}
+
+    with requests_mock.Mocker() as m:
+        m.get("https://api.themoviedb.org/3/account/12345/favorite/movies", json=page_callback)
+
+        response = movie_api_adapter.get_favorite_movies()
+        assert [movie["id"] for movie in response["results"]] == [1, 2, 3]
+        assert response["total_results"] == 3
+        assert m.call_count == 3
+
+def test_listing_beyond_page_cap_is_marked_truncated(movie_api_adapter, caplog):
+    def page_callback(request, context):
+        page = int(request.qs["page"][0])
+        return {"page": page, "total_pages": 5, "total_results": 5, "results": [{"id": page}]}
+
+    movie_api_adapter.pagination_max_pages = 2
+    with requests_mock.Mocker() as m:
+        m.get("https://api.themoviedb.org/3/account/12345/favorite/movies", json=page_callback)
+
+        response = movie_api_adapter.get_favorite_movies()
+        assert [movie["id"] for movie in response["results"]] == [1, 2]
+        assert response["truncated"] is True
+        assert m.call_count == 2
+    assert "PAGINATION_MAX_PAGES" in caplog.text
+
+def test_get_rated_movies_returns_none_when_a_page_fails(movie_api_adapter):
+    def page_callback(request, context):
+        page = int(request.qs["page"][0])
+        if page == 2:
+            context.status_code = 404
+            return {}
+        return {"page": page, "total_pages": 2, "results": [{"id": page}]}
+
+    with requests_mock.Mocker() as m:
+        m.get("https://api.themoviedb.org/3/account/12345/rated/movies", json=page_callback)
+
+        assert movie_api_adapter.get_rated_movies() is None
+
+def test_transient_page_error_retries_only_that_page(movie_api_adapter):
+    failures = {2: 1}
+
+    def page_callback(request, context):
+        page = int(request.qs["page"][0])
+        if failures.get(page):
+            failures[page] -= 1
+            context.status_code = 503
+            return {}
+        return {"page": page, "total_pages": 3, "results": [{"id": page}]}
+
+    with requests_mock.Mocker() as m:
+        m.get("https://api.themoviedb.org/3/account/12345/favorite/movies", json=page_callback)
+
+        response = movie_api_adapter.get_favorite_movies()
+        assert [movie["id"] for movie in response["results"]] == [1, 2, 3]
+        assert [int(request.qs["page"][0]) for request in m.request_history].count(2) == 2
+        assert m.call_count == 4
+
+def test_failed_page_cancels_pending_pages(movie_api_adapter):
+    def page_callback(request, context):
+        page = int(request.qs["page"][0])
+        if page == 2:
+            context.status_code = 404
+            return {}
+        if page == 3:
+            time.sleep(0.2)
+        return {"page": page, "total_pages": 6, "results": [{"id": page}]}
+
+    movie_api_adapter.pagination_max_workers = 1
+    with requests_mock.Mocker() as m:
+        m.get("https://api.themoviedb.org/3/account/12345/rated/movies", json=page_callback)
+
+        assert movie_api_adapter.get_rated_movies() is None
+        movie_api_adapter._get_page_executor().shutdown(wait=True)
+        # La página 3 puede haber empezado antes del fallo; las siguientes se cancelan
+        assert {int(request.qs["page"][0]) for request in m.request_history} <= {1, 2, 3}
+
+def test_popular_movies_cache_hit_does_not_touch_redis():
+    redis_client = fakeredis.FakeStrictRedis()
+    adapter = MovieAPIAdapter("fake_api_key", {}, "12345", redis_client)
+    with requests_mock.Mocker() as m:
+        m.get("https://api.themoviedb.org/3/movie/popular?api_key=fake_api_key", json={"results": [{"id": 1}]})
+        adapter.get_popular_movies()
+
+    redis_client.pipeline = MagicMock(side_effect=AssertionError("L1 hit should not reach Redis"))
+    assert adapter.get_popular_movies() == {"results": [{"id": 1}]}
+    assert adapter.cache_stats()["popular_movies"]["hits"] == 1
+
+def test_redis_hit_populates_local_cache():
+    redis_client = fakeredis.FakeStrictRedis()
+    writer = MovieAPIAdapter("fake_api_key", {}, "12345", redis_client)
+    writer._cache_response("favorite_movies_12345", 30, {"results": [{"id": 7}]})
+    adapter = MovieAPIAdapter("fake_api_key", {}, "12345", redis_client)
+
+    assert adapter.get_favorite_movies() == {"results": [{"id": 7}]}
+    assert adapter.local_cache.get("favorite_movies_12345").value == {"results": [{"id": 7}]}
+
+def test_stale_entry_is_served_while_refreshing(movie_api_adapter):
+    movie_api_adapter._cache_response("popular_movies", 30, {"results": [{"id": "old"}]})
+    movie_api_adapter.cache_duration = 0
+    with requests_mock.Mocker() as m:
+        m.get("https://api.themoviedb.org/3/movie/popular?api_key=fake_api_key", json={"results": [{"id": "new"}]})
+
+        assert movie_api_adapter.get_popular_movies() == {"results": [{"id": "old"}]}
+        movie_api_adapter._refresh_executor.shutdown(wait=True)
+        assert m.call_count == 1
+
+    assert movie_api_adapter._get_cached_response("popular_movies") == {"results": [{"id": "new"}]}
+
+def test_background_refresh_invalidates_other_processes_local_copy():
+    redis_client = fakeredis.FakeStrictRedis()
+    refresher = MovieAPIAdapter("fake_api_key", {}, "12345", redis_client)
+    other = MovieAPIAdapter("fake_api_key", {}, "12345", redis_client)
+    other.invalidation_bus.start()
+    refresher._cache_response("popular_movies", 30, {"results": [{"id": "old"}]})
+    assert other.get_popular_movies() == {"results": [{"id": "old"}]}
+    time.sleep(0.2)
+
+    refresher.cache_duration = 0
+    with requests_mock.Mocker() as m:
+        m.get("https://api.themoviedb.org/3/movie/popular?api_key=fake_api_key", json={"results": [{"id": "new"}]})
+        refresher.get_popular_movies()
+        refresher._refresh_executor.shutdown(wait=True)
+
+    for _ in range(50):
+        if other.local_cache.get("popular_movies") is None:
+            break
+        time.sleep(0.05)
+    other.invalidation_bus.stop()
+    assert other.get_popular_movies() == {"results": [{"id": "new"}]}
+
+def test_stale_entry_is_kept_when_refresh_fails(movie_api_adapter):
+    movie_api_adapter._cache_response("popular_movies", 30, {"results": [{"id": "old"}]})
+    movie_api_adapter.cache_duration = 0
+    with requests_mock.Mocker() as m:
+        m.get("https://api.themoviedb.org/3/movie/popular?api_key=fake_api_key", status_code=503)
+
+        assert movie_api_adapter.get_popular_movies() == {"results": [{"id": "old"}]}
+        movie_api_adapter._refresh_executor.shutdown(wait=True)
+
+    assert movie_api_adapter.get_popular_movies() == {"results": [{"id": "old"}]}
+
+def test_concurrent_misses_call_api_once():
+    adapter = MovieAPIAdapter("fake_api_key", {}, "12345", fakeredis.FakeStrictRedis())
+
+    def slow_response(request, context):
+        time.sleep(0.05)
+        return {"results": [{"id": 1}]}
+
+    with requests_mock.Mocker() as m:
+        m.get("https://api.themoviedb.org/3/movie/popular?api_key=fake_api_key", json=slow_response)
+        threads = [threading.Thread(target=adapter.get_popular_movies) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert m.call_count == 1
+
+def test_delete_favorite_updates_cached_list_in_place():
+    adapter = MovieAPIAdapter("fake_api_key", {}, "12345", fakeredis.FakeStrictRedis())
+    adapter._cache_response("favorite_movies_12345", 30, {"results": [{"id": 1}, {"id": 2}], "total_results": 2})
+    with requests_mock.Mocker() as m:
+        m.post("https://api.themoviedb.org/3/account/12345/favorite", json={"status_code": 13})
+        adapter.delete_favorite_movie(1)
+
+        assert adapter.get_favorite_movies() == {"results": [{"id": 2}], "total_results": 1}
+        assert adapter._get_cached_entry("favorite_movies_12345", local=False).value["results"] == [{"id": 2}]
+
+def test_add_favorite_invalidates_cached_list():
+    adapter = MovieAPIAdapter("fake_api_key", {}, "12345", fakeredis.FakeStrictRedis())
+    adapter._cache_response("favorite_movies_12345", 30, {"results": [{"id": 1}]})
+    with requests_mock.Mocker() as m:
+        m.post("https://api.themoviedb.org/3/account/12345/favorite", json={"status_code": 1})
+        adapter.add_favorite_movie(2)
+
+    assert adapter._get_cached_response("favorite_movies_12345") is None
+
+def test_rate_movie_updates_cached_rating():
+    adapter = MovieAPIAdapter("fake_api_key", {}, "12345", fakeredis.FakeStrictRedis())
+    adapter._cache_response("rated_movies_12345", 30, {"results": [{"id": 4, "rating": 2}, {"id": 5, "rating": 3}]})
+    with requests_mock.Mocker() as m:
+        m.post("https://api.themoviedb.org/3/movie/4/rating", json={"status_code": 1})
+        adapter.rate_movie(4, 5)
+
+    assert adapter._get_cached_response("rated_movies_12345")["results"] == [{"id": 4, "rating": 5}, {"id": 5, "rating": 3}]
+
+def test_rated_favorites_view_is_built_once_and_read_from_cache():
+    adapter = MovieAPIAdapter("fake_api_key", {}, "12345", fakeredis.FakeStrictRedis())
+    with requests_mock.Mocker() as m:
+        m.get("https://api.themoviedb.org/3/account/12345/favorite/movies", json={"results": [{"id": 1}, {"id": 2}]})
+        m.get("https://api.themoviedb.org/3/account/12345/rated/movies", json={"results": [{"id": 2, "rating": 4}, {"id": 3, "rating": 5}]})
+
+        assert adapter.get_rated_favorite_movies()["results"] == [{"id": 2, "rating": 4}]
+        calls = m.call_count
+        assert adapter.get_rated_favorite_movies()["results"] == [{"id": 2, "rating": 4}]
+        assert m.call_count == calls
+
+def test_rated_favorites_view_fetches_both_lists_concurrently_when_cold():
+    adapter = MovieAPIAdapter("fake_api_key", {}, "12345", fakeredis.FakeStrictRedis())
+    both_fetching = threading.Barrier(2, timeout=2)
+
+    def entry(value):
+        both_fetching.wait()
+        return MagicMock(value=value)
+
+    adapter.get_rated_movies_entry = lambda: entry({"results": [{"id": 2, "rating": 4}]})
+    adapter.get_favorite_movies_entry = lambda: entry({"results": [{"id": 1}, {"id": 2}]})
+
+    assert adapter._build_rated_favorites()["results"] == [{"id": 2, "rating": 4}]
+
+def test_rated_favorites_view_follows_mutations():
+    adapter = MovieAPIAdapter("fake_api_key", {}, "12345", fakeredis.FakeStrictRedis())
+    adapter._cache_response("favorite_movies_12345", 30, {"results": [{"id": 1, "title": "A"}, {"id": 2, "title": "B"}]})
+    adapter._cache_response("rated_movies_12345", 30, {"results": [{"id": 2, "rating": 4}, {"id": 3, "rating": 5}]})
+    adapter._rebuild_rated_favorites()
+    view_key = "rated_favorite_movies_12345"
+    with requests_mock.Mocker() as m:
+        m.post(requests_mock.ANY, json={"status_code": 1})
+
+        adapter.add_favorite_movie(3)
+        assert adapter._get_cached_response(view_key)["results"] == [{"id": 2, "rating": 4}, {"id": 3, "rating": 5}]
+
+        adapter.delete_favorite_movie(2)
+        adapter.rate_movie(3, 1)
+        assert adapter._get_cached_entry(view_key, local=False).value["results"] == [{"id": 3, "rating": 1}]
+
+def test_mutation_invalidates_other_processes_local_cache():
+    redis_client = fakeredis.FakeStrictRedis()
+    writer = MovieAPIAdapter("fake_api_key", {}, "12345", redis_client)
+    reader = MovieAPIAdapter("fake_api_key", {}, "12345", redis_client)
+    reader.invalidation_bus.start()
+    writer._cache_response("favorite_movies_12345", 30, {"results": [{"id": 1}, {"id": 2}]})
+    assert reader.get_favorite_movies() == {"results": [{"id": 1}, {"id": 2}]}
+    time.sleep(0.1)
+
+    writer.apply_favorite_changes(removed_ids=[1])
+
+    for _ in range(50):
+        if reader.local_cache.get("favorite_movies_12345") is None:
+            break
+        time.sleep(0.02)
+    reader.invalidation_bus.stop()
+    assert reader.get_favorite_movies() == {"results": [{"id": 2}]}
+
+def test_cached_listing_is_projected_to_movie_fields(movie_api_adapter):
+    with requests_mock.Mocker() as m:
+        m.get("https://api.themoviedb.org/3/movie/popular?api_key=fake_api_key", json={
+            "page": 1,
+            "results": [{"id": 1, "title": "Movie 1", "overview": "long text", "genre_ids": [28]}]
+        })
+
+        assert movie_api_adapter.get_popular_movies() == {"page": 1, "results": [{"id": 1, "title": "Movie 1"}]}
+
+def test_cache_and_upstream_calls_are_counted(movie_api_adapter):
+    from adapters.metrics import cache_requests, upstream_request_duration, upstream_requests
+    misses = cache_requests.value("favorite_movies", "miss")
+    hits = cache_requests.value("favorite_movies", "hit")
+    calls = upstream_request_duration.count("account/{id}/favorite/movies")
+    with requests_mock.Mocker() as m:
+        m.get("https://api.themoviedb.org/3/account/12345/favorite/movies", json={"results": [{"id": 1}]})
+        movie_api_adapter.get_favorite_movies()
+        movie_api_adapter.get_favorite_movies()
+
+    assert cache_requests.value("favorite_movies", "miss") == misses + 1
+    assert cache_requests.value("favorite_movies", "hit") == hits + 1
+    assert upstream_request_duration.count("account/{id}/favorite/movies") == calls + 1
+    assert upstream_requests.value("account/{id}/favorite/movies", "200") >= 1
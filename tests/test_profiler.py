@@ -0,0 +1,32 @@
+import threading
+import pytest
+from adapters.profiler import ProfilerBusy, SamplingProfiler, collapse
+
+def _busy_loop(stop):
+    while not stop.is_set():
+        sum(range(100))
+
+def test_profile_samples_busy_threads_as_collapsed_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_loop, args=(stop,), name="busy-worker")
+    worker.start()
+    try:
+        samples = SamplingProfiler(interval=0.001).profile(0.1)
+    finally:
+        stop.set()
+        worker.join()
+
+    busy = [stack for stack in samples if stack.startswith("busy-worker;") and "_busy_loop" in stack]
+    assert busy
+    line = collapse(samples).splitlines()[0]
+    stack, count = line.rsplit(" ", 1)
+    assert stack in samples and int(count) == samples[stack]
+
+def test_only_one_profile_runs_at_a_time():
+    profiler = SamplingProfiler(interval=0.001)
+    profiler._lock.acquire()
+    try:
+        with pytest.raises(ProfilerBusy):
+            profiler.profile(0.01)
+    finally:
+        profiler._lock.release()
@@ -0,0 +1,58 @@
+import fakeredis
+import pytest
+from unittest.mock import MagicMock
+from flask import Flask, jsonify
+from auth.auth import token_required
+from auth.rate_limit import InboundRateLimiter, parse_quota
+
+ADMIN = {'id': 1, 'permission': 'ADMIN'}
+USER = {'id': 2, 'permission': 'USER'}
+QUOTAS = {'ADMIN': ((100, 60), (10, 60)), 'USER': ((5, 60), (3, 60))}
+
+def test_parse_quota():
+    assert parse_quota('60/30') == (60, 30.0)
+    with pytest.raises(ValueError):
+        parse_quota('0/60')
+
+def test_route_quota_depends_on_permission():
+    limiter = InboundRateLimiter(fakeredis.FakeStrictRedis(), QUOTAS)
+
+    assert [limiter.check(USER, 'movies.a').allowed for _ in range(4)] == [True, True, True, False]
+    assert all(limiter.check(ADMIN, 'movies.a').allowed for _ in range(4))
+
+def test_user_quota_spans_routes_and_processes():
+    redis_client = fakeredis.FakeStrictRedis()
+    first = InboundRateLimiter(redis_client, QUOTAS)
+    second = InboundRateLimiter(redis_client, QUOTAS)
+
+    for route in ('movies.a', 'movies.b', 'movies.c'):
+        assert first.check(USER, route).allowed
+    assert second.check(USER, 'movies.d').allowed
+    assert second.check(USER, 'movies.e').allowed
+
+    decision = second.check(USER, 'movies.f')
+    assert not decision.allowed
+    assert 0 < decision.retry_after <= 12
+
+def test_denied_clients_are_rejected_locally():
+    redis_client = MagicMock(wraps=fakeredis.FakeStrictRedis())
+    limiter = InboundRateLimiter(redis_client, QUOTAS)
+    for _ in range(4):
+        limiter.check(USER, 'movies.a')
+    calls = redis_client.eval.call_count
+
+    assert not limiter.check(USER, 'movies.a').allowed
+    assert redis_client.eval.call_count == calls
+
+def test_token_required_returns_429_with_retry_after(monkeypatch):
+    monkeypatch.setattr("auth.auth.inbound_rate_limiter", InboundRateLimiter(None, QUOTAS))
+    app = Flask(__name__)
+    app.add_url_rule('/limited', 'limited', token_required(lambda user: jsonify({'ok': True})))
+    client = app.test_client()
+
+    statuses = [client.get('/limited', headers={'Authorization': '2'}).status_code for _ in range(3)]
+    response = client.get('/limited', headers={'Authorization': '2'})
+
+    assert statuses == [200, 200, 200]
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
@@ -0,0 +1,68 @@
+import time
+import fakeredis
+import requests_mock
+from adapters.movie_api_adapter import MovieAPIAdapter
+from adapters.rate_limiter import DistributedTokenBucket
+from adapters.resilience import deadline
+
+def test_buckets_with_the_same_name_share_tokens():
+    redis_client = fakeredis.FakeStrictRedis()
+    first = DistributedTokenBucket(redis_client, "shared", rate=1, capacity=2)
+    second = DistributedTokenBucket(redis_client, "shared", rate=1, capacity=2)
+
+    assert first.try_acquire() == 0
+    assert second.try_acquire() == 0
+    assert first.try_acquire() > 0
+    # Otro nombre tiene su propio cubo.
+    assert DistributedTokenBucket(redis_client, "other", rate=1, capacity=2).try_acquire() == 0
+
+def test_penalize_pauses_and_reduces_shared_rate():
+    redis_client = fakeredis.FakeStrictRedis()
+    bucket = DistributedTokenBucket(redis_client, "throttled", rate=10, min_rate=2)
+    other_process = DistributedTokenBucket(redis_client, "throttled", rate=10, min_rate=2)
+
+    bucket.penalize(retry_after=5)
+    assert 4 < other_process.try_acquire() <= 5
+    assert other_process.stats()['current_rate'] == 5
+
+    for _ in range(5):
+        bucket.penalize()
+    assert bucket.stats()['current_rate'] == 2
+
+def test_falls_back_to_local_bucket_without_redis():
+    bucket = DistributedTokenBucket(None, "local", rate=1, capacity=1)
+
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() > 0
+    bucket.penalize(retry_after=3)
+    assert bucket.try_acquire() > 2
+
+def test_local_bucket_reduces_rate_after_429_and_recovers():
+    bucket = DistributedTokenBucket(None, "local_adaptive", rate=10, capacity=1, min_rate=2, recovery=1)
+
+    bucket.penalize()
+    assert bucket.stats()['current_rate'] == 5
+    assert bucket.try_acquire() == 0
+    assert 0.15 < bucket.try_acquire() <= 0.2
+
+    for _ in range(5):
+        bucket.penalize()
+    assert bucket.stats()['current_rate'] == 2
+
+    # Tres segundos sin 429 recuperan 3 llamadas por segundo.
+    bucket._local_rate_updated_at -= 3
+    assert 4.9 < bucket.stats()['current_rate'] < 5.1
+
+def test_adapter_reports_429_to_the_read_bucket():
+    adapter = MovieAPIAdapter("fake_api_key", {}, "12345", fakeredis.FakeStrictRedis())
+    with requests_mock.Mocker() as m:
+        m.get("https://api.themoviedb.org/3/movie/popular?api_key=fake_api_key", status_code=429, headers={"Retry-After": "20"})
+
+        started = time.monotonic()
+        with deadline(1):
+            assert adapter.get_popular_movies() is None
+        assert time.monotonic() - started < 0.5
+        assert m.call_count == 1
+
+    assert adapter.rate_limiters['read'].stats()['throttled'] == 1
+    assert adapter.rate_limiters['write'].try_acquire() == 0
@@ -0,0 +1,46 @@
+import fakeredis
+import redis
+from unittest.mock import MagicMock
+from adapters.movie_api_adapter import MovieAPIAdapter
+from adapters.redis_client import create_redis_client, redis_pool_stats
+
+
+class _Settings:
+    REDIS_HOST = "redis.internal"
+    REDIS_PORT = 6380
+    REDIS_DB = 2
+    REDIS_MAX_CONNECTIONS = 7
+    REDIS_SOCKET_TIMEOUT = 0.25
+    REDIS_HEALTH_CHECK_INTERVAL = 15
+
+
+def test_create_redis_client_uses_configured_pool():
+    client = create_redis_client(_Settings)
+    pool = client.connection_pool
+
+    assert isinstance(pool, redis.BlockingConnectionPool)
+    assert pool.max_connections == 7
+    assert pool.connection_kwargs["host"] == "redis.internal"
+    assert pool.connection_kwargs["port"] == 6380
+    assert pool.connection_kwargs["db"] == 2
+    assert pool.connection_kwargs["socket_timeout"] == 0.25
+    assert pool.connection_kwargs["health_check_interval"] == 15
+    assert redis_pool_stats(client) == {'created_connections': 0, 'in_use_connections': 0, 'max_connections': 7}
+
+def test_multi_key_read_uses_one_round_trip():
+    redis_client = fakeredis.FakeStrictRedis()
+    writer = MovieAPIAdapter("fake_api_key", {}, "12345", redis_client)
+    writer._cache_response("rated_movies_12345", 30, {"results": [{"id": 1, "rating": 4}]})
+    writer._cache_response("favorite_movies_12345", 30, {"results": [{"id": 1}]})
+
+    spy = MagicMock(wraps=redis_client)
+    reader = MovieAPIAdapter("fake_api_key", {}, "12345", spy)
+    rated, favorites = reader.get_rated_and_favorite_cached_entries()
+
+    assert rated.value == {"results": [{"id": 1, "rating": 4}]}
+    assert favorites.value == {"results": [{"id": 1}]}
+    spy.pipeline.assert_called_once_with(transaction=False)
+    spy.hgetall.assert_not_called()
+    # La segunda lectura se sirve desde la caché en memoria.
+    reader.get_rated_and_favorite_cached_entries()
+    spy.pipeline.assert_called_once()
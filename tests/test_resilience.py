@@ -0,0 +1,133 @@
+import time
+import requests
+from unittest.mock import MagicMock
+from adapters.resilience import (
+    CircuitBreaker, RateLimitExceeded, RetryBudget, circuit_breakers, deadline, remaining_time, retry_with_backoff
+)
+from adapters.metrics import upstream_failures, upstream_retries
+
+def _http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.exceptions.HTTPError(response=response)
+
+def test_transient_errors_are_retried():
+    func = MagicMock(side_effect=[requests.exceptions.ConnectionError(), _http_error(503), "ok"])
+    wrapped = retry_with_backoff("test/retry", "probar", base_delay=0, max_delay=0)(func)
+
+    assert wrapped() == "ok"
+    assert func.call_count == 3
+    assert upstream_retries.value("test/retry") == 2
+
+def test_client_errors_are_not_retried():
+    func = MagicMock(side_effect=_http_error(404))
+    wrapped = retry_with_backoff("test/client_error", "probar", base_delay=0, max_delay=0)(func)
+
+    assert wrapped() is None
+    assert func.call_count == 1
+    assert circuit_breakers.get("test/client_error").state == CircuitBreaker.CLOSED
+    assert upstream_failures.value("test/client_error", "client_error") == 1
+
+def test_expired_deadline_skips_call():
+    func = MagicMock(return_value="ok")
+    wrapped = retry_with_backoff("test/deadline", "probar")(func)
+
+    with deadline(0):
+        assert remaining_time() <= 0
+        assert wrapped() is None
+    func.assert_not_called()
+    assert remaining_time() is None
+
+def test_retry_does_not_wait_past_deadline():
+    func = MagicMock(side_effect=requests.exceptions.Timeout())
+    wrapped = retry_with_backoff("test/slow", "probar", base_delay=5, max_delay=5)(func)
+
+    started = time.monotonic()
+    with deadline(0.05):
+        assert wrapped() is None
+    assert time.monotonic() - started < 1
+
+def test_open_circuit_fails_fast():
+    breaker = circuit_breakers.get("test/breaker")
+    breaker.failure_threshold = 2
+    func = MagicMock(side_effect=requests.exceptions.ConnectionError())
+    wrapped = retry_with_backoff("test/breaker", "probar", max_retries=0)(func)
+
+    wrapped()
+    wrapped()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert wrapped() is None
+    assert func.call_count == 2
+
+def test_half_open_probe_closes_circuit():
+    breaker = CircuitBreaker("test/half_open", failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    assert not breaker.allow_request()
+    time.sleep(0.02)
+
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def _half_open_breaker(name):
+    breaker = circuit_breakers.get(name)
+    breaker.failure_threshold = 1
+    breaker.reset_timeout = 0.01
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    return breaker
+
+def test_half_open_probe_is_not_leaked_by_expired_deadline():
+    breaker = _half_open_breaker("test/half_open_deadline")
+    func = MagicMock(return_value="ok")
+    wrapped = retry_with_backoff("test/half_open_deadline", "probar")(func)
+
+    with deadline(0):
+        assert wrapped() is None
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    assert wrapped() == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_half_open_probe_is_not_leaked_by_outbound_rate_limit():
+    breaker = _half_open_breaker("test/half_open_rate_limit")
+    func = MagicMock(side_effect=[RateLimitExceeded("sin turno"), "ok"])
+    wrapped = retry_with_backoff("test/half_open_rate_limit", "probar")(func)
+
+    assert wrapped() is None
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert upstream_failures.value("test/half_open_rate_limit", "circuit_open") == 0
+
+    assert wrapped() == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_retry_budget_limits_retries():
+    budget = RetryBudget(ratio=0.5, min_per_second=0, window=10)
+    for _ in range(4):
+        budget.record_request()
+
+    assert [budget.try_acquire_retry() for _ in range(3)] == [True, True, False]
+
+def test_retry_after_is_honored():
+    error = _http_error(429)
+    error.response.headers['Retry-After'] = '0.2'
+    func = MagicMock(side_effect=[error, "ok"])
+    wrapped = retry_with_backoff("test/retry_after", "probar", base_delay=0, max_delay=0)(func)
+
+    started = time.monotonic()
+    assert wrapped() == "ok"
+    assert time.monotonic() - started >= 0.2
+
+def test_retry_after_longer_than_deadline_gives_up():
+    error = _http_error(429)
+    error.response.headers['Retry-After'] = '30'
+    func = MagicMock(side_effect=error)
+    wrapped = retry_with_backoff("test/retry_after_deadline", "probar", base_delay=0, max_delay=0)(func)
+
+    started = time.monotonic()
+    with deadline(1):
+        assert wrapped() is None
+    assert time.monotonic() - started < 0.5
+    assert func.call_count == 1
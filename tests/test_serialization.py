@@ -0,0 +1,18 @@
+import gzip
+import brotli
+from adapters.serialization import RawJSON, dumps, loads
+
+def test_dumps_and_loads_roundtrip():
+    value = {'results': [{'id': 1, 'title': 'Película'}]}
+    assert loads(dumps(value)) == value
+
+def test_raw_json_compressed_bodies_are_memoized():
+    raw = RawJSON(b'{"results":[]}' * 100)
+
+    assert gzip.decompress(raw.encoded('gzip')) == raw.body
+    assert brotli.decompress(raw.encoded('br')) == raw.body
+    assert raw.encoded('gzip') is raw.encoded('gzip')
+
+def test_raw_json_etag_depends_on_content():
+    assert RawJSON(b'[1]').etag == RawJSON('[1]').etag
+    assert RawJSON(b'[1]').etag != RawJSON(b'[2]').etag
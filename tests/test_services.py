@@ -1,6 +1,10 @@
+import json
+import time
 import pytest
 from unittest.mock import MagicMock
+from application.jobs import JobManager
 from application.services import MovieService
+from adapters.cache import CacheEntry
 
 @pytest.fixture
 def mock_adapter():
@@ -19,6 +23,12 @@ def test_get_popular_movies(movie_service, mock_adapter):
     assert popular_movies == [{'title': 'Movie1'}, {'title': 'Movie2'}]
     mock_adapter.get_popular_movies.assert_called_once()
 
+def test_get_popular_movies_unavailable(movie_service, mock_adapter):
+    mock_adapter.get_popular_movies.return_value = None
+    movie_service.movie_api = mock_adapter
+
+    assert movie_service.get_popular_movies() == ({'message': 'Películas populares no disponibles temporalmente'}, 503)
+
 def test_get_favorite_movies(movie_service, mock_adapter):
     mock_adapter.get_favorite_movies.return_value = {'results': [{'id': 1, 'title': 'FavMovie1'}]}
     movie_service.movie_api = mock_adapter
@@ -69,29 +79,188 @@ def test_get_rated_movies(movie_service, mock_adapter):
     mock_adapter.get_rated_movies.assert_called_once()
 
 def test_get_favorite_movies_by_release_date(movie_service, mock_adapter):
-    mock_adapter.get_favorite_movies.return_value = {
+    mock_adapter.get_favorite_movies_entry.return_value = CacheEntry({
         'results': [
-            {'id': 1, 'title': 'Movie1', 'release_date': '2023-10-10'},
-            {'id': 2, 'title': 'Movie2', 'release_date': '2021-08-15'},
+            {'id': 1, 'title': 'Movie1', 'release_date': '2021-08-15'},
+            {'id': 2, 'title': 'Movie2', 'release_date': ''},
+            {'id': 3, 'title': 'Movie3', 'release_date': '2023-10-10'},
         ]
-    }
+    }, 0.0)
     movie_service.movie_api = mock_adapter
 
-    sorted_movies = movie_service.get_favorite_movies_by_release_date()
-    assert sorted_movies[0]['release_date'] == '2023-10-10'
-    assert sorted_movies[1]['release_date'] == '2021-08-15'
-    mock_adapter.get_favorite_movies.assert_called_once()
+    first_page = movie_service.get_favorite_movies_by_release_date(fields=('id',), limit=2)
+    assert first_page['results'] == [{'id': 3}, {'id': 1}]
+    second_page = movie_service.get_favorite_movies_by_release_date(fields=('id',), cursor=first_page['next_cursor'], limit=2)
+    # Las películas sin fecha de lanzamiento van al final.
+    assert second_page == {'results': [{'id': 2}], 'next_cursor': None}
+
+def test_get_favorite_movies_by_release_date_invalid_cursor(movie_service, mock_adapter):
+    mock_adapter.get_favorite_movies_entry.return_value = CacheEntry({'results': []}, 0.0)
+    movie_service.movie_api = mock_adapter
+
+    assert movie_service.get_favorite_movies_by_release_date(cursor='???')[1] == 400
+
+def test_get_favorite_movies_by_release_date_internal_value_error_is_500(movie_service, mock_adapter):
+    entry = MagicMock()
+    entry.derived.side_effect = ValueError("unexpected character: line 1 column 1")
+    mock_adapter.get_favorite_movies_entry.return_value = entry
+    movie_service.movie_api = mock_adapter
+
+    body, status = movie_service.get_favorite_movies_by_release_date()
+    assert status == 500
+    assert 'unexpected character' not in body['message']
 
 def test_get_rated_movies_from_favorites(movie_service, mock_adapter):
-    mock_adapter.get_rated_movies.return_value = {
-        'results': [{'id': 1, 'title': 'RatedFavMovie1'}, {'id': 2, 'title': 'RatedNonFavMovie'}]
-    }
-    mock_adapter.get_favorite_movies.return_value = {
-        'results': [{'id': 1, 'title': 'RatedFavMovie1'}]
-    }
+    mock_adapter.get_rated_favorite_movies_entry.return_value = CacheEntry({
+        'results': [{'id': 1, 'title': 'RatedFavMovie1', 'overview': 'ignored'}]
+    }, 0.0)
     movie_service.movie_api = mock_adapter
 
     rated_fav_movies = movie_service.get_rated_movies_from_favorites()
     assert rated_fav_movies == [{'id': 1, 'title': 'RatedFavMovie1'}]
-    mock_adapter.get_rated_movies.assert_called_once()
-    mock_adapter.get_favorite_movies.assert_called_once()
\ No newline at end of file
+    mock_adapter.get_rated_favorite_movies_entry.assert_called_once()
+    mock_adapter.get_rated_movies.assert_not_called()
+    mock_adapter.get_favorite_movies.assert_not_called()
+
+def test_get_rated_movies_from_favorites_raw_with_fields(movie_service, mock_adapter):
+    mock_adapter.get_rated_favorite_movies_entry.return_value = CacheEntry({
+        'results': [{'id': 1, 'title': 'RatedFavMovie1', 'rating': 4}]
+    }, 0.0)
+    movie_service.movie_api = mock_adapter
+
+    raw = movie_service.get_rated_movies_from_favorites(raw=True, fields=('id', 'rating'))
+    assert json.loads(raw.body) == [{'id': 1, 'rating': 4}]
+    mock_adapter.get_rated_favorite_movies_entry.assert_called_once()
+
+def test_requested_missing_fields_are_omitted_by_every_listing(movie_service, mock_adapter):
+    listing = {'results': [{'id': 1, 'title': 'Movie1'}]}
+    mock_adapter.get_favorite_movies.return_value = listing
+    mock_adapter.get_favorite_movies_entry.return_value = CacheEntry(listing, 0.0)
+    mock_adapter.get_rated_favorite_movies_entry.return_value = CacheEntry(listing, 0.0)
+    movie_service.movie_api = mock_adapter
+    fields = ('id', 'rating')
+
+    expected = [{'id': 1}]
+    assert movie_service.get_favorite_movies(fields=fields)['results'] == expected
+    assert movie_service.get_favorite_movies_by_release_date(fields=fields)['results'] == expected
+    assert movie_service.get_rated_movies_from_favorites(fields=fields) == expected
+
+def test_get_rated_movies_from_favorites_unavailable(movie_service, mock_adapter):
+    mock_adapter.get_rated_favorite_movies_entry.return_value = None
+    movie_service.movie_api = mock_adapter
+
+    assert movie_service.get_rated_movies_from_favorites()[1] == 503
+
+def test_delete_all_favorite_movies_reports_each_movie(movie_service, mock_adapter):
+    mock_adapter.get_favorite_movies.return_value = {'results': [{'id': 1}, {'id': 2}, {'id': 3}]}
+    mock_adapter.delete_favorite_movie.side_effect = lambda media_id, update_cache: None if media_id == 2 else MagicMock()
+    movie_service.movie_api = mock_adapter
+    progress = MagicMock()
+
+    response = movie_service.delete_all_favorite_movies(progress=progress)
+    assert response['status'] == 'partial'
+    assert response['results'] == [
+        {'media_id': 1, 'status': 'deleted'},
+        {'media_id': 2, 'status': 'failed'},
+        {'media_id': 3, 'status': 'deleted'}
+    ]
+    mock_adapter.apply_favorite_changes.assert_called_once_with(removed_ids=[1, 3])
+    assert progress.call_count == 3
+
+def test_delete_all_favorite_movies_is_partial_when_listing_is_truncated(movie_service, mock_adapter):
+    mock_adapter.get_favorite_movies.return_value = {'results': [{'id': 1}], 'truncated': True}
+    mock_adapter.delete_favorite_movie.return_value = MagicMock()
+    movie_service.movie_api = mock_adapter
+
+    response = movie_service.delete_all_favorite_movies()
+    assert response['status'] == 'partial'
+    assert response['truncated'] is True
+
+def _finished_job(job_manager, job_id):
+    for _ in range(100):
+        job = job_manager.get(job_id)
+        if job['finished_at'] is not None:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+def test_delete_all_favorite_movies_job_fails_when_favorites_are_unavailable(movie_service, mock_adapter):
+    mock_adapter.get_favorite_movies.return_value = None
+    movie_service.movie_api = mock_adapter
+    movie_service.job_manager = JobManager()
+
+    job = _finished_job(movie_service.job_manager, movie_service.start_delete_all_favorite_movies()['id'])
+    assert job['status'] == 'failed'
+    assert job['result'] == {'message': 'Películas favoritas no disponibles temporalmente'}
+
+def test_delete_all_favorite_movies_job_fails_on_unexpected_errors(movie_service, mock_adapter):
+    mock_adapter.get_favorite_movies.side_effect = RuntimeError("boom")
+    movie_service.movie_api = mock_adapter
+    movie_service.job_manager = JobManager()
+
+    job = _finished_job(movie_service.job_manager, movie_service.start_delete_all_favorite_movies()['id'])
+    assert job['status'] == 'failed'
+    assert job['result'] == {'message': 'Error al eliminar todas las películas favoritas'}
+
+def test_add_favorite_movies_batch(movie_service, mock_adapter):
+    mock_response = MagicMock()
+    mock_response.status_code = 201
+    mock_adapter.add_favorite_movie.side_effect = lambda media_id, update_cache: None if media_id == 2 else mock_response
+    movie_service.movie_api = mock_adapter
+
+    response = movie_service.add_favorite_movies_batch([1, 2])
+    assert response == {'results': [
+        {'media_id': 1, 'status': 'success', 'status_code': 201},
+        {'media_id': 2, 'status': 'failed', 'status_code': None}
+    ]}
+    mock_adapter.apply_favorite_changes.assert_called_once_with(added_ids=[1])
+
+def test_delete_favorite_movies_batch_rejects_invalid_ids(movie_service, mock_adapter):
+    movie_service.movie_api = mock_adapter
+
+    response, status_code = movie_service.delete_favorite_movies_batch([1, 'x', 1])
+    assert status_code == 400
+    assert [error['index'] for error in response['errors']] == [1, 2]
+    mock_adapter.delete_favorite_movie.assert_not_called()
+
+def test_rate_movies_batch(movie_service, mock_adapter):
+    mock_response = MagicMock()
+    mock_response.status_code = 201
+    mock_adapter.rate_movie.return_value = mock_response
+    movie_service.movie_api = mock_adapter
+
+    response = movie_service.rate_movies_batch([[1, 4], {'movie_id': 2, 'rating': 5}])
+    assert [result['status'] for result in response['results']] == ['success', 'success']
+    mock_adapter.apply_rating_changes.assert_called_once_with({1: 4, 2: 5})
+
+def test_rate_movies_batch_validates_all_ratings_first(movie_service, mock_adapter):
+    movie_service.movie_api = mock_adapter
+
+    response, status_code = movie_service.rate_movies_batch([[1, 4], [2, 9]])
+    assert status_code == 400
+    assert response['errors'] == [{'index': 1, 'error': 'La calificación debe estar entre 1 y 5'}]
+    mock_adapter.rate_movie.assert_not_called()
+
+def test_get_popular_movies_raw_reuses_serialized_results(movie_service, mock_adapter):
+    entry = CacheEntry({'results': [{'id': 1}], 'page': 1}, 0.0)
+    mock_adapter.get_popular_movies_entry.return_value = entry
+    movie_service.movie_api = mock_adapter
+
+    first = movie_service.get_popular_movies(raw=True)
+    second = movie_service.get_popular_movies(raw=True)
+    assert json.loads(first.body) == [{'id': 1}]
+    assert first.body is second.body
+
+def test_get_favorite_movies_raw_returns_cached_body(movie_service, mock_adapter):
+    entry = CacheEntry.from_redis_mapping({'body': '{"results":[]}', 'stored_at': '0'})
+    mock_adapter.get_favorite_movies_entry.return_value = entry
+    movie_service.movie_api = mock_adapter
+
+    assert movie_service.get_favorite_movies(raw=True).body == b'{"results":[]}'
+
+def test_get_rated_movies_raw_with_fields(movie_service, mock_adapter):
+    mock_adapter.get_rated_movies_entry.return_value = CacheEntry({'results': [{'id': 1, 'title': 'Rated', 'rating': 4}]}, 0.0)
+    movie_service.movie_api = mock_adapter
+
+    response = movie_service.get_rated_movies(raw=True, fields=('id', 'rating'))
+    assert json.loads(response.body) == {'results': [{'id': 1, 'rating': 4}]}
@@ -0,0 +1,83 @@
+import threading
+import time
+import fakeredis
+from adapters.resilience import deadline
+from adapters.single_flight import SingleFlight
+
+def test_concurrent_calls_are_coalesced_in_process():
+    single_flight = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"results": []}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(single_flight.do("popular_movies", fetch))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"results": []}] * 8
+
+def test_remote_follower_waits_for_published_value():
+    redis_client = fakeredis.FakeStrictRedis()
+    redis_client.set("lock:popular_movies", "other-node", px=5000)
+    single_flight = SingleFlight(redis_client, lock_timeout=1, poll_interval=0.01)
+    published = {}
+
+    def publish():
+        time.sleep(0.05)
+        published["value"] = {"results": [{"id": 1}]}
+
+    threading.Thread(target=publish).start()
+    result = single_flight.do("popular_movies", lambda: {"results": "fetched"}, poll=lambda: published.get("value"))
+
+    assert result == {"results": [{"id": 1}]}
+
+def test_leader_releases_lock():
+    redis_client = fakeredis.FakeStrictRedis()
+    single_flight = SingleFlight(redis_client)
+
+    assert single_flight.do("rated_movies_1", lambda: "ok") == "ok"
+    assert not redis_client.exists("lock:rated_movies_1")
+
+def test_in_process_follower_gives_up_at_the_request_deadline():
+    single_flight = SingleFlight(lock_timeout=10)
+    leader_started = threading.Event()
+    release_leader = threading.Event()
+
+    def slow_fetch():
+        leader_started.set()
+        release_leader.wait(5)
+        return "leader"
+
+    leader = threading.Thread(target=lambda: single_flight.do("popular_movies", slow_fetch))
+    leader.start()
+    leader_started.wait(1)
+    started = time.monotonic()
+    with deadline(0.1):
+        result = single_flight.do("popular_movies", lambda: "follower")
+    elapsed = time.monotonic() - started
+    release_leader.set()
+    leader.join()
+
+    assert result is None
+    assert elapsed < 1
+
+def test_remote_follower_gives_up_at_the_request_deadline():
+    redis_client = fakeredis.FakeStrictRedis()
+    redis_client.set("lock:popular_movies", "other-node", px=5000)
+    single_flight = SingleFlight(redis_client, lock_timeout=10, poll_interval=0.01)
+    calls = []
+
+    started = time.monotonic()
+    with deadline(0.1):
+        result = single_flight.do("popular_movies", lambda: calls.append(1), poll=lambda: None)
+
+    assert result is None
+    assert calls == []
+    assert time.monotonic() - started < 1
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+from adapters.log import JsonFormatter, TraceContextFilter
+from adapters.tracing import Tracer, current_span, parse_traceparent, traced, tracer
+
+TRACEPARENT = "00-" + "a" * 32 + "-" + "b" * 16 + "-01"
+
+def test_parse_traceparent():
+    assert parse_traceparent(TRACEPARENT) == ("a" * 32, "b" * 16, True)
+    assert parse_traceparent("00-" + "a" * 32 + "-" + "b" * 16 + "-00")[2] is False
+    assert parse_traceparent("00-" + "0" * 32 + "-" + "b" * 16 + "-01") is None
+    assert parse_traceparent("basura") is None
+    assert parse_traceparent(None) is None
+
+def test_unsampled_requests_open_no_spans():
+    local_tracer = Tracer(sample_rate=0.0)
+    with local_tracer.start_trace("GET /x") as root:
+        assert root is None
+        with local_tracer.span("child") as child:
+            assert child is None
+    assert local_tracer.recent() == []
+
+def test_child_spans_continue_the_incoming_trace():
+    local_tracer = Tracer()
+    with local_tracer.start_trace("GET /x", TRACEPARENT) as root:
+        with local_tracer.span("cache.get", key="k") as child:
+            assert current_span() is child
+        assert current_span() is root
+    assert current_span() is None
+
+    spans = {span["name"]: span for span in local_tracer.recent("a" * 32)}
+    assert spans["GET /x"]["parentId"] == "b" * 16
+    assert spans["cache.get"]["parentId"] == root.span_id
+    assert spans["cache.get"]["tags"] == {"key": "k"}
+    assert root.traceparent == f"00-{'a' * 32}-{root.span_id}-01"
+
+def test_traced_decorator_records_sync_and_async_calls():
+    @traced("sync_work")
+    def sync_work():
+        return 1
+
+    @traced("async_work")
+    async def async_work():
+        return 2
+
+    assert sync_work() == 1
+    with tracer.start_trace("root", TRACEPARENT.replace("a", "c")):
+        assert sync_work() == 1
+        assert asyncio.run(async_work()) == 2
+    names = [span["name"] for span in tracer.recent("c" * 32)]
+    assert names == ["sync_work", "async_work", "root"]
+
+def test_errors_are_recorded_on_the_span():
+    local_tracer = Tracer()
+    try:
+        with local_tracer.start_trace("root", TRACEPARENT):
+            raise ValueError("fallo")
+    except ValueError:
+        pass
+    assert local_tracer.recent()[0]["tags"]["error"] == "ValueError: fallo"
+
+def test_json_logs_include_the_trace_context():
+    record = logging.LogRecord("app", logging.WARNING, __file__, 1, "Hola %s", ("mundo",), None)
+    with tracer.start_trace("root", TRACEPARENT) as root:
+        TraceContextFilter().filter(record)
+    document = JsonFormatter().format(record)
+    assert '"message": "Hola mundo"' in document
+    assert f'"span_id": "{root.span_id}"' in document
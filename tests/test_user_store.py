@@ -0,0 +1,105 @@
+import fakeredis
+import pytest
+from unittest.mock import MagicMock
+from flask import Flask, jsonify
+from auth.auth import auth_latency, token_required
+import redis
+from auth import auth
+from auth.user_store import (
+    CachedUserStore, MemoryUserStore, RedisUserStore, SQLiteUserStore, UserStoreUnavailable, create_user_store
+)
+
+ADMIN = {'id': 1, 'username': 'admin', 'permission': 'ADMIN'}
+
+@pytest.mark.parametrize('make_store', [
+    lambda tmp_path: MemoryUserStore(),
+    lambda tmp_path: SQLiteUserStore(str(tmp_path / 'users.db')),
+    lambda tmp_path: RedisUserStore(fakeredis.FakeStrictRedis()),
+])
+def test_store_lookup_by_id(tmp_path, make_store):
+    store = make_store(tmp_path)
+    store.add(ADMIN)
+
+    assert store.get(1) == ADMIN
+    assert store.get(2) is None
+
+def test_cached_store_resolves_each_user_once():
+    store = MagicMock(wraps=MemoryUserStore([ADMIN]))
+    cached = CachedUserStore(store, ttl=60)
+
+    assert cached.get(1) == ADMIN
+    assert cached.get(1) == ADMIN
+    assert cached.get(99) is None
+    assert cached.get(99) is None
+    assert store.get.call_count == 2
+    assert cached.stats()['hits'] == 2
+
+def test_cached_store_raises_and_does_not_cache_backend_errors():
+    store = MagicMock()
+    store.get.side_effect = [redis.exceptions.ConnectionError("down"), ADMIN]
+    cached = CachedUserStore(store, ttl=60)
+
+    with pytest.raises(UserStoreUnavailable):
+        cached.get(1)
+    assert cached.get(1) == ADMIN
+
+def test_user_store_outage_is_a_503(monkeypatch):
+    store = MagicMock()
+    store.get.side_effect = redis.exceptions.ConnectionError("down")
+    monkeypatch.setattr(auth, 'user_store', CachedUserStore(store, ttl=60))
+    app = Flask(__name__)
+    app.add_url_rule('/me', 'me', token_required(lambda user: jsonify(user)))
+
+    response = app.test_client().get('/me', headers={'Authorization': '1'})
+    assert response.status_code == 503
+
+def test_cached_store_add_invalidates_user():
+    cached = CachedUserStore(MemoryUserStore([ADMIN]), ttl=60)
+    assert cached.get(1)['permission'] == 'ADMIN'
+
+    cached.add(dict(ADMIN, permission='USER'))
+    assert cached.get(1)['permission'] == 'USER'
+
+def test_create_user_store_seeds_sqlite(tmp_path):
+    class _Settings:
+        USER_STORE = 'sqlite'
+        USER_STORE_PATH = str(tmp_path / 'users.db')
+
+    assert create_user_store(_Settings, default_users=[ADMIN]).get(1) == ADMIN
+    with pytest.raises(ValueError):
+        _Settings.USER_STORE = 'ldap'
+        create_user_store(_Settings)
+
+@pytest.mark.parametrize('make_store', [
+    lambda tmp_path: SQLiteUserStore(str(tmp_path / 'users.db')),
+    lambda tmp_path: RedisUserStore(fakeredis.FakeStrictRedis()),
+])
+def test_seeding_does_not_overwrite_existing_users(tmp_path, make_store):
+    store = make_store(tmp_path)
+    store.add(dict(ADMIN, permission='USER'))
+
+    store.add_if_missing(ADMIN)
+    store.add_if_missing({'id': 2, 'username': 'consumer', 'permission': 'USER'})
+
+    assert store.get(1) == dict(ADMIN, permission='USER')
+    assert store.get(2)['username'] == 'consumer'
+
+def test_sqlite_seeding_keeps_rows_with_the_same_username(tmp_path):
+    class _Settings:
+        USER_STORE = 'sqlite'
+        USER_STORE_PATH = str(tmp_path / 'users.db')
+
+    SQLiteUserStore(_Settings.USER_STORE_PATH).add({'id': 7, 'username': 'admin', 'permission': 'USER'})
+    store = create_user_store(_Settings, default_users=[ADMIN])
+
+    assert store.get(7) == {'id': 7, 'username': 'admin', 'permission': 'USER'}
+    assert store.get(1) is None
+
+def test_auth_latency_is_recorded():
+    app = Flask(__name__)
+    app.add_url_rule('/me', 'me', token_required(lambda user: jsonify(user)))
+    count = auth_latency.snapshot()['count']
+
+    response = app.test_client().get('/me', headers={'Authorization': '1'})
+    assert response.json['username'] == 'admin'
+    assert auth_latency.snapshot()['count'] == count + 1